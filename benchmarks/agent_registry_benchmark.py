@@ -0,0 +1,75 @@
+"""Workflow construction cost with per-workflow agents versus the shared agent registry.
+
+Constructs thousands of InteractiveGuitarTabWorkflow instances and keeps them
+alive, the way a worker's workflow cache does. Construction runs on every
+workflow task that misses the cache and on every replay.
+
+Usage:
+    uv run benchmarks/agent_registry_benchmark.py [--workflows 3000]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from unittest import mock
+
+from openai_agents.workflows import guitar_tab_manager
+from openai_agents.workflows.guitar_tab_agents.agent_registry import (
+    AgentRegistry,
+    get_agent_registry,
+)
+from openai_agents.workflows.guitar_tab_agents.planner_agent import new_planner_agent
+from openai_agents.workflows.guitar_tab_agents.search_agent import new_search_agent
+from openai_agents.workflows.guitar_tab_agents.triage_agent import new_triage_agent
+from openai_agents.workflows.guitar_tab_agents.writer_agent import new_writer_agent
+from openai_agents.workflows.guitar_tab_workflow import InteractiveGuitarTabWorkflow
+from openai_agents.workflows.research_agents.pdf_generator_agent import new_pdf_generator_agent
+
+
+def build_agents_per_workflow() -> AgentRegistry:
+    """What every manager used to do: build the whole graph from scratch."""
+    triage = new_triage_agent()
+    return AgentRegistry(
+        triage=triage,
+        clarifying=triage.handoffs[0],
+        instruction=triage.handoffs[1],
+        planner=new_planner_agent(),
+        search=new_search_agent(),
+        writer=new_writer_agent(),
+        pdf_generator=new_pdf_generator_agent(),
+    )
+
+
+def measure(label: str, workflows: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    cached = []
+    started = time.perf_counter()
+    for _ in range(workflows):
+        cached.append(InteractiveGuitarTabWorkflow())
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:22} {elapsed / workflows * 1e6:8.1f} us/workflow"
+        f"  {(current - baseline) / workflows / 1024:7.2f} KiB/workflow"
+        f"  ({workflows} cached workflows, {(current - baseline) / 2**20:.1f} MiB)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workflows", type=int, default=3000)
+    args = parser.parse_args()
+
+    with mock.patch.object(guitar_tab_manager, "get_agent_registry", build_agents_per_workflow):
+        measure("per-workflow agents", args.workflows)
+
+    get_agent_registry()  # built once at worker start
+    measure("shared agent registry", args.workflows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""Offline load test: how many concurrent tab sessions one worker sustains.
+
+Runs the real InteractiveGuitarTabWorkflow, manager and activities on a local
+Temporal dev server (``WorkflowEnvironment.start_local``), with the model
+provider replaced by ``FakeModelProvider`` and PDF rendering by a stand-in
+activity, so no OpenAI quota or network access is used. For each concurrency
+level it reports workflows/sec, end-to-end and per-stage p50/p95/p99 latency,
+and the process's memory (worker and client share the process).
+
+The dev server binary is downloaded on first use and cached; pass
+``--target-host`` to use an already running server instead.
+
+Usage:
+    uv run benchmarks/load_benchmark.py [--concurrency 1,8,32] [--workflows 64] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+
+from temporalio import activity
+from temporalio.client import Client
+from temporalio.contrib.openai_agents import (
+    ModelActivityParameters,
+    set_open_ai_agent_temporal_overrides,
+)
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from openai_agents.codec import data_converter
+from openai_agents.fake_model_provider import (
+    STAGES,
+    FakeModelProvider,
+    LatencyDistribution,
+    StageRecorder,
+    parse_latencies,
+)
+from openai_agents.serializable_model_activity import SerializableModelActivity
+from openai_agents.workflows.disk_cache import DiskLRUCache
+from openai_agents.workflows.guitar_tab_workflow import InteractiveGuitarTabWorkflow
+from openai_agents.workflows.pdf_generation_activity import PDFGenerationResult, StylingOptions
+from openai_agents.workflows.report_cache_activity import ReportCacheActivities
+from openai_agents.workflows.report_stream_activity import (
+    ReportStreamActivities,
+    WorkflowSignalSink,
+)
+from openai_agents.workflows.research_agents.research_models import (
+    ClarificationInput,
+    TabRequestOptions,
+    UserQueryInput,
+)
+from openai_agents.workflows.search_cache_activity import SearchCacheActivities
+from openai_agents.workflows.tab_corpus import TabCorpus
+from openai_agents.workflows.tab_corpus_activity import TabCorpusActivities
+from openai_agents.workflows.task_queues import model_task_queue, pdf_task_queue
+
+TASK_QUEUE = "guitar-tab-load-test"
+
+
+class FakePdfActivities:
+    """Stands in for WeasyPrint rendering with a sleep."""
+
+    def __init__(self, latency: LatencyDistribution, recorder: StageRecorder) -> None:
+        self.latency = latency
+        self.recorder = recorder
+        self.rng = random.Random(11)
+
+    @activity.defn(name="generate_pdf")
+    async def generate_pdf(
+        self,
+        markdown_content: str,
+        title: str = "Research Report",
+        styling_options: Optional[StylingOptions] = None,
+    ) -> PDFGenerationResult:
+        await asyncio.sleep(self.latency.sample(self.rng))
+        self.recorder.record("pdf")
+        return PDFGenerationResult(pdf_file_path="pdf_output/fake.pdf", success=True)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def memory_mib() -> tuple[float, float]:
+    """(current, peak) resident set size of this process in MiB."""
+    current = 0.0
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                current = int(line.split()[1]) / 1024
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mib = peak / 2**20 if peak > 2**30 else peak / 1024
+    return current, peak_mib
+
+
+async def run_session(client: Client, query: str, options: TabRequestOptions, clarify: bool) -> None:
+    workflow_id = f"load-test-{query.replace(' ', '-').lower()}"
+    if not clarify:
+        await client.execute_workflow(
+            InteractiveGuitarTabWorkflow.run,
+            args=[query, False, options],
+            id=workflow_id,
+            task_queue=TASK_QUEUE,
+        )
+        return
+    handle = await client.start_workflow(
+        InteractiveGuitarTabWorkflow.run,
+        args=[None, True, options],
+        id=workflow_id,
+        task_queue=TASK_QUEUE,
+    )
+    status = await handle.execute_update(
+        InteractiveGuitarTabWorkflow.start_tab_session,
+        UserQueryInput(query=query, options=options),
+    )
+    if status.clarification_questions:
+        await handle.execute_update(
+            InteractiveGuitarTabWorkflow.provide_clarifications,
+            ClarificationInput(
+                responses={
+                    f"question_{i}": "No preference" for i in range(len(status.clarification_questions))
+                }
+            ),
+        )
+    await handle.result()
+
+
+async def run_level(
+    client: Client,
+    concurrency: int,
+    workflows: int,
+    first_song: int,
+    options: TabRequestOptions,
+    clarify: bool,
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def one(n: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                # Distinct songs so search caches never serve one workflow from another
+                await run_session(client, f"Load test song {first_song + n}", options, clarify)
+            except Exception as e:
+                failures += 1
+                print(f"  workflow failed: {e}")
+                return
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(workflows)))
+    elapsed = time.perf_counter() - started
+    current, peak = memory_mib()
+    return {
+        "concurrency": concurrency,
+        "workflows": workflows,
+        "failures": failures,
+        "seconds": elapsed,
+        "workflows_per_second": len(latencies) / elapsed,
+        "latency": latencies,
+        "rss_mib": current,
+        "peak_rss_mib": peak,
+    }
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {}
+    return {
+        "count": len(samples),
+        "p50": percentile(samples, 0.50),
+        "p95": percentile(samples, 0.95),
+        "p99": percentile(samples, 0.99),
+    }
+
+
+def print_level(level: dict) -> None:
+    e2e = level["end_to_end"]
+    print(
+        f"\nconcurrency {level['concurrency']:4}: {level['workflows']} workflows "
+        f"({level['failures']} failed) in {level['seconds']:.1f}s, "
+        f"{level['workflows_per_second']:.2f} workflows/s, "
+        f"RSS {level['rss_mib']:.0f} MiB (peak {level['peak_rss_mib']:.0f} MiB)"
+    )
+    print(f"  {'stage':12} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = [("end-to-end", e2e)] + [(stage, level["stages"][stage]) for stage in STAGES if stage in level["stages"]]
+    for name, stats in rows:
+        if stats:
+            print(
+                f"  {name:12} {stats['count']:5} {stats['p50']:7.2f}s {stats['p95']:7.2f}s {stats['p99']:7.2f}s"
+            )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--workflows", type=int, default=None, help="Workflows per level (default 4x concurrency)")
+    parser.add_argument("--clarify-rate", type=float, default=0.0, help="Share of sessions that get clarifying questions")
+    parser.add_argument("--searches", type=int, default=4, help="Searches per plan")
+    parser.add_argument(
+        "--latency",
+        default=None,
+        help="Per-stage model latency as stage=median[:sigma], e.g. search=1.5:0.6,writer=3",
+    )
+    parser.add_argument("--pdf-mode", choices=["direct", "agent"], default="direct")
+    parser.add_argument("--stream", action="store_true", help="Stream the writer's report back as signals")
+    parser.add_argument("--max-concurrent-activities", type=int, default=100)
+    parser.add_argument("--target-host", default=None, help="Use a running Temporal server instead of starting one")
+    parser.add_argument("--json", default=None, help="Write results to this file for regression checks")
+    args = parser.parse_args()
+
+    latencies = parse_latencies(args.latency)
+    recorder = StageRecorder()
+    provider = FakeModelProvider(
+        latencies,
+        recorder,
+        clarify_rate=args.clarify_rate,
+        searches_per_plan=args.searches,
+    )
+    # Rule triage off, so the fake triage agent's clarify rate decides clarifications
+    options = TabRequestOptions(
+        use_report_cache=False,
+        use_corpus=False,
+        rule_triage=False,
+        pdf_mode=args.pdf_mode,
+        stream_report=args.stream,
+    )
+    clarify = args.clarify_rate > 0
+
+    with tempfile.TemporaryDirectory() as cache_dir, set_open_ai_agent_temporal_overrides(
+        model_params=ModelActivityParameters(
+            task_queue=model_task_queue(TASK_QUEUE), start_to_close_timeout=timedelta(seconds=120)
+        ),
+    ):
+        if args.target_host:
+            env = None
+            client = await Client.connect(args.target_host, data_converter=data_converter)
+        else:
+            env = await WorkflowEnvironment.start_local(data_converter=data_converter)
+            client = env.client
+
+        search_cache = SearchCacheActivities(DiskLRUCache(Path(cache_dir) / "search.db"))
+        report_cache = ReportCacheActivities(DiskLRUCache(Path(cache_dir) / "reports.db"))
+        corpus = TabCorpusActivities(TabCorpus(Path(cache_dir) / "corpus.db"))
+        pdf = FakePdfActivities(latencies["pdf"], recorder)
+        report_stream = ReportStreamActivities(WorkflowSignalSink(client), provider)
+        # Same queue split as run_worker.py
+        workers = [
+            Worker(
+                client,
+                task_queue=TASK_QUEUE,
+                workflows=[InteractiveGuitarTabWorkflow],
+                activities=[
+                    search_cache.lookup_search_result,
+                    search_cache.store_search_result,
+                    report_cache.lookup_report,
+                    report_cache.store_report,
+                    corpus.lookup_corpus,
+                    corpus.index_tab_report,
+                ],
+            ),
+            Worker(
+                client,
+                task_queue=model_task_queue(TASK_QUEUE),
+                activities=[
+                    SerializableModelActivity(provider).invoke_model_activity,
+                    report_stream.stream_report,
+                ],
+                max_concurrent_activities=args.max_concurrent_activities,
+            ),
+            Worker(
+                client,
+                task_queue=pdf_task_queue(TASK_QUEUE),
+                activities=[pdf.generate_pdf],
+                max_concurrent_activities=args.max_concurrent_activities,
+            ),
+        ]
+
+        results = []
+        try:
+            async with workers[0], workers[1], workers[2]:
+                first_song = 0
+                for concurrency in [int(c) for c in args.concurrency.split(",")]:
+                    workflows = args.workflows or 4 * concurrency
+                    recorder.reset()
+                    level = await run_level(client, concurrency, workflows, first_song, options, clarify)
+                    first_song += workflows
+                    level["end_to_end"] = summarize(level.pop("latency"))
+                    level["stages"] = {stage: summarize(samples) for stage, samples in recorder.reset().items()}
+                    print_level(level)
+                    results.append(level)
+        finally:
+            if env is not None:
+                await env.shutdown()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,181 @@
+"""Model activity response conversion: original hasattr chain versus the cached converter registry.
+
+Converts realistic search agent responses (web search calls plus a long cited
+summary), writer responses and handoff calls, and checks both conversions give
+identical output.
+
+Usage:
+    uv run benchmarks/model_response_benchmark.py [--responses 2000] [--rounds 5]
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from agents import ModelResponse, Usage
+from openai.types.responses import (
+    ResponseFunctionToolCall,
+    ResponseFunctionWebSearch,
+    ResponseOutputMessage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+from openai_agents.serializable_model_activity import (
+    SerializableModelResponse,
+    SerializableUsage,
+)
+
+
+def legacy_usage(usage: Any) -> SerializableUsage:
+    """The original SerializableUsage.from_usage."""
+    input_tokens_details: Dict[str, Any] = {}
+    input_details = getattr(usage, "input_tokens_details", None)
+    if input_details:
+        try:
+            if hasattr(input_details, "__dict__"):
+                input_tokens_details = dict(input_details.__dict__)
+            elif hasattr(input_details, "model_dump"):
+                input_tokens_details = input_details.model_dump()
+            elif isinstance(input_details, dict):
+                input_tokens_details = dict(input_details)
+        except Exception:
+            input_tokens_details = {}
+    output_tokens_details: Dict[str, Any] = {}
+    output_details = getattr(usage, "output_tokens_details", None)
+    if output_details:
+        try:
+            if hasattr(output_details, "__dict__"):
+                output_tokens_details = dict(output_details.__dict__)
+            elif hasattr(output_details, "model_dump"):
+                output_tokens_details = output_details.model_dump()
+            elif isinstance(output_details, dict):
+                output_tokens_details = dict(output_details)
+        except Exception:
+            output_tokens_details = {}
+    return SerializableUsage(
+        requests=getattr(usage, "requests", 0),
+        input_tokens=getattr(usage, "input_tokens", 0),
+        output_tokens=getattr(usage, "output_tokens", 0),
+        input_tokens_details=input_tokens_details,
+        output_tokens_details=output_tokens_details,
+    )
+
+
+def legacy_response(response: Any) -> SerializableModelResponse:
+    """The original SerializableModelResponse.from_model_response."""
+    output_dicts: List[Any] = []
+    for item in response.output:
+        try:
+            if hasattr(item, "model_dump"):
+                output_dicts.append(item.model_dump(mode="json", exclude_unset=True))
+            elif hasattr(item, "__dict__"):
+                output_dicts.append(dict(item.__dict__))
+            else:
+                output_dicts.append(item)
+        except Exception as e:
+            output_dicts.append({"error": f"Serialization failed: {str(e)}", "type": str(type(item).__name__)})
+    try:
+        usage = legacy_usage(response.usage)
+    except Exception:
+        usage = SerializableUsage()
+    return SerializableModelResponse(output=output_dicts, usage=usage, response_id=response.response_id)
+
+
+def make_usage(rng: random.Random) -> Usage:
+    return Usage(
+        requests=1,
+        input_tokens=rng.randint(500, 4000),
+        output_tokens=rng.randint(100, 1500),
+        total_tokens=0,
+        input_tokens_details=InputTokensDetails(cached_tokens=rng.randint(0, 500)),
+        output_tokens_details=OutputTokensDetails(reasoning_tokens=rng.randint(0, 300)),
+    )
+
+
+def search_response(rng: random.Random, n: int) -> ModelResponse:
+    song = f"Song {n}"
+    output: List[Any] = []
+    for i in range(rng.randint(1, 3)):
+        output.append(
+            ResponseFunctionWebSearch.model_validate(
+                {
+                    "id": f"ws_{n}_{i}",
+                    "status": "completed",
+                    "type": "web_search_call",
+                    "action": {"type": "search", "query": f"{song} guitar tab {i}"},
+                }
+            )
+        )
+    text = " ".join(
+        f"{song} uses a {rng.choice(['power chord', 'barre chord', 'open chord'])} shape on fret {rng.randint(0, 12)}."
+        for _ in range(30)
+    )
+    annotations = [
+        {
+            "type": "url_citation",
+            "start_index": 20 * i,
+            "end_index": 20 * i + 15,
+            "title": f"{song} tab source {i}",
+            "url": f"https://tabs.example.com/{n}/{i}",
+        }
+        for i in range(rng.randint(2, 6))
+    ]
+    output.append(
+        ResponseOutputMessage.model_validate(
+            {
+                "id": f"msg_{n}",
+                "role": "assistant",
+                "status": "completed",
+                "type": "message",
+                "content": [{"type": "output_text", "text": text, "annotations": annotations}],
+            }
+        )
+    )
+    return ModelResponse(output=output, usage=make_usage(rng), response_id=f"resp_{n}")
+
+
+def handoff_response(rng: random.Random, n: int) -> ModelResponse:
+    call = ResponseFunctionToolCall(
+        arguments="{}", call_id=f"call_{n}", name="transfer_to_guitar_instruction_agent", type="function_call"
+    )
+    return ModelResponse(output=[call], usage=make_usage(rng), response_id=f"resp_{n}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--responses", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    responses = [
+        search_response(rng, n) if rng.random() < 0.7 else handoff_response(rng, n)
+        for n in range(args.responses)
+    ]
+    items = sum(len(response.output) for response in responses)
+
+    for response in responses:
+        expected = legacy_response(response).model_dump(mode="json")
+        actual = SerializableModelResponse.from_model_response(response).model_dump(mode="json")
+        assert actual == expected, f"conversion differs for {response.response_id}"
+
+    for label, convert in [
+        ("hasattr chain", legacy_response),
+        ("converter registry", SerializableModelResponse.from_model_response),
+    ]:
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            for response in responses:
+                convert(response)
+        elapsed = time.perf_counter() - started
+        calls = args.responses * args.rounds
+        print(
+            f"{label:20} {elapsed / calls * 1e6:8.1f} us/response  "
+            f"{elapsed / (items * args.rounds) * 1e6:7.2f} us/item  ({calls} responses)"
+        )
+
+
+if __name__ == "__main__":
+    main()
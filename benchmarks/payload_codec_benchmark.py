@@ -0,0 +1,126 @@
+"""Payload bytes and encode/decode cost of the compression codec over a session's payloads.
+
+Builds the payloads one tab session writes to history (query and options,
+search inputs and summaries, model responses, the report, the PDF agent
+prompt) with the pydantic payload converter, then compares their size with
+and without CompressionCodec and times the codec. Every payload is checked to
+decode back to the original.
+
+Usage:
+    uv run benchmarks/payload_codec_benchmark.py [--sessions 200] [--min-bytes 1024]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from pathlib import Path
+
+from temporalio.contrib.pydantic import pydantic_data_converter
+
+from tablature_benchmark import generate_report
+
+from openai_agents.codec import CompressionCodec
+
+SENTENCES = [
+    "The song is played in standard tuning with a capo on the second fret.",
+    "The main riff alternates between a palm-muted low E and a power chord on the fifth fret.",
+    "Most tab sites agree on the verse voicing; the chorus differs between live and studio versions.",
+    "The solo uses the minor pentatonic box at the twelfth fret with bends on the G string.",
+    "Beginners can simplify the barre chords to open shapes without changing the feel.",
+]
+
+
+def paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(sentences))
+
+
+def model_response(rng: random.Random, text: str) -> dict:
+    return {
+        "output": [
+            {
+                "id": f"msg_{rng.getrandbits(48):x}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [
+                    {
+                        "type": "output_text",
+                        "text": text,
+                        "annotations": [
+                            {"type": "url_citation", "url": f"https://tabs.example.com/{rng.getrandbits(32):x}"}
+                            for _ in range(rng.randint(0, 4))
+                        ],
+                    }
+                ],
+            }
+        ],
+        "usage": {"requests": 1, "input_tokens": rng.randint(300, 4000), "output_tokens": rng.randint(100, 2000)},
+        "response_id": f"resp_{rng.getrandbits(48):x}",
+    }
+
+
+def session_payloads(rng: random.Random, report: str) -> list:
+    """Values one direct-mode session serializes, roughly in history order."""
+    query = f"Song {rng.randint(1, 10_000)} by Artist {rng.randint(1, 500)}"
+    values: list = [query, False, {"use_report_cache": True, "pdf_mode": "direct"}]
+    plan = [{"reason": paragraph(rng, 1), "query": f"{query} guitar tab {i}"} for i in range(5)]
+    values.append(model_response(rng, str({"searches": plan})))
+    summaries = []
+    for item in plan:
+        values.append(item)
+        summary = paragraph(rng, rng.randint(8, 20))
+        summaries.append(summary)
+        values.append(model_response(rng, summary))
+    values.append(model_response(rng, report))
+    values.append({"markdown_report": report, "short_summary": paragraph(rng, 2), "search_summaries": summaries})
+    values.append({"prompt": f"Create a PDF from this report:\n\n{report}"})
+    values.append({"short_summary": paragraph(rng, 2), "markdown_report": report, "follow_up_questions": []})
+    return values
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--min-bytes", type=int, default=1024)
+    parser.add_argument("--level", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    reports = [Path("guitar_tab.md").read_text()] + [generate_report(rng) for _ in range(args.sessions - 1)]
+    payloads = []
+    for report in reports:
+        payloads.extend(pydantic_data_converter.payload_converter.to_payloads(session_payloads(rng, report)))
+
+    codec = CompressionCodec(min_bytes=args.min_bytes, level=args.level)
+    started = time.perf_counter()
+    encoded = await codec.encode(payloads)
+    encode_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    decoded = await codec.decode(encoded)
+    decode_seconds = time.perf_counter() - started
+    assert decoded == payloads, "codec round trip changed a payload"
+
+    # Payloads from before the codec was enabled must still decode unchanged
+    assert await codec.decode(payloads) == payloads
+
+    raw_bytes = sum(p.ByteSize() for p in payloads)
+    encoded_bytes = sum(p.ByteSize() for p in encoded)
+    compressed = sum(1 for raw, enc in zip(payloads, encoded) if raw is not enc)
+    print(f"{args.sessions} sessions, {len(payloads)} payloads, {compressed} compressed (>= {args.min_bytes} bytes)")
+    print(
+        f"Payload bytes: {raw_bytes / 1e6:.2f} MB -> {encoded_bytes / 1e6:.2f} MB "
+        f"({encoded_bytes / raw_bytes:.1%}), {raw_bytes / args.sessions / 1024:.1f} KiB -> "
+        f"{encoded_bytes / args.sessions / 1024:.1f} KiB per session"
+    )
+    print(
+        f"Encode: {encode_seconds / len(payloads) * 1e6:.1f} us/payload, {raw_bytes / encode_seconds / 1e6:.0f} MB/s"
+    )
+    print(
+        f"Decode: {decode_seconds / len(payloads) * 1e6:.1f} us/payload, {raw_bytes / decode_seconds / 1e6:.0f} MB/s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
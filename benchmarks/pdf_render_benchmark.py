@@ -0,0 +1,94 @@
+"""Per-PDF render time with inline CSS versus cached stylesheets.
+
+Usage:
+    uv run benchmarks/pdf_render_benchmark.py [--iterations 20] [--markdown guitar_tab.md]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import markdown
+
+from openai_agents.workflows.pdf_generation_activity import (
+    WEASYPRINT_AVAILABLE,
+    _get_custom_css,
+    _get_default_css,
+    _render_pdf_file,
+    weasyprint,
+)
+
+
+def render_inline_css(markdown_content: str, title: str, pdf_path: str) -> None:
+    """The original render path: CSS rebuilt and embedded in every document."""
+    html_content = markdown.markdown(markdown_content, extensions=["tables", "fenced_code", "toc"])
+    full_html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <title>{title}</title>
+        <style>
+            {_get_default_css()}
+            {_get_custom_css(None)}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1 class="document-title">{title}</h1>
+            <div class="content">{html_content}</div>
+        </div>
+    </body>
+    </html>
+    """
+    assert weasyprint is not None
+    weasyprint.HTML(string=full_html).write_pdf(pdf_path)
+
+
+def time_renders(render, markdown_content: str, iterations: int, output_dir: Path) -> list[float]:
+    timings = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        render(markdown_content, "Guitar Tab", str(output_dir / f"{render.__name__}_{i}.pdf"))
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _render_cached_css(markdown_content: str, title: str, pdf_path: str) -> None:
+    _render_pdf_file(markdown_content, title, None, pdf_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--markdown", default="guitar_tab.md", help="Markdown report to render")
+    args = parser.parse_args()
+
+    if not WEASYPRINT_AVAILABLE:
+        raise SystemExit("WeasyPrint is not available; see the README for system dependencies")
+
+    markdown_content = Path(args.markdown).read_text()
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        # One untimed render per path so imports and first-use setup are excluded
+        render_inline_css(markdown_content, "warm-up", str(output_dir / "warm_inline.pdf"))
+        _render_cached_css(markdown_content, "warm-up", str(output_dir / "warm_cached.pdf"))
+
+        results = {
+            "inline CSS (before)": time_renders(render_inline_css, markdown_content, args.iterations, output_dir),
+            "cached CSS + fonts (after)": time_renders(_render_cached_css, markdown_content, args.iterations, output_dir),
+        }
+
+    print(f"{args.iterations} renders of {args.markdown}")
+    for name, timings in results.items():
+        print(
+            f"{name:28} mean {statistics.mean(timings) * 1000:7.1f} ms"
+            f"  median {statistics.median(timings) * 1000:7.1f} ms"
+            f"  min {min(timings) * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Parse and render throughput of the tablature model over a corpus of tab reports.
+
+The corpus is guitar_tab.md plus generated reports in the same shape as the
+writer's output (intro text, several fenced tab blocks with slides, bends,
+hammer-ons and two-digit frets). Every document is checked to render back
+byte for byte.
+
+Usage:
+    uv run benchmarks/tablature_benchmark.py [--documents 500] [--rounds 5]
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from openai_agents.workflows.tablature import parse_tab_document
+
+STRING_NAMES = ["e", "B", "G", "D", "A", "E"]
+TECHNIQUES = ["h", "p", "/", "\\", "b", "r", "~"]
+
+
+def generate_tab_block(rng: random.Random, measures: int) -> str:
+    lines = []
+    for name in STRING_NAMES:
+        body = []
+        for _ in range(measures):
+            measure = []
+            while len("".join(measure)) < 16:
+                roll = rng.random()
+                if roll < 0.55:
+                    measure.append("-")
+                elif roll < 0.85:
+                    measure.append(str(rng.randint(0, 15)))
+                else:
+                    measure.append(f"{rng.randint(0, 12)}{rng.choice(TECHNIQUES)}{rng.randint(0, 14)}")
+            body.append("".join(measure))
+        lines.append(f"{name}|{'|'.join(body)}|")
+    return "\n".join(lines)
+
+
+def generate_report(rng: random.Random) -> str:
+    sections = [f"### Song {rng.randint(1, 10_000)} - Guitar Tab\n\nA short introduction to the song.\n"]
+    for section in ["Intro", "Verse", "Chorus", "Solo"][: rng.randint(2, 4)]:
+        sections.append(f"#### {section}\n\n```\n{generate_tab_block(rng, rng.randint(2, 4))}\n```\n")
+    return "\n".join(sections)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [Path("guitar_tab.md").read_text()] + [
+        generate_report(rng) for _ in range(args.documents - 1)
+    ]
+    corpus_bytes = sum(len(document.encode("utf-8")) for document in corpus)
+
+    documents = [parse_tab_document(document) for document in corpus]
+    for original, document in zip(corpus, documents):
+        assert document.render() == original, "render is not lossless"
+    strings = sum(len(block.strings) for document in documents for block in document.blocks)
+
+    parse_seconds = render_seconds = 0.0
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        documents = [parse_tab_document(document) for document in corpus]
+        parse_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        for document in documents:
+            document.render()
+        render_seconds += time.perf_counter() - started
+
+    total_mb = corpus_bytes * args.rounds / 2**20
+    print(f"{len(corpus)} documents, {strings} tab strings, {corpus_bytes / 1024:.0f} KiB per round")
+    print(f"parse  {total_mb / parse_seconds:7.2f} MiB/s  {len(corpus) * args.rounds / parse_seconds:9.0f} docs/s")
+    print(f"render {total_mb / render_seconds:7.2f} MiB/s  {len(corpus) * args.rounds / render_seconds:9.0f} docs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Fast-path hit rate and cost of the rule-based triage in openai_agents.workflows.triage_rules.
+
+Classifies a set of requests and reports how many the rules settle without a
+model call (planned directly, or asked templated clarification questions),
+why the rest fall back to the triage agent, and the time per classification.
+Pass a batch input file (JSONL with a "query" per line, or CSV with a query
+column) to measure real traffic; otherwise a built-in sample of typical
+requests is used.
+
+The guitar_tab_triage_decisions counter, by path, reports the same hit rate
+from a running worker.
+
+Usage:
+    uv run benchmarks/triage_rules_benchmark.py [queries.jsonl] [--rounds 200] [--show-fallbacks]
+"""
+
+import argparse
+import time
+from collections import Counter
+from pathlib import Path
+
+from openai_agents.run_batch_guitar_tab_workflows import read_queries
+from openai_agents.workflows.triage_rules import classify_request
+
+SAMPLE_QUERIES = [
+    "Teach me how to play Wonderwall on guitar",
+    "Wonderwall chords for a beginner, just the chorus",
+    "Enter Sandman tab",
+    "Intermediate tab for the Stairway to Heaven solo",
+    "Smoke on the Water main riff, easy version",
+    "Blackbird by the Beatles, fingerpicking for beginners",
+    "Hotel California solo tab, advanced, half step down",
+    "Everlong in drop D, whole song tab for an intermediate player",
+    '"Simple Man" chords for beginners, whole song',
+    "Knockin' on Heaven's Door chords",
+    "Give me the intro to Sweet Child O' Mine",
+    "Nothing Else Matters intro tab for beginners",
+    "Come As You Are riff",
+    "Hallelujah chords, not the beginner version",
+    "How do I tune my guitar?",
+    "What's the difference between a major and minor scale?",
+    "Teach me guitar",
+    "Recommend some easy songs for beginners",
+    "Seven Nation Army main riff tab for a beginner",
+    "Let It Be chords and tab for the verse and chorus, intermediate",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("queries", nargs="?", help="JSONL or CSV of queries (default: built-in sample)")
+    parser.add_argument("--rounds", type=int, default=200, help="Classification passes for timing")
+    parser.add_argument("--show-fallbacks", action="store_true", help="List queries sent to the triage agent")
+    args = parser.parse_args()
+
+    queries = [item.query for item in read_queries(Path(args.queries))] if args.queries else SAMPLE_QUERIES
+    decisions = [classify_request(query) for query in queries]
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for query in queries:
+            classify_request(query)
+    per_query = (time.perf_counter() - started) / (args.rounds * len(queries))
+
+    paths = Counter(decision.path for decision in decisions)
+    fast = paths["plan"] + paths["clarify"]
+    print(f"{len(queries)} queries, {per_query * 1e6:.1f} µs per classification")
+    print(f"fast-path hit rate: {fast / len(queries):.1%} ({fast} of {len(queries)} without the triage agent)")
+    for path in ["plan", "clarify", "llm"]:
+        print(f"  {path:8} {paths[path]:6}  {paths[path] / len(queries):6.1%}")
+    fallbacks = Counter(decision.reason for decision in decisions if decision.path == "llm")
+    for reason, count in fallbacks.most_common():
+        print(f"    llm: {reason:24} {count:6}")
+
+    if args.show_fallbacks:
+        for query, decision in zip(queries, decisions):
+            if decision.path == "llm":
+                print(f"  [{decision.reason}] {query}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Blob storage shared by the worker and clients.
+
+Large payloads (via ``ClaimCheckCodec``) and rendered PDFs are stored here
+instead of in workflow history or on the disk of whichever worker produced
+them. Workflows and results carry only a reference: ``blob:<key>``.
+
+``LocalBlobStore`` keeps blobs in a directory (``BLOB_STORE_DIR``, default
+``blob_store``), which every worker and client must be able to reach, e.g. a
+shared volume. Another backend, such as an S3-compatible store, implements
+the four ``BlobStore`` methods. ``LocalBlobStore.sweep`` deletes blobs not
+written for longer than a TTL; an S3-compatible store would use a lifecycle
+rule instead.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from pathlib import Path
+
+BLOB_REF_PREFIX = "blob:"
+
+
+class BlobStore(ABC):
+    """Bytes stored under slash-separated keys. Implementations must be safe to call from threads."""
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None: ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """The blob's bytes; raises KeyError if there is none."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    def touch(self, key: str) -> None:
+        """Mark an existing blob as just written, for backends that expire blobs by age."""
+
+    def put_content_addressed(self, prefix: str, data: bytes, suffix: str = "") -> str:
+        """Store ``data`` under its sha256 and return the key; identical blobs are stored once."""
+        key = f"{prefix}/{hashlib.sha256(data).hexdigest()}{suffix}"
+        if self.exists(key):
+            # Referenced again, so it must outlive the new reference too
+            self.touch(key)
+        else:
+            self.put(key, data)
+        return key
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under a root directory."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Blob key escapes the store: {key!r}")
+        return path
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so readers never see a partial blob
+        fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def touch(self, key: str) -> None:
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self, ttl: timedelta, now: float | None = None) -> int:
+        """Delete blobs, and abandoned partial writes, last written more than ``ttl`` ago.
+
+        Returns the number of files deleted.
+        """
+        cutoff = (time.time() if now is None else now) - ttl.total_seconds()
+        deleted = 0
+        if not self.root.is_dir():
+            return 0
+        for path in self.root.rglob("*"):
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                pass  # removed by another sweeper
+        return deleted
+
+
+@functools.lru_cache(maxsize=None)
+def default_blob_store() -> BlobStore:
+    """The store configured by ``BLOB_STORE_DIR``, shared by the whole process."""
+    return LocalBlobStore(os.environ.get("BLOB_STORE_DIR", "blob_store"))
+
+
+def blob_ref(key: str) -> str:
+    return f"{BLOB_REF_PREFIX}{key}"
+
+
+def is_blob_ref(value: str | None) -> bool:
+    return value is not None and value.startswith(BLOB_REF_PREFIX)
+
+
+def read_blob(ref: str, store: BlobStore | None = None) -> bytes:
+    return (store or default_blob_store()).get(ref[len(BLOB_REF_PREFIX) :])
+
+
+def save_blob(ref: str, directory: str | Path, store: BlobStore | None = None) -> Path:
+    """Copy a referenced blob into ``directory`` under its key's file name."""
+    path = Path(directory) / Path(ref[len(BLOB_REF_PREFIX) :]).name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(read_blob(ref, store))
+    return path
@@ -0,0 +1,156 @@
+"""Payload codecs for workflow history: compression and claim checks.
+
+Report markdown, search summaries and model responses are large, repetitive
+text, so payloads above a size threshold are zlib-compressed before they reach
+the server. A compressed payload wraps the serialized original and is marked
+with the ``binary/zlib`` encoding; payloads without the marker pass through
+untouched, so histories written before compression was enabled still decode.
+
+Payloads still large after compression are moved to the blob store by
+``ClaimCheckCodec`` and replaced by their content-addressed key, marked with
+the ``binary/claim-check`` encoding. Only the side that decodes the payload
+(the client reading a result, the worker reading its input) fetches the blob,
+and only when it decodes it. Content-addressed blobs never change, so resolved
+payloads are kept in a bounded in-memory cache: a workflow replayed on the
+same worker reuses them instead of reading the blob store again.
+
+Workers and clients must share the codec: use ``data_converter`` from this
+module instead of ``pydantic_data_converter``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import zlib
+from collections import OrderedDict
+from typing import Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.contrib.pydantic import pydantic_data_converter
+from temporalio.converter import DataConverter, PayloadCodec
+
+from openai_agents.blob_store import BlobStore, default_blob_store
+
+ENCODING_KEY = "encoding"
+ZLIB_ENCODING = b"binary/zlib"
+CLAIM_CHECK_ENCODING = b"binary/claim-check"
+
+# Smaller payloads (IDs, flags, short answers) are not worth the header and CPU
+DEFAULT_MIN_BYTES = 1024
+
+# Compressed payloads at least this large go to the blob store
+DEFAULT_CLAIM_CHECK_BYTES = 16 * 1024
+
+# Resolved claim-check payloads kept in memory per process
+DEFAULT_CLAIM_CHECK_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class CompressionCodec(PayloadCodec):
+    """zlib-compresses payloads of at least ``min_bytes`` when that makes them smaller."""
+
+    def __init__(self, min_bytes: int = DEFAULT_MIN_BYTES, level: int = 6) -> None:
+        self.min_bytes = min_bytes
+        self.level = level
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        return [self.encode_payload(p) for p in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        return [self.decode_payload(p) for p in payloads]
+
+    def encode_payload(self, payload: Payload) -> Payload:
+        if len(payload.data) < self.min_bytes:
+            return payload
+        compressed = zlib.compress(payload.SerializeToString(), self.level)
+        if len(compressed) >= payload.ByteSize():
+            return payload
+        return Payload(metadata={ENCODING_KEY: ZLIB_ENCODING}, data=compressed)
+
+    def decode_payload(self, payload: Payload) -> Payload:
+        if payload.metadata.get(ENCODING_KEY) != ZLIB_ENCODING:
+            return payload  # uncompressed, including every payload from older histories
+        return Payload.FromString(zlib.decompress(payload.data))
+
+
+class ClaimCheckCodec(PayloadCodec):
+    """Stores payloads of at least ``min_bytes`` in a blob store and sends their key instead.
+
+    Up to ``cache_bytes`` of payloads, most recently used first, are kept by
+    key so repeated decodes do not read the store.
+    """
+
+    def __init__(
+        self,
+        store: BlobStore,
+        min_bytes: int = DEFAULT_CLAIM_CHECK_BYTES,
+        cache_bytes: int = DEFAULT_CLAIM_CHECK_CACHE_BYTES,
+    ) -> None:
+        self.store = store
+        self.min_bytes = min_bytes
+        self.cache_bytes = cache_bytes
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._cached_bytes = 0
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        return [await self._encode_payload(p) for p in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        return [await self._decode_payload(p) for p in payloads]
+
+    async def _encode_payload(self, payload: Payload) -> Payload:
+        if payload.ByteSize() < self.min_bytes:
+            return payload
+        data = payload.SerializeToString()
+        key = await asyncio.to_thread(self.store.put_content_addressed, "payloads", data)
+        self._remember(key, data)
+        return Payload(metadata={ENCODING_KEY: CLAIM_CHECK_ENCODING}, data=key.encode("utf-8"))
+
+    async def _decode_payload(self, payload: Payload) -> Payload:
+        if payload.metadata.get(ENCODING_KEY) != CLAIM_CHECK_ENCODING:
+            return payload
+        key = payload.data.decode("utf-8")
+        data = self._cache.get(key)
+        if data is None:
+            data = await asyncio.to_thread(self.store.get, key)
+            self._remember(key, data)
+        else:
+            self._cache.move_to_end(key)
+        return Payload.FromString(data)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.cache_bytes or key in self._cache:
+            return
+        self._cache[key] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+
+class ChainedCodec(PayloadCodec):
+    """Applies codecs in order when encoding and in reverse when decoding."""
+
+    def __init__(self, *codecs: PayloadCodec) -> None:
+        self.codecs = codecs
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        encoded = list(payloads)
+        for codec in self.codecs:
+            encoded = list(await codec.encode(encoded))
+        return encoded
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        decoded = list(payloads)
+        for codec in reversed(self.codecs):
+            decoded = list(await codec.decode(decoded))
+        return decoded
+
+
+def create_data_converter(store: BlobStore | None = None) -> DataConverter:
+    """The pydantic converter with compression, then claim checks into ``store``."""
+    codec = ChainedCodec(CompressionCodec(), ClaimCheckCodec(store or default_blob_store()))
+    return dataclasses.replace(pydantic_data_converter, payload_codec=codec)
+
+
+data_converter: DataConverter = create_data_converter()
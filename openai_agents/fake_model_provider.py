@@ -0,0 +1,289 @@
+"""Offline stand-in for the OpenAI model provider, for load tests and workflow tests.
+
+``FakeModelProvider`` returns canned, schema-valid outputs for every agent in
+the pipeline after sleeping for a latency drawn from a per-stage lognormal
+distribution. It is passed to ``SerializableModelActivity(model_provider)``, so
+workflows, activities and serialization run exactly as in production; only the
+HTTP call to the model is replaced.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from agents import Model, ModelProvider, ModelResponse, Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+from temporalio import activity
+
+from openai_agents.workflows.guitar_tab_agents.instruction_agent import INSTRUCTION_PROMPT
+from openai_agents.workflows.guitar_tab_agents.triage_agent import TRIAGE_AGENT_PROMPT
+
+STAGES = ["triage", "clarifying", "instruction", "planner", "search", "writer", "pdf"]
+# Characters per streamed text delta
+STREAM_DELTA_CHARS = 40
+
+CANNED_TAB = """### "{song}" - Guitar Tab
+
+A short introduction to the song and how to play its main riff.
+
+#### Main Riff
+
+```
+e|-----------------|-----------------|
+B|-----------------|-----------------|
+G|-----------------|-----------------|
+D|-----7--7/9-9----|-----7--7/9-9----|
+A|-9---5--5/7-7----|-9---5--5/7-7----|
+E|-7---------------|-7---------------|
+```
+"""
+
+
+@dataclass
+class LatencyDistribution:
+    """Lognormal latency: ``median`` seconds, spread ``sigma``."""
+
+    median: float
+    sigma: float = 0.3
+
+    def sample(self, rng: random.Random) -> float:
+        return self.median * rng.lognormvariate(0.0, self.sigma)
+
+
+DEFAULT_LATENCIES = {
+    "triage": LatencyDistribution(0.4),
+    "clarifying": LatencyDistribution(0.6),
+    "instruction": LatencyDistribution(0.5),
+    "planner": LatencyDistribution(0.8),
+    "search": LatencyDistribution(2.0, 0.5),
+    "writer": LatencyDistribution(4.0, 0.4),
+    "pdf": LatencyDistribution(0.5),
+}
+
+
+def parse_latencies(spec: str | None) -> dict[str, LatencyDistribution]:
+    """Override defaults from ``"search=1.5:0.6,writer=3"`` (median[:sigma] per stage)."""
+    latencies = dict(DEFAULT_LATENCIES)
+    for part in filter(None, (spec or "").split(",")):
+        stage, _, value = part.partition("=")
+        if stage not in latencies:
+            raise ValueError(f"Unknown stage {stage!r}; expected one of {', '.join(STAGES)}")
+        median, _, sigma = value.partition(":")
+        latencies[stage] = LatencyDistribution(float(median), float(sigma) if sigma else 0.3)
+    return latencies
+
+
+class StageRecorder:
+    """Per-stage latencies, from activity scheduling to completion, so queueing on a busy worker counts."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def record(self, stage: str) -> None:
+        info = activity.info()
+        scheduled = info.current_attempt_scheduled_time or info.started_time
+        seconds = time.time() - scheduled.timestamp()
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def reset(self) -> dict[str, list[float]]:
+        with self._lock:
+            samples, self.samples = self.samples, defaultdict(list)
+        return samples
+
+
+def _text_response(text: str) -> list[Any]:
+    return [
+        ResponseOutputMessage(
+            id="msg_fake",
+            content=[ResponseOutputText(text=text, type="output_text", annotations=[])],
+            role="assistant",
+            status="completed",
+            type="message",
+        )
+    ]
+
+
+def _handoff_response(tool_name: str) -> list[Any]:
+    return [
+        ResponseFunctionToolCall(
+            arguments="{}",
+            call_id=f"call_{tool_name}",
+            name=tool_name,
+            type="function_call",
+        )
+    ]
+
+
+class FakeModel(Model):
+    def __init__(
+        self,
+        latencies: dict[str, LatencyDistribution],
+        recorder: StageRecorder,
+        rng: random.Random,
+        clarify_rate: float,
+        searches_per_plan: int,
+    ) -> None:
+        self.latencies = latencies
+        self.recorder = recorder
+        self.rng = rng
+        self.clarify_rate = clarify_rate
+        self.searches_per_plan = searches_per_plan
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: Any,
+        model_settings: Any,
+        tools: list[Any],
+        output_schema: Any,
+        handoffs: list[Any],
+        tracing: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        schema = output_schema.name() if output_schema is not None else ""
+        stage, output = self._respond(system_instructions or "", _input_text(input), schema, handoffs)
+        await asyncio.sleep(self.latencies[stage].sample(self.rng))
+        self.recorder.record(stage)
+        text_length = sum(len(str(item)) for item in output)
+        return ModelResponse(
+            output=output,
+            usage=Usage(requests=1, input_tokens=len(_input_text(input)) // 4, output_tokens=text_length // 4),
+            response_id=None,
+        )
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: Any,
+        model_settings: Any,
+        tools: list[Any],
+        output_schema: Any,
+        handoffs: list[Any],
+        tracing: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        """Stream the canned output as text deltas spread over the stage latency."""
+        schema = output_schema.name() if output_schema is not None else ""
+        stage, output = self._respond(system_instructions or "", _input_text(input), schema, handoffs)
+        text = "".join(
+            content.text
+            for item in output
+            if isinstance(item, ResponseOutputMessage)
+            for content in item.content
+        )
+        deltas = [text[i : i + STREAM_DELTA_CHARS] for i in range(0, len(text), STREAM_DELTA_CHARS)]
+        delay = self.latencies[stage].sample(self.rng) / max(1, len(deltas))
+        for sequence, delta in enumerate(deltas):
+            await asyncio.sleep(delay)
+            yield ResponseTextDeltaEvent(
+                content_index=0,
+                delta=delta,
+                item_id="msg_fake",
+                logprobs=[],
+                output_index=0,
+                sequence_number=sequence,
+                type="response.output_text.delta",
+            )
+        if not deltas:
+            await asyncio.sleep(delay)
+        self.recorder.record(stage)
+        response = Response(
+            id="resp_fake",
+            created_at=time.time(),
+            model="fake",
+            object="response",
+            output=output,
+            error=None,
+            incomplete_details=None,
+            instructions=None,
+            metadata=None,
+            parallel_tool_calls=False,
+            temperature=None,
+            tool_choice="auto",
+            tools=[],
+            top_p=None,
+        )
+        yield ResponseCompletedEvent(response=response, sequence_number=len(deltas), type="response.completed")
+
+    def _respond(
+        self, instructions: str, text: str, schema: str, handoffs: list[Any]
+    ) -> tuple[str, list[Any]]:
+        song = _song_from(text)
+        if instructions == TRIAGE_AGENT_PROMPT:
+            target = 0 if self.rng.random() < self.clarify_rate else 1  # clarifying, instruction
+            return "triage", _handoff_response(handoffs[target].tool_name)
+        if instructions == INSTRUCTION_PROMPT:
+            return "instruction", _handoff_response(handoffs[0].tool_name)
+        if schema == "Clarifications":
+            questions = ["Do you prefer chords or tablature?", "What is your skill level?"]
+            return "clarifying", _text_response(json.dumps({"questions": questions}))
+        if schema == "WebSearchPlan":
+            searches = [
+                {"reason": f"Source {i}", "query": f"{song} guitar tab source {i}"}
+                for i in range(self.searches_per_plan)
+            ]
+            return "planner", _text_response(json.dumps({"searches": searches}))
+        if schema == "ReportData":
+            report = {
+                "short_summary": f"How to play {song}.",
+                "markdown_report": CANNED_TAB.format(song=song),
+                "follow_up_questions": ["Want the solo next?"],
+            }
+            return "writer", _text_response(json.dumps(report))
+        if schema == "PDFReportData":
+            pdf = {"success": True, "formatting_notes": "Canned", "pdf_file_path": "pdf_output/fake.pdf"}
+            return "pdf", _text_response(json.dumps(pdf))
+        # The search agent has no output type and summarizes its (skipped) web search
+        return "search", _text_response(
+            f"{song} is played in standard tuning with power chords on the low strings. "
+            "The main riff repeats seven times before the verse."
+        )
+
+
+class FakeModelProvider(ModelProvider):
+    def __init__(
+        self,
+        latencies: dict[str, LatencyDistribution] | None = None,
+        recorder: StageRecorder | None = None,
+        clarify_rate: float = 0.0,
+        searches_per_plan: int = 4,
+        seed: int = 7,
+    ) -> None:
+        self.latencies = latencies or dict(DEFAULT_LATENCIES)
+        self.recorder = recorder or StageRecorder()
+        self.clarify_rate = clarify_rate
+        self.searches_per_plan = searches_per_plan
+        self.rng = random.Random(seed)
+
+    def get_model(self, model_name: str | None) -> Model:
+        return FakeModel(
+            self.latencies, self.recorder, self.rng, self.clarify_rate, self.searches_per_plan
+        )
+
+
+def _input_text(input: Any) -> str:
+    if isinstance(input, str):
+        return input
+    return json.dumps(input, default=str)
+
+
+def _song_from(text: str) -> str:
+    match = re.search(r"Load test song \d+", text)
+    return match.group(0) if match else "Load test song"
@@ -0,0 +1,117 @@
+"""Worker metrics: Temporal runtime telemetry plus the pipeline's own histograms.
+
+Metrics are exported on a Prometheus scrape endpoint or, when no endpoint is
+configured, written periodically to a file in the Prometheus text format
+(readable directly or by node_exporter's textfile collector). Temporal's
+runtime takes a single metrics exporter, so the endpoint wins if both are set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from temporalio.runtime import (
+    BUFFERED_METRIC_KIND_COUNTER,
+    BUFFERED_METRIC_KIND_HISTOGRAM,
+    MetricBuffer,
+    MetricBufferDurationFormat,
+    PrometheusConfig,
+    Runtime,
+    TelemetryConfig,
+)
+
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class MetricsFileWriter:
+    """Drains a MetricBuffer and rewrites a Prometheus text file with the running totals."""
+
+    def __init__(self, buffer: MetricBuffer, path: str | Path, interval_seconds: float = 5.0) -> None:
+        self.buffer = buffer
+        self.path = Path(path)
+        self.interval_seconds = interval_seconds
+        self.help: dict[str, tuple[str, str]] = {}  # name -> (type, description)
+        self.values: dict[str, dict[Labels, float]] = defaultdict(dict)
+        self.histograms: dict[str, dict[Labels, list[float]]] = defaultdict(dict)
+
+    def collect(self) -> None:
+        for update in self.buffer.retrieve_updates():
+            metric = update.metric
+            labels: Labels = tuple(sorted((k, str(v)) for k, v in update.attributes.items()))
+            if metric.kind == BUFFERED_METRIC_KIND_HISTOGRAM:
+                self.help[metric.name] = ("histogram", metric.description or "")
+                # Bucket counts, then sum and count
+                state = self.histograms[metric.name].setdefault(labels, [0.0] * (len(HISTOGRAM_BUCKETS) + 2))
+                for i, bound in enumerate(HISTOGRAM_BUCKETS):
+                    if update.value <= bound:
+                        state[i] += 1
+                state[-2] += update.value
+                state[-1] += 1
+            elif metric.kind == BUFFERED_METRIC_KIND_COUNTER:
+                self.help[metric.name] = ("counter", metric.description or "")
+                self.values[metric.name][labels] = self.values[metric.name].get(labels, 0.0) + update.value
+            else:
+                self.help[metric.name] = ("gauge", metric.description or "")
+                self.values[metric.name][labels] = update.value
+
+    def render(self) -> str:
+        lines = []
+        for name in sorted(self.help):
+            kind, description = self.help[name]
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for labels, state in sorted(self.histograms[name].items()):
+                    for bound, count in zip(HISTOGRAM_BUCKETS, state):
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {count:g}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {state[-1]:g}")
+                    lines.append(f"{name}_sum{_labels(labels)} {state[-2]:g}")
+                    lines.append(f"{name}_count{_labels(labels)} {state[-1]:g}")
+            else:
+                for labels, value in sorted(self.values[name].items()):
+                    lines.append(f"{name}{_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        self.collect()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+        temporary.write_text(self.render())
+        os.replace(temporary, self.path)  # scrapers never see a half-written file
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.interval_seconds)
+                self.write()
+        finally:
+            self.write()
+
+
+def create_runtime(
+    prometheus_address: str | None = None,
+    metrics_file: str | None = None,
+) -> tuple[Runtime | None, MetricsFileWriter | None]:
+    """A runtime exporting metrics as configured, or (None, None) to use the default runtime."""
+    if prometheus_address:
+        telemetry = TelemetryConfig(metrics=PrometheusConfig(bind_address=prometheus_address))
+        return Runtime(telemetry=telemetry), None
+    if metrics_file:
+        buffer = MetricBuffer(50_000, duration_format=MetricBufferDurationFormat.SECONDS)
+        return Runtime(telemetry=TelemetryConfig(metrics=buffer)), MetricsFileWriter(buffer, metrics_file)
+    return None, None
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,170 @@
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from pydantic_core import to_jsonable_python
+from temporalio.client import Client
+from temporalio.common import WorkflowIDConflictPolicy
+
+from openai_agents.blob_store import is_blob_ref, read_blob
+from openai_agents.codec import data_converter
+from openai_agents.workflows.guitar_tab_workflow import InteractiveGuitarTabWorkflow
+from openai_agents.workflows.research_agents.research_models import TabRequestOptions
+from openai_agents.workflows.task_queues import WORKFLOW_TASK_QUEUE
+
+
+@dataclass
+class BatchItem:
+    query: str
+    name: str  # output file stem, also the workflow ID suffix
+
+    @property
+    def result_path(self) -> str:
+        return f"{self.name}.json"
+
+
+@dataclass
+class BatchOutcome:
+    item: BatchItem
+    status: str  # completed, failed
+    seconds: float
+    error: str | None = None
+
+
+def batch_item(query: str) -> BatchItem:
+    """Name a query by a slug plus a hash, so IDs are stable across runs and never collide."""
+    digest = hashlib.sha256(" ".join(query.casefold().split()).encode("utf-8")).hexdigest()[:12]
+    slug = re.sub(r"[^a-z0-9]+", "-", query.casefold()).strip("-")[:40] or "query"
+    return BatchItem(query=query, name=f"{slug}-{digest}")
+
+
+def read_queries(path: Path) -> list[BatchItem]:
+    """Read queries from JSONL ({"query": ...} per line) or CSV (a "query" column)."""
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="") as f:
+            queries = [row["query"] for row in csv.DictReader(f)]
+    else:
+        queries = [json.loads(line)["query"] for line in path.read_text().splitlines() if line.strip()]
+
+    items: dict[str, BatchItem] = {}
+    for query in queries:
+        if query.strip():
+            item = batch_item(query.strip())
+            items.setdefault(item.name, item)  # duplicate queries run once
+    return list(items.values())
+
+
+async def run_one(
+    client: Client,
+    item: BatchItem,
+    output_dir: Path,
+    id_prefix: str,
+    options: TabRequestOptions,
+    semaphore: asyncio.Semaphore,
+) -> BatchOutcome:
+    async with semaphore:
+        started = time.perf_counter()
+        workflow_id = f"{id_prefix}-{item.name}"
+        try:
+            # Reattach to a workflow still running from an interrupted batch instead of starting another
+            handle = await client.start_workflow(
+                InteractiveGuitarTabWorkflow.run,
+                args=[item.query, False, options],
+                id=workflow_id,
+                task_queue=WORKFLOW_TASK_QUEUE,
+                id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+            )
+            result = await handle.result()
+        except Exception as e:
+            outcome = BatchOutcome(item, "failed", time.perf_counter() - started, str(e))
+            print(f"❌ {item.query} ({outcome.seconds:.1f}s): {e}")
+            return outcome
+
+        seconds = time.perf_counter() - started
+        (output_dir / f"{item.name}.md").write_text(result.markdown_report)
+        if is_blob_ref(result.pdf_file_path):
+            (output_dir / f"{item.name}.pdf").write_bytes(read_blob(result.pdf_file_path))
+        # Written last: its presence marks the query as done for --resume
+        (output_dir / item.result_path).write_text(
+            json.dumps(
+                {
+                    "query": item.query,
+                    "workflow_id": workflow_id,
+                    "seconds": round(seconds, 3),
+                    **to_jsonable_python(result),
+                },
+                indent=2,
+            )
+        )
+        print(f"✅ {item.query} ({seconds:.1f}s) -> {output_dir / item.name}.md")
+        return BatchOutcome(item, "completed", seconds)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def print_summary(outcomes: list[BatchOutcome], skipped: int, elapsed: float) -> None:
+    completed = [o.seconds for o in outcomes if o.status == "completed"]
+    failed = [o for o in outcomes if o.status == "failed"]
+    print()
+    print(f"Completed {len(completed)}, failed {len(failed)}, skipped {skipped} in {elapsed:.1f}s")
+    if completed:
+        print(f"Throughput: {len(completed) / elapsed * 60:.1f} tabs/min")
+        print(
+            f"Latency: p50 {percentile(completed, 0.5):.1f}s, p95 {percentile(completed, 0.95):.1f}s, "
+            f"max {max(completed):.1f}s"
+        )
+    for outcome in failed:
+        print(f"  failed: {outcome.item.query}: {outcome.error}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Generate guitar tabs for a list of queries")
+    parser.add_argument("input", help="JSONL file with a \"query\" per line, or CSV with a query column")
+    parser.add_argument("--output-dir", default="batch_output", help="Directory for results")
+    parser.add_argument("--concurrency", type=int, default=4, help="Workflows running at once")
+    parser.add_argument("--id-prefix", default="guitar-tab-batch", help="Workflow ID prefix")
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Regenerate queries that already have a result in the output directory",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached reports and regenerate")
+    parser.add_argument(
+        "--pdf-mode",
+        choices=["direct", "agent"],
+        default="direct",
+        help="Render the PDF directly (default) or via the PDF generator agent",
+    )
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    items = read_queries(Path(args.input))
+    pending = [
+        item for item in items if args.no_resume or not (output_dir / item.result_path).exists()
+    ]
+    skipped = len(items) - len(pending)
+    print(f"🎸 {len(items)} queries, {skipped} already done, running {len(pending)} with concurrency {args.concurrency}")
+
+    options = TabRequestOptions(use_report_cache=not args.no_cache, pdf_mode=args.pdf_mode)
+    client = await Client.connect("localhost:7233", data_converter=data_converter)
+
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(run_one(client, item, output_dir, args.id_prefix, options, semaphore) for item in pending)
+    )
+    print_summary(list(outcomes), skipped, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,20 +1,41 @@
 import argparse
 import asyncio
+import uuid
 from pathlib import Path
 from typing import Dict, List
 
-from temporalio.client import Client
-from temporalio.contrib.pydantic import pydantic_data_converter
+from temporalio.client import Client, WorkflowHandle, WorkflowUpdateFailedError, WorkflowUpdateStage
 
+from openai_agents.blob_store import is_blob_ref, save_blob
+from openai_agents.codec import data_converter
 from openai_agents.workflows.guitar_tab_workflow import InteractiveGuitarTabWorkflow
 from openai_agents.workflows.research_agents.research_models import (
     ClarificationInput,
+    FollowUpInput,
+    FollowUpPolicy,
+    LatencyBudget,
+    SearchFanOutPolicy,
+    SessionPollInput,
+    SessionReport,
     SingleClarificationInput,
+    TabRequestOptions,
+    TabTransform,
+    UsageReport,
     UserQueryInput,
 )
+from openai_agents.workflows.tab_transforms import TUNINGS
+from openai_agents.workflows.task_queues import WORKFLOW_TASK_QUEUE
 
+TRANSFORM_COMMANDS = {"/transpose": "semitones", "/capo": "capo", "/tuning": "tuning"}
 
-async def run_interactive_guitar_tab(client: Client, query: str, workflow_id: str):
+
+async def run_interactive_guitar_tab(
+    client: Client,
+    query: str,
+    workflow_id: str,
+    options: TabRequestOptions | None = None,
+    batch_answers: bool = False,
+):
     print(f"🎸 Starting interactive guitar tab session: {query}")
 
     handle = None
@@ -31,65 +52,309 @@ async def run_interactive_guitar_tab(client: Client, query: str, workflow_id: st
         pass
 
     if start_new:
-        import time
-
-        unique_id = f"{workflow_id}-{int(time.time())}"
+        # Timestamps collide when two sessions start in the same second
+        unique_id = f"{workflow_id}-{uuid.uuid4().hex[:12]}"
         handle = await client.start_workflow(
             InteractiveGuitarTabWorkflow.run,
             args=[None, False],
             id=unique_id,
-            task_queue="openai-agents-task-queue",
+            task_queue=WORKFLOW_TASK_QUEUE,
         )
 
     if not handle:
         raise RuntimeError("Failed to get workflow handle")
 
+    streaming = options is not None and options.stream_report
+    start_update = None
     status = await handle.query(InteractiveGuitarTabWorkflow.get_status)
     if not status or status.status == "pending":
-        await handle.execute_update(InteractiveGuitarTabWorkflow.start_tab_session, UserQueryInput(query=query))
+        # Without clarifications the whole report is written inside this update,
+        # so follow progress with long polls instead of blocking on its result.
+        update = await handle.start_update(
+            InteractiveGuitarTabWorkflow.start_tab_session,
+            UserQueryInput(query=query, options=options),
+            wait_for_stage=WorkflowUpdateStage.ACCEPTED,
+        )
+        start_update = asyncio.create_task(update.result())
 
+    questions: list[str] = status.clarification_questions if status else []
+    question_index = status.current_question_index if status else 0
+    poll = SessionPollInput()
+    announced_research = False
+    streamed = False
     while True:
-        status = await handle.query(InteractiveGuitarTabWorkflow.get_status)
-        if status.status in ["awaiting_clarifications", "collecting_answers"]:
-            while status.get_current_question() is not None:
-                current = status.get_current_question()
-                print(current)
+        if start_update is not None and start_update.done():
+            start_update.result()  # surface a failed session start
+        delta = await handle.execute_update(InteractiveGuitarTabWorkflow.wait_for_changes, poll)
+        poll.since_version = delta.version
+        if delta.clarification_questions is not None:
+            questions = delta.clarification_questions
+        if delta.current_question_index is not None:
+            question_index = delta.current_question_index
+        if streaming and delta.report_attempt != poll.report_attempt:
+            if streamed:
+                print("\n\n[Writer restarted, streaming again]\n")
+            poll.report_attempt = delta.report_attempt
+        if streaming and delta.report_text:
+            print(delta.report_text, end="", flush=True)
+            streamed = True
+        poll.report_offset = delta.report_offset
+
+        if delta.status in ["awaiting_clarifications", "collecting_answers"]:
+            answers = {}
+            for i in range(question_index, len(questions)):
+                print(questions[i])
                 answer = input("Your answer: ").strip()
                 if answer.lower() in ["exit", "quit", "end", "done"]:
                     await handle.signal(InteractiveGuitarTabWorkflow.end_workflow_signal)
                     return
-                status = await handle.execute_update(
-                    InteractiveGuitarTabWorkflow.provide_single_clarification,
-                    SingleClarificationInput(question_index=status.current_question_index, answer=answer or "No preference"),
+                if batch_answers:
+                    answers[f"question_{i}"] = answer or "No preference"
+                else:
+                    await handle.execute_update(
+                        InteractiveGuitarTabWorkflow.provide_single_clarification,
+                        SingleClarificationInput(question_index=i, answer=answer or "No preference"),
+                    )
+            if answers:
+                await handle.execute_update(
+                    InteractiveGuitarTabWorkflow.provide_clarifications,
+                    ClarificationInput(responses=answers),
                 )
-        elif status.status == "researching":
+            question_index = len(questions)
+        elif delta.status == "researching" and not announced_research:
             print("Generating tablature... please wait")
+            announced_research = True
+        elif delta.status == "ended":
+            return
+        elif delta.status == "completed":
             break
-        elif status.status == "completed":
+        elif delta.status in ["awaiting_follow_up", "answering_follow_up", "continuing"]:
+            if streamed:
+                print()
+            await run_follow_ups(handle)
+            streamed = True  # every turn was already printed
             break
-        else:
-            await asyncio.sleep(1)
 
+    if streamed:
+        print()
     result = await handle.result()
     md_file = Path("guitar_tab.md")
     md_file.write_text(result.markdown_report)
     print(f"Markdown saved to: {md_file}")
-    if result.pdf_file_path:
+    print(f"Workflow ID: {handle.id}")
+    if is_blob_ref(result.pdf_file_path):
+        print(f"PDF saved to: {save_blob(result.pdf_file_path, 'pdf_output')}")
+    elif result.pdf_file_path:
         print(f"PDF saved to: {result.pdf_file_path}")
-    print(result.markdown_report)
+    if not streamed:
+        print(result.markdown_report)
+    if result.triage is not None:
+        source = "triage agent" if result.triage.path == "llm" else "rules"
+        print(f"\n🔀 Triage: {result.triage.path} by {source} ({result.triage.reason})")
+    if result.speculation is not None:
+        speculation = result.speculation
+        print(
+            f"🔮 Speculative search: {speculation.reused} of {speculation.speculative_searches} reused, "
+            f"{speculation.additional} more searches run"
+        )
+    if result.compaction is not None:
+        compaction = result.compaction
+        print(
+            f"🗜️  Search summaries: {compaction.input_summaries} compacted to {compaction.output_summaries}, "
+            f"~{compaction.tokens_saved} of {compaction.input_tokens} tokens saved"
+        )
+    if result.corpus is not None:
+        corpus = result.corpus
+        print(
+            f"📚 Corpus: {corpus.hits} of {corpus.lookups} lookups answered in {corpus.seconds * 1000:.0f}ms "
+            f"({corpus.documents} documents, worker hit rate {corpus.hit_rate:.0%})"
+        )
+    if result.usage is not None:
+        print_usage(result.usage)
+    for degradation in result.degradations:
+        print(f"⚡ {degradation.stage}: {degradation.detail} ({degradation.remaining_seconds:.0f}s left)")
     return result
 
 
+async def run_follow_ups(handle: WorkflowHandle) -> None:
+    """Ask follow-up questions about the tab until the user is done.
+
+    ``/transpose -2``, ``/capo 2`` and ``/tuning drop_d`` rewrite the latest
+    tab with the ``transform_tab`` update instead of a research run.
+    """
+    report = await handle.query(InteractiveGuitarTabWorkflow.get_session_report)
+    print(f"Commands: {', '.join(TRANSFORM_COMMANDS)} (tunings: {', '.join(TUNINGS)})")
+    while True:
+        if report is not None:
+            print_session_report(report)
+        question = input("Follow-up question (blank to finish): ").strip()
+        if not question or question.lower() in ["exit", "quit", "end", "done"]:
+            await handle.signal(InteractiveGuitarTabWorkflow.end_workflow_signal)
+            return
+        transform = None
+        if question.startswith("/"):
+            transform = parse_transform(question)
+            if transform is None:
+                report = None
+                continue
+        else:
+            print("Working on it... please wait")
+        for _ in range(3):
+            try:
+                if transform is not None:
+                    report = await handle.execute_update(InteractiveGuitarTabWorkflow.transform_tab, transform)
+                else:
+                    report = await handle.execute_update(
+                        InteractiveGuitarTabWorkflow.ask_follow_up, FollowUpInput(question=question)
+                    )
+                break
+            except WorkflowUpdateFailedError as e:
+                # Rejected while the session hands over to its next run; ask that run instead
+                status = await handle.query(InteractiveGuitarTabWorkflow.get_status)
+                if status.status not in ["continuing", "awaiting_follow_up"]:
+                    print(f"Session closed: {e.cause or e}")
+                    return
+                if transform is not None and status.status == "awaiting_follow_up":
+                    # The tab could not be transformed, e.g. an unrecognized tuning
+                    print(f"Could not transform the tab: {e.cause or e}")
+                    report = None
+                    break
+                await asyncio.sleep(1)
+
+
+def parse_transform(command: str) -> TabTransform | None:
+    """Parse a transform command such as ``/capo 2``; prints usage and returns None if invalid."""
+    name, _, value = command.partition(" ")
+    field = TRANSFORM_COMMANDS.get(name.lower())
+    value = value.strip()
+    if field == "tuning" and value in TUNINGS:
+        return TabTransform(tuning=value)
+    if field in ["semitones", "capo"] and value.lstrip("-").isdigit():
+        return TabTransform(**{field: int(value)})
+    print(f"Usage: /transpose <semitones>, /capo <fret> or /tuning <{'|'.join(TUNINGS)}>")
+    return None
+
+
+def print_session_report(report: SessionReport) -> None:
+    if report.question:
+        print(f"\n🎸 Turn {report.turn}: {report.question} ({report.new_searches} new searches)")
+    print(report.markdown_report)
+    for suggestion in report.follow_up_questions:
+        print(f"  ? {suggestion}")
+
+
+def print_usage(usage: UsageReport) -> None:
+    print(
+        f"\n⏱️  {usage.total_seconds:.1f}s, {usage.input_tokens} input ({usage.cached_input_tokens} cached) / "
+        f"{usage.output_tokens} output tokens"
+    )
+    for stage in usage.stages:
+        label = f" {stage.label!r}" if stage.label else ""
+        tokens = sum(agent.input_tokens + agent.output_tokens for agent in stage.agents)
+        print(f"   {stage.stage}{label}: {stage.seconds:.1f}s, {tokens} tokens")
+    for agent in usage.by_agent:
+        print(
+            f"   {agent.agent}: {agent.requests} calls, {agent.input_tokens} in "
+            f"({agent.cached_input_tokens} cached) / {agent.output_tokens} out"
+        )
+
+
 async def main():
     parser = argparse.ArgumentParser(description="OpenAI Interactive Guitar Tab Workflow")
     parser.add_argument("query", nargs="?", help="Guitar request")
     parser.add_argument("--workflow-id", default="guitar-tab-workflow", help="Workflow ID")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached reports and regenerate")
+    parser.add_argument(
+        "--cache-max-age",
+        type=int,
+        default=None,
+        help="Only reuse cached reports younger than this many seconds",
+    )
+    parser.add_argument(
+        "--pdf-mode",
+        choices=["direct", "agent"],
+        default="direct",
+        help="Render the PDF directly (default) or via the PDF generator agent",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the tablature as the writer generates it",
+    )
+    parser.add_argument("--max-searches", type=int, default=4, help="Maximum web searches in flight")
+    parser.add_argument(
+        "--search-quorum",
+        type=int,
+        default=None,
+        help="Write the report once this many searches succeed",
+    )
+    parser.add_argument(
+        "--search-deadline",
+        type=float,
+        default=120.0,
+        help="Cancel searches still running after this many seconds",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=None,
+        help="Duplicate searches slower than this percentile of completed ones (e.g. 0.9)",
+    )
+    parser.add_argument(
+        "--speculate",
+        action="store_true",
+        help="Plan and search the original query while clarification questions are answered",
+    )
+    parser.add_argument(
+        "--latency-budget",
+        type=float,
+        default=None,
+        help="Target seconds for the research; later stages fall back to faster paths to meet it",
+    )
+    parser.add_argument(
+        "--no-corpus",
+        action="store_true",
+        help="Do not answer searches from previously generated tabs and summaries",
+    )
+    parser.add_argument(
+        "--no-rule-triage",
+        action="store_true",
+        help="Always ask the triage agent, even when the request names every detail",
+    )
+    parser.add_argument(
+        "--follow-ups",
+        action="store_true",
+        help="Keep the session open for follow-up questions after the tab",
+    )
+    parser.add_argument(
+        "--batch-answers",
+        action="store_true",
+        help="Collect all clarification answers locally and submit them in one update",
+    )
     args = parser.parse_args()
 
-    client = await Client.connect("localhost:7233", data_converter=pydantic_data_converter)
+    options = TabRequestOptions(
+        use_report_cache=not args.no_cache,
+        report_cache_max_age_seconds=args.cache_max_age,
+        pdf_mode=args.pdf_mode,
+        stream_report=args.stream,
+        search_policy=SearchFanOutPolicy(
+            max_in_flight=args.max_searches,
+            quorum=args.search_quorum,
+            stage_deadline_seconds=args.search_deadline,
+            hedge_percentile=args.hedge_percentile,
+        ),
+        speculative_search=args.speculate,
+        use_corpus=not args.no_corpus,
+        latency_budget=LatencyBudget(seconds=args.latency_budget),
+        follow_ups=FollowUpPolicy(enabled=args.follow_ups),
+        rule_triage=not args.no_rule_triage,
+    )
+
+    client = await Client.connect("localhost:7233", data_converter=data_converter)
 
     query = args.query or input("Enter your guitar question: ").strip()
-    await run_interactive_guitar_tab(client, query, args.workflow_id)
+    await run_interactive_guitar_tab(client, query, args.workflow_id, options, args.batch_answers)
 
 
 if __name__ == "__main__":
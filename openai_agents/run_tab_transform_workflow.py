@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import uuid
+from pathlib import Path
+
+from temporalio.client import Client
+
+from openai_agents.codec import data_converter
+from openai_agents.workflows.research_agents.research_models import TabTransformInput
+from openai_agents.workflows.tab_transform_workflow import TabTransformWorkflow
+from openai_agents.workflows.tab_transforms import TUNINGS
+from openai_agents.workflows.task_queues import WORKFLOW_TASK_QUEUE
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Transpose, capo or retune a generated guitar tab")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--input", default="guitar_tab.md", help="Markdown report to transform")
+    source.add_argument(
+        "--from-workflow",
+        default=None,
+        help="Transform the result of a finished guitar tab workflow with this ID",
+    )
+    parser.add_argument("--output", default="guitar_tab_transformed.md", help="Where to write the result")
+    parser.add_argument("--transpose", type=int, default=0, help="Semitones to transpose by, e.g. -2")
+    parser.add_argument("--capo", type=int, default=0, help="Rewrite frets for a capo at this fret")
+    parser.add_argument("--current-capo", type=int, default=0, help="Capo the input tab already assumes")
+    parser.add_argument("--tuning", choices=sorted(TUNINGS), default=None, help="Retune to this tuning")
+    parser.add_argument("--min-fret", type=int, default=None, help="Re-voice notes below this fret")
+    parser.add_argument("--max-fret", type=int, default=None, help="Re-voice notes above this fret")
+    args = parser.parse_args()
+
+    client = await Client.connect("localhost:7233", data_converter=data_converter)
+
+    if args.from_workflow:
+        result = await client.get_workflow_handle(args.from_workflow).result()
+        markdown = result["markdown_report"] if isinstance(result, dict) else result.markdown_report
+    else:
+        markdown = Path(args.input).read_text()
+
+    result = await client.execute_workflow(
+        TabTransformWorkflow.run,
+        TabTransformInput(
+            markdown_report=markdown,
+            semitones=args.transpose,
+            capo=args.capo,
+            current_capo=args.current_capo,
+            tuning=args.tuning,
+            min_fret=args.min_fret,
+            max_fret=args.max_fret,
+        ),
+        id=f"tab-transform-{uuid.uuid4()}",
+        task_queue=WORKFLOW_TASK_QUEUE,
+    )
+
+    Path(args.output).write_text(result.markdown_report)
+    print(
+        f"🎸 Transformed {result.notes} notes "
+        f"({result.octave_shifts} octave shifts, {result.string_moves} string moves, "
+        f"{result.out_of_range} out of range)"
+    )
+    print(f"📄 Saved to {args.output}")
+    print(result.markdown_report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import argparse
 import asyncio
 import logging
+import multiprocessing
+import os
 import warnings
 from datetime import timedelta
+from pathlib import Path
+from typing import Any
 
 logging.getLogger("openai").setLevel(logging.ERROR)
 logging.getLogger("openai.agents").setLevel(logging.CRITICAL)
@@ -14,21 +19,139 @@ from temporalio.contrib.openai_agents import (
     ModelActivityParameters,
     set_open_ai_agent_temporal_overrides,
 )
-from temporalio.contrib.pydantic import pydantic_data_converter
 from temporalio.worker import Worker
 
+from openai_agents.blob_store import LocalBlobStore, default_blob_store
+from openai_agents.codec import data_converter
+from openai_agents.metrics import create_runtime
 from openai_agents.serializable_model_activity import SerializableModelActivity
+from openai_agents.workflows.disk_cache import DiskLRUCache
 from openai_agents.workflows.guitar_tab_workflow import (
     InteractiveGuitarTabWorkflow,
 )
-from openai_agents.workflows.pdf_generation_activity import generate_pdf
+from openai_agents.workflows.pdf_generation_activity import (
+    configure_pdf_render_pool,
+    generate_pdf,
+    shutdown_pdf_render_pool,
+)
+from openai_agents.workflows.report_cache_activity import ReportCacheActivities
+from openai_agents.workflows.report_stream_activity import (
+    ReportStreamActivities,
+    WorkflowSignalSink,
+)
+from openai_agents.workflows.search_cache_activity import SearchCacheActivities
+from openai_agents.workflows.tab_corpus import TabCorpus
+from openai_agents.workflows.tab_corpus_activity import TabCorpusActivities
+from openai_agents.workflows.tab_transform_workflow import TabTransformWorkflow
+from openai_agents.workflows.task_queues import (
+    WORKFLOW_TASK_QUEUE,
+    model_task_queue,
+    pdf_task_queue,
+)
+
+ROLES = ("workflow", "model", "pdf")
+
+BLOB_SWEEP_INTERVAL = timedelta(hours=1)
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str) -> int | None:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run guitar tab workers. Every option also reads the environment variable shown."
+    )
+    parser.add_argument(
+        "--roles",
+        default=os.environ.get("WORKER_ROLES", ",".join(ROLES)),
+        help="Comma-separated queues to poll: workflow, model, pdf (WORKER_ROLES, default all)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=_env_int("WORKER_PROCESSES") or 1,
+        help="Worker processes to start, each polling the selected roles (WORKER_PROCESSES)",
+    )
+    limits = parser.add_argument_group("per-queue limits (default: Temporal's)")
+    limits.add_argument(
+        "--workflow-tasks", type=int, default=_env_int("WORKFLOW_MAX_CONCURRENT_TASKS"),
+        help="Concurrent workflow tasks (WORKFLOW_MAX_CONCURRENT_TASKS)",
+    )
+    limits.add_argument(
+        "--workflow-pollers", type=int, default=_env_int("WORKFLOW_POLLERS"),
+        help="Workflow task pollers (WORKFLOW_POLLERS)",
+    )
+    limits.add_argument(
+        "--local-activities", type=int, default=_env_int("WORKFLOW_MAX_CONCURRENT_LOCAL_ACTIVITIES"),
+        help="Concurrent cache and corpus local activities (WORKFLOW_MAX_CONCURRENT_LOCAL_ACTIVITIES)",
+    )
+    limits.add_argument(
+        "--model-activities", type=int, default=_env_int("MODEL_MAX_CONCURRENT_ACTIVITIES"),
+        help="Concurrent model calls (MODEL_MAX_CONCURRENT_ACTIVITIES)",
+    )
+    limits.add_argument(
+        "--model-pollers", type=int, default=_env_int("MODEL_POLLERS"),
+        help="Model activity pollers (MODEL_POLLERS)",
+    )
+    limits.add_argument(
+        "--pdf-activities", type=int, default=_env_int("PDF_MAX_CONCURRENT_ACTIVITIES"),
+        help="Concurrent PDF renders (PDF_MAX_CONCURRENT_ACTIVITIES, default PDF_RENDER_PROCESSES)",
+    )
+    limits.add_argument(
+        "--pdf-pollers", type=int, default=_env_int("PDF_POLLERS"),
+        help="PDF activity pollers (PDF_POLLERS)",
+    )
+    args = parser.parse_args()
+    args.roles = [role.strip() for role in args.roles.split(",") if role.strip()]
+    unknown = sorted(set(args.roles) - set(ROLES))
+    if unknown or not args.roles:
+        parser.error(f"--roles must list some of {', '.join(ROLES)}, got {', '.join(unknown) or 'none'}")
+    return args
+
+
+def _limits(**settings: int | None) -> dict[str, Any]:
+    """Worker keyword arguments for the limits that were set."""
+    return {name: value for name, value in settings.items() if value is not None}
+
+
+def _process_address(address: str | None, index: int) -> str | None:
+    """Give each worker process its own metrics port: the configured one plus its index."""
+    if not address or index == 0:
+        return address
+    host, _, port = address.rpartition(":")
+    return f"{host}:{int(port) + index}"
+
+
+def _process_file(path: str | None, index: int) -> str | None:
+    """Give each worker process its own metrics file: worker.prom, worker-1.prom, ..."""
+    if not path or index == 0:
+        return path
+    file = Path(path)
+    return str(file.with_name(f"{file.stem}-{index}{file.suffix}"))
 
 
-async def main():
+async def sweep_blob_store(ttl: timedelta) -> None:
+    """Delete blobs not written for ``ttl`` from a local blob store, now and then every hour."""
+    store = default_blob_store()
+    if not isinstance(store, LocalBlobStore):
+        return
+    while True:
+        deleted = await asyncio.to_thread(store.sweep, ttl)
+        if deleted:
+            logger.info("Blob store sweep deleted %d blobs older than %s", deleted, ttl)
+        await asyncio.sleep(BLOB_SWEEP_INTERVAL.total_seconds())
+
+
+async def run_workers(args: argparse.Namespace, index: int = 0) -> None:
     logging.basicConfig(level=logging.INFO)
 
     with set_open_ai_agent_temporal_overrides(
         model_params=ModelActivityParameters(
+            task_queue=model_task_queue(WORKFLOW_TASK_QUEUE),
             start_to_close_timeout=timedelta(seconds=35),
             schedule_to_close_timeout=timedelta(seconds=300),
             retry_policy=RetryPolicy(
@@ -38,23 +161,143 @@ async def main():
             ),
         ),
     ):
+        # Runtime and pipeline metrics, e.g. PROMETHEUS_BIND_ADDRESS=127.0.0.1:9464
+        # or METRICS_FILE=metrics/worker.prom
+        runtime, metrics_file_writer = create_runtime(
+            _process_address(os.environ.get("PROMETHEUS_BIND_ADDRESS"), index),
+            _process_file(os.environ.get("METRICS_FILE"), index),
+        )
+
         # Create client connected to server at the given address
         client = await Client.connect(
             "localhost:7233",
-            data_converter=pydantic_data_converter,
+            data_converter=data_converter,
+            runtime=runtime,
         )
 
-        worker = Worker(
-            client,
-            task_queue="openai-agents-task-queue",
-            workflows=[InteractiveGuitarTabWorkflow],
-            activities=[
-                SerializableModelActivity().invoke_model_activity,
-                generate_pdf,
-            ],
+        workers = []
+        if "workflow" in args.roles:
+            search_cache = SearchCacheActivities(
+                DiskLRUCache(
+                    "cache/search_results.db",
+                    ttl=timedelta(days=7),
+                    max_entries=2000,
+                )
+            )
+            report_cache = ReportCacheActivities(
+                DiskLRUCache(
+                    "cache/reports.db",
+                    ttl=timedelta(days=30),
+                    max_entries=500,
+                )
+            )
+
+            # Full-text index of earlier tabs and search summaries, consulted before web search
+            corpus = TabCorpusActivities(TabCorpus("cache/tab_corpus.db", max_documents=20000))
+
+            # Cache and corpus activities run as local activities next to the workflows
+            workers.append(
+                Worker(
+                    client,
+                    task_queue=WORKFLOW_TASK_QUEUE,
+                    workflows=[InteractiveGuitarTabWorkflow, TabTransformWorkflow],
+                    activities=[
+                        search_cache.lookup_search_result,
+                        search_cache.store_search_result,
+                        report_cache.lookup_report,
+                        report_cache.store_report,
+                        corpus.lookup_corpus,
+                        corpus.index_tab_report,
+                    ],
+                    **_limits(
+                        max_concurrent_workflow_tasks=args.workflow_tasks,
+                        max_concurrent_workflow_task_polls=args.workflow_pollers,
+                        max_concurrent_local_activities=args.local_activities,
+                    ),
+                )
+            )
+
+        if "model" in args.roles:
+            report_stream = ReportStreamActivities(WorkflowSignalSink(client))
+            workers.append(
+                Worker(
+                    client,
+                    task_queue=model_task_queue(WORKFLOW_TASK_QUEUE),
+                    activities=[
+                        SerializableModelActivity().invoke_model_activity,
+                        report_stream.stream_report,
+                    ],
+                    **_limits(
+                        max_concurrent_activities=args.model_activities,
+                        max_concurrent_activity_task_polls=args.model_pollers,
+                    ),
+                )
+            )
+
+        if "pdf" in args.roles:
+            # Render PDFs in warm worker processes so WeasyPrint never blocks the event loop
+            pdf_render_processes = int(os.environ.get("PDF_RENDER_PROCESSES", "2"))
+            configure_pdf_render_pool(pdf_render_processes)
+            workers.append(
+                Worker(
+                    client,
+                    task_queue=pdf_task_queue(WORKFLOW_TASK_QUEUE),
+                    activities=[generate_pdf],
+                    # More concurrent renders than render processes would only queue in the pool
+                    max_concurrent_activities=args.pdf_activities or pdf_render_processes,
+                    **_limits(max_concurrent_activity_task_polls=args.pdf_pollers),
+                )
+            )
+
+        metrics_task = (
+            asyncio.create_task(metrics_file_writer.run()) if metrics_file_writer is not None else None
+        )
+        # Payload blobs must outlive namespace retention and the longest session (BLOB_STORE_TTL_DAYS, 0 to keep all)
+        blob_ttl_days = float(os.environ.get("BLOB_STORE_TTL_DAYS", "30"))
+        sweep_task = (
+            asyncio.create_task(sweep_blob_store(timedelta(days=blob_ttl_days)))
+            if blob_ttl_days > 0 and index == 0
+            else None
         )
-        await worker.run()
+        try:
+            await asyncio.gather(*(worker.run() for worker in workers))
+        finally:
+            if metrics_task is not None:
+                metrics_task.cancel()
+            if sweep_task is not None:
+                sweep_task.cancel()
+            if "pdf" in args.roles:
+                shutdown_pdf_render_pool()
+
+
+def _run_process(args: argparse.Namespace, index: int) -> None:
+    try:
+        asyncio.run(run_workers(args, index))
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> None:
+    args = parse_args()
+    if args.processes <= 1:
+        asyncio.run(run_workers(args))
+        return
+
+    # Spawned rather than forked: each process builds its own client and event loop
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_run_process, args=(args, index), name=f"worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -1,11 +1,67 @@
 """Serializable ModelActivity wrapper to fix MockValSer pydantic serialization issues."""
 
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional
+from pydantic import BaseModel, TypeAdapter
 from temporalio.contrib.openai_agents import ModelActivity as BaseModelActivity
 from temporalio.contrib.openai_agents._invoke_model_activity import ActivityModelInput
 from temporalio import activity
 
+Serializer = Callable[[Any], Any]
+
+# Types the pydantic data converter already handles as they are
+_PLAIN_TYPES = (dict, list, str, int, float, bool, type(None))
+
+# One serializer per concrete output item class, built on first use
+_SERIALIZERS: Dict[type, Serializer] = {}
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+def _copy_attributes(item: Any) -> Dict[str, Any]:
+    return dict(item.__dict__)
+
+
+def _build_serializer(item: Any) -> Serializer:
+    cls = type(item)
+    if issubclass(cls, _PLAIN_TYPES):
+        return _identity
+    if issubclass(cls, BaseModel):
+        try:
+            # A fully built adapter avoids the model's possibly incomplete MockValSer serializer
+            adapter = TypeAdapter(cls)
+        except Exception:
+            return lambda item: item.model_dump(mode="json", exclude_unset=True)
+        return lambda item: adapter.dump_python(item, mode="json", exclude_unset=True)
+    if hasattr(item, "__dict__"):
+        return _copy_attributes
+    return _identity
+
+
+def serialize_output_item(item: Any) -> Any:
+    """Convert a model output item to JSON-safe data, using a serializer cached per class."""
+    cls = type(item)
+    serializer = _SERIALIZERS.get(cls)
+    if serializer is None:
+        serializer = _SERIALIZERS[cls] = _build_serializer(item)
+    try:
+        return serializer(item)
+    except Exception as e:
+        # Fallback: create a simple dict representation
+        return {"error": f"Serialization failed: {str(e)}", "type": cls.__name__}
+
+
+def _details_dict(details: Any) -> Dict[str, Any]:
+    if not details:
+        return {}
+    if isinstance(details, dict):
+        return dict(details)
+    try:
+        return dict(details.__dict__)
+    except AttributeError:
+        return {}
+
 
 class SerializableUsage(BaseModel):
     """Pydantic model for Usage to ensure proper serialization."""
@@ -14,48 +70,17 @@ class SerializableUsage(BaseModel):
     output_tokens: int = 0
     input_tokens_details: Dict[str, Any] = {}
     output_tokens_details: Dict[str, Any] = {}
-    
+
     @classmethod
     def from_usage(cls, usage: Any) -> "SerializableUsage":
         """Convert Usage object to serializable format."""
-        requests = getattr(usage, 'requests', 0)
-        input_tokens = getattr(usage, 'input_tokens', 0)
-        output_tokens = getattr(usage, 'output_tokens', 0)
-        
-        # Handle input_tokens_details
-        input_tokens_details: Dict[str, Any] = {}
-        input_details = getattr(usage, 'input_tokens_details', None)
-        if input_details:
-            try:
-                if hasattr(input_details, '__dict__'):
-                    input_tokens_details = dict(input_details.__dict__)
-                elif hasattr(input_details, 'model_dump'):
-                    input_tokens_details = input_details.model_dump()
-                elif isinstance(input_details, dict):
-                    input_tokens_details = dict(input_details)
-            except Exception:
-                input_tokens_details = {}
-        
-        # Handle output_tokens_details  
-        output_tokens_details: Dict[str, Any] = {}
-        output_details = getattr(usage, 'output_tokens_details', None)
-        if output_details:
-            try:
-                if hasattr(output_details, '__dict__'):
-                    output_tokens_details = dict(output_details.__dict__)
-                elif hasattr(output_details, 'model_dump'):
-                    output_tokens_details = output_details.model_dump()
-                elif isinstance(output_details, dict):
-                    output_tokens_details = dict(output_details)
-            except Exception:
-                output_tokens_details = {}
-                
-        return cls(
-            requests=requests,
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            input_tokens_details=input_tokens_details,
-            output_tokens_details=output_tokens_details
+        # Fields are already plain ints and dicts, so skip validation
+        return cls.model_construct(
+            requests=getattr(usage, "requests", 0),
+            input_tokens=getattr(usage, "input_tokens", 0),
+            output_tokens=getattr(usage, "output_tokens", 0),
+            input_tokens_details=_details_dict(getattr(usage, "input_tokens_details", None)),
+            output_tokens_details=_details_dict(getattr(usage, "output_tokens_details", None)),
         )
 
 
@@ -68,38 +93,16 @@ class SerializableModelResponse(BaseModel):
     @classmethod
     def from_model_response(cls, response: Any) -> "SerializableModelResponse":
         """Convert a ModelResponse dataclass to a serializable Pydantic model."""
-        # Convert output items to dictionaries to avoid pydantic serialization issues
-        output_dicts = []
-        for item in response.output:
-            try:
-                if hasattr(item, 'model_dump'):
-                    # This is a Pydantic model, convert to dict safely
-                    # Use mode='json' to avoid MockValSer issues
-                    output_dicts.append(item.model_dump(mode='json', exclude_unset=True))
-                elif hasattr(item, '__dict__'):
-                    # Convert dataclass to dict
-                    output_dicts.append(dict(item.__dict__))
-                else:
-                    # Already a dict or primitive
-                    output_dicts.append(item)
-            except Exception as e:
-                # Fallback: create a simple dict representation
-                output_dicts.append({
-                    "error": f"Serialization failed: {str(e)}",
-                    "type": str(type(item).__name__)
-                })
-
-        # Convert usage to serializable format safely
         try:
             usage = SerializableUsage.from_usage(response.usage)
-        except Exception as e:
+        except Exception:
             # Fallback: create default usage if conversion fails
             usage = SerializableUsage()
 
-        return cls(
-            output=output_dicts,
+        return cls.model_construct(
+            output=[serialize_output_item(item) for item in response.output],
             usage=usage,
-            response_id=response.response_id
+            response_id=response.response_id,
         )
 
 
@@ -111,6 +114,17 @@ class SerializableModelActivity(BaseModelActivity):
         """Activity that invokes a model and returns a serializable response."""
         # Call the parent implementation to get the ModelResponse
         response = await super().invoke_model_activity(input)
-        
+
         # Convert to serializable format
-        return SerializableModelResponse.from_model_response(response)
\ No newline at end of file
+        serializable = SerializableModelResponse.from_model_response(response)
+
+        # Per-model token counters; the workflow attributes usage to agents and stages
+        model = input.get("model_name") or "default"
+        tokens = activity.metric_meter().create_counter(
+            "guitar_tab_model_activity_tokens", "Tokens used by model activity calls"
+        )
+        tokens.add(serializable.usage.input_tokens, {"model": model, "direction": "input"})
+        tokens.add(serializable.usage.output_tokens, {"model": model, "direction": "output"})
+        cached = serializable.usage.input_tokens_details.get("cached_tokens") or 0
+        tokens.add(cached, {"model": model, "direction": "cached_input"})
+        return serializable
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""SQLite-backed key/value cache with TTL expiry and LRU eviction.
+
+Used by worker-side activities only; workflows must reach it through an
+activity so that cache contents never influence replay. Every method blocks
+on SQLite, so async activities call it through ``asyncio.to_thread``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class DiskLRUCache:
+    """Persistent string cache stored in a single SQLite file.
+
+    Entries older than ``ttl`` are treated as missing and removed lazily.
+    When more than ``max_entries`` are stored, the least recently read
+    entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: timedelta = timedelta(days=7),
+        max_entries: int = 2000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, max_age: Optional[timedelta] = None) -> Optional[str]:
+        """Return the cached value, or None if missing or older than the TTL.
+
+        ``max_age`` tightens the configured TTL for a single lookup.
+        """
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > ttl.total_seconds():
+                if now - created_at > self.ttl.total_seconds():
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting least recently used entries if over capacity."""
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM entries WHERE created_at < ?", (now - self.ttl.total_seconds(),)
+        )
+        self._conn.execute(
+            """
+            DELETE FROM entries WHERE key IN (
+                SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
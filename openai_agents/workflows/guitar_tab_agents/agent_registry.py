@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+
+from temporalio import workflow
+
+with workflow.unsafe.imports_passed_through():
+    from agents import Agent
+    from openai_agents.workflows.guitar_tab_agents.clarifying_agent import new_clarifying_agent
+    from openai_agents.workflows.guitar_tab_agents.instruction_agent import new_instruction_agent
+    from openai_agents.workflows.guitar_tab_agents.planner_agent import new_planner_agent
+    from openai_agents.workflows.guitar_tab_agents.search_agent import new_search_agent
+    from openai_agents.workflows.guitar_tab_agents.triage_agent import new_triage_agent
+    from openai_agents.workflows.guitar_tab_agents.writer_agent import new_writer_agent
+    from openai_agents.workflows.research_agents.pdf_generator_agent import new_pdf_generator_agent
+
+
+@dataclass(frozen=True)
+class AgentRegistry:
+    """The guitar tab agent graph, shared by every workflow on a worker.
+
+    Agents are plain configuration (prompt, model, tools, handoffs), so one
+    graph can serve every workflow run and replay. Never mutate these agents;
+    use ``agent.clone(...)`` for per-request variations.
+    """
+
+    triage: Agent
+    clarifying: Agent
+    instruction: Agent
+    planner: Agent
+    search: Agent
+    writer: Agent
+    pdf_generator: Agent
+
+
+@functools.lru_cache(maxsize=1)
+def get_agent_registry() -> AgentRegistry:
+    """Build the agent graph once per worker process."""
+    planner = new_planner_agent()
+    instruction = new_instruction_agent(planner)
+    clarifying = new_clarifying_agent(instruction)
+    return AgentRegistry(
+        triage=new_triage_agent(clarifying, instruction),
+        clarifying=clarifying,
+        instruction=instruction,
+        planner=planner,
+        search=new_search_agent(),
+        writer=new_writer_agent(),
+        pdf_generator=new_pdf_generator_agent(),
+    )
@@ -20,8 +20,8 @@ include skill level, which part of the song to focus on, and tuning or
 style preferences."""
 
 
-def new_clarifying_agent() -> Agent:
-    instruction_agent = new_instruction_agent()
+def new_clarifying_agent(instruction_agent: Agent | None = None) -> Agent:
+    instruction_agent = instruction_agent or new_instruction_agent()
     return Agent(
         name="Guitar Clarifying Agent",
         model="gpt-4o-mini",
@@ -10,8 +10,8 @@ with workflow.unsafe.imports_passed_through():
 INSTRUCTION_PROMPT = """Combine the original guitar question with any clarification answers and produce a short paragraph describing exactly what tablature or lesson to generate."""
 
 
-def new_instruction_agent() -> Agent:
-    planner_agent = new_planner_agent()
+def new_instruction_agent(planner_agent: Agent | None = None) -> Agent:
+    planner_agent = planner_agent or new_planner_agent()
     return Agent(
         name="Guitar Instruction Agent",
         model="gpt-4o-mini",
@@ -17,9 +17,12 @@ Route to **INSTRUCTION AGENT** only when the request already specifies all the k
 Return exactly ONE function-call."""
 
 
-def new_triage_agent() -> Agent:
-    clarifying_agent = new_clarifying_agent()
-    instruction_agent = new_instruction_agent()
+def new_triage_agent(
+    clarifying_agent: Agent | None = None,
+    instruction_agent: Agent | None = None,
+) -> Agent:
+    instruction_agent = instruction_agent or new_instruction_agent()
+    clarifying_agent = clarifying_agent or new_clarifying_agent(instruction_agent)
 
     return Agent(
         name="Guitar Triage Agent",
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import math
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import Dict, List, Optional
 
 from temporalio import workflow
+from temporalio.common import RetryPolicy
 
 with workflow.unsafe.imports_passed_through():
     from agents import (
@@ -16,19 +19,61 @@ with workflow.unsafe.imports_passed_through():
         trace,
     )
 
+    from openai_agents.workflows.guitar_tab_agents.agent_registry import get_agent_registry
     from openai_agents.workflows.guitar_tab_agents.clarifying_agent import Clarifications
-    from openai_agents.workflows.research_agents.pdf_generator_agent import new_pdf_generator_agent
+    from openai_agents.workflows.pdf_generation_activity import (
+        PDFGenerationResult,
+        generate_pdf,
+    )
+    from openai_agents.workflows.prompts import planner_input, search_input, writer_input
     from openai_agents.workflows.guitar_tab_agents.planner_agent import (
         WebSearchItem,
         WebSearchPlan,
-        new_planner_agent,
     )
-    from openai_agents.workflows.guitar_tab_agents.search_agent import new_search_agent
-    from openai_agents.workflows.guitar_tab_agents.triage_agent import new_triage_agent
-    from openai_agents.workflows.guitar_tab_agents.writer_agent import (
-        ReportData,
-        new_writer_agent,
+    from openai_agents.workflows.guitar_tab_agents.writer_agent import ReportData
+    from openai_agents.workflows.report_cache_activity import (
+        ReportCacheActivities,
+        report_cache_key,
+    )
+    from openai_agents.workflows.report_stream_activity import ReportStreamActivities
+    from openai_agents.workflows.research_agents.pdf_generator_agent import pdf_generation_tool
+    from openai_agents.workflows.research_agents.research_models import (
+        AgentUsage,
+        CompactionStats,
+        CorpusStats,
+        Degradation,
+        SearchFanOutPolicy,
+        SearchTiming,
+        SessionSearch,
+        SessionState,
+        SpeculationStats,
+        StageUsage,
+        TabRequestOptions,
+        TriageStats,
+        UsageReport,
+    )
+    from openai_agents.workflows.search_compaction import compact_summaries
+    from openai_agents.workflows.search_cache_activity import (
+        SearchCacheActivities,
+        SearchCacheResult,
+        normalize_search_query,
+    )
+    from openai_agents.workflows.tab_corpus_activity import (
+        CorpusLookupResult,
+        TabCorpusActivities,
     )
+    from openai_agents.workflows.task_queues import model_task_queue, pdf_task_queue
+    from openai_agents.workflows.triage_rules import TriageDecision, classify_request
+
+# Speculative results are reused for planned searches whose words overlap at least this much
+SPECULATION_MATCH_THRESHOLD = 0.8
+
+CACHE_ACTIVITY_TIMEOUT = timedelta(seconds=5)
+CACHE_RETRY_POLICY = RetryPolicy(maximum_attempts=2)
+PDF_ACTIVITY_TIMEOUT = timedelta(seconds=30)
+STREAM_WRITER_TIMEOUT = timedelta(minutes=5)
+STREAM_WRITER_HEARTBEAT_TIMEOUT = timedelta(seconds=30)
+PDF_TITLE_MAX_LENGTH = 80
 
 
 @dataclass
@@ -42,50 +87,255 @@ class ClarificationResult:
 class InteractiveGuitarTabManager:
     def __init__(self) -> None:
         self.run_config = RunConfig()
-        self.search_agent = new_search_agent()
-        self.planner_agent = new_planner_agent()
-        self.writer_agent = new_writer_agent()
-        self.triage_agent = new_triage_agent()
-        self.pdf_generator_agent = new_pdf_generator_agent()
+        # Shared per worker process; building the graph per workflow dominated construction cost
+        agents = get_agent_registry()
+        self.search_agent = agents.search
+        self.planner_agent = agents.planner
+        self.writer_agent = agents.writer
+        self.triage_agent = agents.triage
+        self.pdf_generator_agent = agents.pdf_generator
+        self.options = TabRequestOptions()
+        self.search_timings: list[SearchTiming] = []
+        self._speculation: asyncio.Task[dict[str, str]] | None = None
+        self.speculation_stats: SpeculationStats | None = None
+        self.compaction_stats: CompactionStats | None = None
+        self.corpus_stats: CorpusStats | None = None
+        self.triage_stats: TriageStats | None = None
+        # Fresh web search summaries, indexed in the corpus once the report is written
+        self.web_summaries: dict[str, str] = {}
+        self.stage_usage: list[StageUsage] = []
+        self.degradations: list[Degradation] = []
+        # Planned searches the writer went without (failed, or cut off by the quorum or a deadline)
+        self.missing_searches = 0
+        self._budget_started: float | None = None
 
     async def _run_direct(self, query: str) -> ReportData:
+        self._budget_started = workflow.time()
         trace_id = gen_trace_id()
         with trace("Guitar tab trace", trace_id=trace_id):
-            search_plan = await self._plan_searches(query)
-            search_results = await self._perform_searches(search_plan)
-            report = await self._write_report(query, search_results)
+            report = await self._run_pipeline(query, report_cache_key(query))
         return report
 
     async def run_with_clarifications_start(self, query: str) -> ClarificationResult:
+        self._budget_started = workflow.time()
         trace_id = gen_trace_id()
         with trace("Clarification check", trace_id=trace_id):
-            input_items: list[TResponseInputItem] = [{"content": query, "role": "user"}]
-            result = await Runner.run(
-                self.triage_agent,
-                input_items,
-                run_config=self.run_config,
-            )
-            clarifications = self._extract_clarifications(result)
-            if clarifications and isinstance(clarifications, Clarifications):
-                return ClarificationResult(needs_clarifications=True, questions=clarifications.questions)
+            questions = await self._triage(query)
+            if questions:
+                if self.options.speculative_search:
+                    # Plan and search the bare query while the user answers
+                    self._speculation = asyncio.create_task(self._speculate(query))
+                return ClarificationResult(needs_clarifications=True, questions=questions)
             else:
-                search_plan = await self._plan_searches(query)
-                search_results = await self._perform_searches(search_plan)
-                report = await self._write_report(query, search_results)
+                report = await self._run_pipeline(query, report_cache_key(query))
                 return ClarificationResult(
                     needs_clarifications=False,
                     research_output=report.markdown_report,
                     report_data=report,
                 )
 
+    async def _triage(self, query: str) -> list[str]:
+        """Clarifying questions for the query, or none when it can be planned as is.
+
+        The keyword rules answer without a model call when they can read the
+        request; everything else goes to the triage agent.
+        """
+        started = workflow.time()
+        if self.options.rule_triage:
+            decision = classify_request(query)
+        else:
+            decision = TriageDecision(path="llm", reason="rule triage off")
+        if decision.path != "llm":
+            self._record_stage("triage", started, label="rules")
+            self._record_triage(decision)
+            return decision.questions
+
+        input_items: list[TResponseInputItem] = [{"content": query, "role": "user"}]
+        result = await Runner.run(
+            self.triage_agent,
+            input_items,
+            run_config=self.run_config,
+        )
+        self._record_stage("triage", started, result)
+        self._record_triage(decision)
+        clarifications = self._extract_clarifications(result)
+        if clarifications and isinstance(clarifications, Clarifications):
+            return clarifications.questions
+        return []
+
+    def _record_triage(self, decision: TriageDecision) -> None:
+        """Record which path triaged the request; the rules' share of decisions is the fast-path hit rate."""
+        self.triage_stats = TriageStats(
+            path=decision.path,
+            reason=decision.reason,
+            format=decision.format,
+            skill=decision.skill,
+            section=decision.section,
+            tuning=decision.tuning,
+        )
+        workflow.logger.info("Triage: %s (%s)", decision.path, decision.reason)
+        workflow.metric_meter().create_counter(
+            "guitar_tab_triage_decisions", "Requests triaged, by path: plan and clarify by rules, llm by the agent"
+        ).add(1, {"path": decision.path})
+
     async def run_with_clarifications_complete(self, original_query: str, questions: List[str], responses: Dict[str, str]) -> ReportData:
+        # Time spent answering questions does not count against the budget
+        self._budget_started = workflow.time()
         trace_id = gen_trace_id()
         with trace("Enhanced Guitar Tab", trace_id=trace_id):
             enriched = self._enrich_query(original_query, questions, responses)
-            search_plan = await self._plan_searches(enriched)
-            search_results = await self._perform_searches(search_plan)
-            report = await self._write_report(enriched, search_results)
-            return report
+            cache_key = report_cache_key(original_query, questions, responses)
+            return await self._run_pipeline(enriched, cache_key, corpus_query=original_query)
+
+    async def run_follow_up(self, session: SessionState, question: str) -> tuple[ReportData, list[SessionSearch]]:
+        """Answer a follow-up with the previous tab and the session's searches as context.
+
+        Planned searches that repeat one from an earlier turn reuse its summary.
+        Returns the new report and the searches run for this turn.
+        """
+        self._budget_started = workflow.time()
+        policy = session.options.follow_ups
+        query = f"{session.original_query}\nFollow-up question: {question}"
+        with trace("Guitar tab follow-up", trace_id=gen_trace_id()):
+            known = {normalize_search_query(search.query): search.summary for search in session.searches}
+            search_plan = await self._plan_searches(query)
+            reused = [
+                known[normalize_search_query(item.query)]
+                for item in search_plan.searches
+                if normalize_search_query(item.query) in known
+            ]
+            remaining = [
+                item for item in search_plan.searches if normalize_search_query(item.query) not in known
+            ]
+            workflow.logger.info(
+                "Follow-up reused %d of %d planned searches", len(reused), len(search_plan.searches)
+            )
+            quorum = self.options.search_policy.quorum or len(remaining)
+            found = await self._search_items(
+                list(enumerate(remaining)), quorum, self._search_budget_deadline()
+            )
+            searches = [
+                SessionSearch(query=remaining[index].query, summary=summary)
+                for index, summary in sorted(found.items())
+            ]
+            search_results = self._compact_search_results(reused + [search.summary for search in searches])
+            previous = session.report.markdown_report[: policy.max_context_report_chars]
+            report = await self._write_report(query, search_results, previous)
+        return report, searches
+
+    def session_searches(self) -> list[SessionSearch]:
+        """Web searches run so far, as context for follow-up turns."""
+        return [SessionSearch(query=query, summary=summary) for query, summary in self.web_summaries.items()]
+
+    async def _run_pipeline(self, query: str, cache_key: str, corpus_query: str | None = None) -> ReportData:
+        """Research and write a report for ``query``.
+
+        The corpus indexes and matches reports on ``corpus_query`` (default
+        ``query``), which should name only the song: clarification text is
+        shared by every enriched query and would match any earlier report.
+        """
+        corpus_query = corpus_query or query
+        cached = await self._lookup_cached_report(cache_key)
+        if cached is not None:
+            self.cancel_speculation()
+            return cached
+        search_results = await self._gather_search_results(query, corpus_query)
+        search_results = self._compact_search_results(search_results)
+        report = await self._write_report(query, search_results)
+        if self.degradations or self.missing_searches:
+            # A shortcut report must not be served later to requests with time to spare
+            workflow.logger.info(
+                "Not caching report: %d degradations, %d missing searches",
+                len(self.degradations),
+                self.missing_searches,
+            )
+        else:
+            await self._store_cached_report(cache_key, report)
+        await self._index_in_corpus(corpus_query, report)
+        return report
+
+    async def _gather_search_results(self, query: str, corpus_query: str) -> list[str]:
+        """Search summaries for the writer, from the local corpus first and the web for the rest."""
+        (previous_report,) = await self._lookup_corpus([corpus_query], kind="report")
+        if previous_report is not None:
+            # A confident match on an earlier report replaces planning and searching
+            self.cancel_speculation()
+            return [previous_report]
+        search_plan = await self._plan_searches(query)
+        known = await self._lookup_corpus([item.query for item in search_plan.searches])
+        remaining = WebSearchPlan(
+            searches=[item for item, text in zip(search_plan.searches, known) if text is None]
+        )
+        if len(remaining.searches) < len(search_plan.searches):
+            workflow.logger.info(
+                "Corpus answered %d of %d planned searches",
+                len(search_plan.searches) - len(remaining.searches),
+                len(search_plan.searches),
+            )
+        found = [text for text in known if text is not None]
+        return found + await self._perform_searches(remaining)
+
+    async def _lookup_corpus(self, queries: list[str], kind: str | None = None) -> list[str | None]:
+        if not self.options.use_corpus or not queries:
+            return [None] * len(queries)
+        try:
+            result: CorpusLookupResult = await workflow.execute_local_activity_method(
+                TabCorpusActivities.lookup_corpus,
+                args=[queries, self.options.corpus_min_confidence, kind],
+                start_to_close_timeout=CACHE_ACTIVITY_TIMEOUT,
+                retry_policy=CACHE_RETRY_POLICY,
+            )
+        except Exception:
+            return [None] * len(queries)
+        stats = result.stats
+        lookups = workflow.metric_meter().create_counter("guitar_tab_corpus_lookups", "Corpus lookups by result")
+        lookups.add(stats.hits, {"result": "hit"})
+        lookups.add(stats.lookups - stats.hits, {"result": "miss"})
+        if self.corpus_stats is not None:
+            stats = stats.model_copy(
+                update={
+                    "lookups": self.corpus_stats.lookups + stats.lookups,
+                    "hits": self.corpus_stats.hits + stats.hits,
+                    "seconds": self.corpus_stats.seconds + stats.seconds,
+                }
+            )
+        self.corpus_stats = stats
+        return [match.text if match is not None else None for match in result.matches]
+
+    async def _index_in_corpus(self, query: str, report: ReportData) -> None:
+        try:
+            await workflow.execute_local_activity_method(
+                TabCorpusActivities.index_tab_report,
+                args=[query, report, self.web_summaries],
+                start_to_close_timeout=CACHE_ACTIVITY_TIMEOUT,
+                retry_policy=CACHE_RETRY_POLICY,
+            )
+        except Exception:
+            pass
+
+    async def _lookup_cached_report(self, cache_key: str) -> ReportData | None:
+        if not self.options.use_report_cache:
+            return None
+        try:
+            return await workflow.execute_local_activity_method(
+                ReportCacheActivities.lookup_report,
+                args=[cache_key, self.options.report_cache_max_age_seconds],
+                start_to_close_timeout=CACHE_ACTIVITY_TIMEOUT,
+                retry_policy=CACHE_RETRY_POLICY,
+            )
+        except Exception:
+            return None
+
+    async def _store_cached_report(self, cache_key: str, report: ReportData) -> None:
+        try:
+            await workflow.execute_local_activity_method(
+                ReportCacheActivities.store_report,
+                args=[cache_key, report],
+                start_to_close_timeout=CACHE_ACTIVITY_TIMEOUT,
+                retry_policy=CACHE_RETRY_POLICY,
+            )
+        except Exception:
+            pass
 
     def _extract_clarifications(self, result) -> Optional[Clarifications]:
         try:
@@ -115,43 +365,484 @@ class InteractiveGuitarTabManager:
             enriched += f"- {question}: {answer}\n"
         return enriched
 
-    async def _plan_searches(self, query: str) -> WebSearchPlan:
-        result = await Runner.run(self.planner_agent, f"Query: {query}", run_config=self.run_config)
-        return result.final_output_as(WebSearchPlan)
+    async def _plan_searches(self, query: str, apply_budget: bool = True) -> WebSearchPlan:
+        """Plan web searches, taking the latency budget's shortcuts unless ``apply_budget`` is off."""
+        budget = self.options.latency_budget
+        planner = self.planner_agent
+        if apply_budget and self._budget_short_of(
+            budget.planner_seconds + budget.search_seconds + budget.writer_seconds + budget.pdf_seconds
+        ):
+            planner = planner.clone(model=budget.fallback_model)
+            self._degrade("planner", "fallback_model", f"planner on {budget.fallback_model}")
+        started = workflow.time()
+        result = await Runner.run(planner, planner_input(query), run_config=self.run_config)
+        self._record_stage("planner", started, result)
+        search_plan = result.final_output_as(WebSearchPlan)
+        if apply_budget and len(search_plan.searches) > budget.reduced_searches and self._budget_short_of(
+            budget.search_seconds + budget.writer_seconds + budget.pdf_seconds
+        ):
+            self._degrade(
+                "search",
+                "shorter_plan",
+                f"{budget.reduced_searches} of {len(search_plan.searches)} planned searches",
+            )
+            search_plan = WebSearchPlan(searches=search_plan.searches[: budget.reduced_searches])
+        return search_plan
 
     async def _perform_searches(self, search_plan: WebSearchPlan) -> list[str]:
         with custom_span("Search the web"):
-            tasks = [asyncio.create_task(self._search(item)) for item in search_plan.searches]
-            results = []
-            for task in workflow.as_completed(tasks):
-                result = await task
-                if result is not None:
-                    results.append(result)
-            return results
-
-    async def _search(self, item: WebSearchItem) -> str | None:
-        input_str = f"Search term: {item.query}\nReason for searching: {item.reason}"
+            results = await self._reuse_speculative_results(search_plan)
+            remaining = [
+                (index, item) for index, item in enumerate(search_plan.searches) if index not in results
+            ]
+            quorum = self.options.search_policy.quorum or len(search_plan.searches)
+            results.update(
+                await self._search_items(remaining, quorum - len(results), self._search_budget_deadline())
+            )
+            self.missing_searches += len(search_plan.searches) - len(results)
+            for timing in self.search_timings:
+                workflow.logger.info(
+                    "Search %r: %s in %.2fs%s",
+                    timing.query,
+                    timing.status,
+                    timing.seconds,
+                    " (hedge)" if timing.hedged else "",
+                )
+            # Keep the planner's order so identical inputs give identical results
+            return [results[index] for index in sorted(results)]
+
+    async def _search_items(
+        self,
+        items: list[tuple[int, WebSearchItem]],
+        quorum: int,
+        deadline_seconds: float | None = None,
+    ) -> dict[int, str]:
+        """Run searches under the fan-out policy, returning summaries by plan index.
+
+        ``deadline_seconds`` tightens the policy's stage deadline.
+        """
+        policy = self.options.search_policy
+        semaphore = asyncio.Semaphore(max(1, policy.max_in_flight))
+        tasks = [
+            asyncio.create_task(self._search_with_policy(index, item, semaphore, policy))
+            for index, item in items
+        ]
+        pending = set(tasks)
+        quorum = min(quorum, len(tasks))
+        stage_deadline = policy.stage_deadline_seconds
+        if deadline_seconds is not None and (stage_deadline is None or deadline_seconds < stage_deadline):
+            stage_deadline = deadline_seconds
+        deadline = workflow.time() + stage_deadline if stage_deadline is not None else None
+        results: dict[int, str] = {}
+        while pending and len(results) < quorum:
+            timeout = None if deadline is None else deadline - workflow.time()
+            if timeout is not None and timeout <= 0:
+                break
+            done, pending = await workflow.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                index, summary = task.result()
+                if summary is not None:
+                    results[index] = summary
+        # Cancel in plan order; set iteration order is not stable across replays
+        for task in tasks:
+            if task in pending:
+                task.cancel()
+        if pending:
+            workflow.logger.info(
+                "Search stage proceeding with %d/%d results, cancelled %d stragglers",
+                len(results),
+                len(items),
+                len(pending),
+            )
+        return results
+
+    async def _speculate(self, query: str) -> dict[str, str]:
+        """Plan and search the original query; returns summaries by normalized search query.
+
+        Runs while the user answers, off the budgeted path, and its plan is
+        never used as-is, so it takes no budget shortcuts and records no degradations.
+        """
+        search_plan = await self._plan_searches(query, apply_budget=False)
+        results = await self._search_items(
+            list(enumerate(search_plan.searches)), len(search_plan.searches)
+        )
+        return {
+            normalize_search_query(search_plan.searches[index].query): summary
+            for index, summary in results.items()
+        }
+
+    async def _reuse_speculative_results(self, search_plan: WebSearchPlan) -> dict[int, str]:
+        """Match planned searches against speculative ones run during clarification."""
+        if self._speculation is None:
+            return {}
         try:
-            result = await Runner.run(self.search_agent, input_str, run_config=self.run_config)
-            return str(result.final_output)
+            speculative = await self._speculation
+        except Exception as e:
+            workflow.logger.warning("Speculative search failed: %s", e)
+            speculative = {}
+        self._speculation = None
+
+        reused: dict[int, str] = {}
+        used: set[str] = set()
+        for index, item in enumerate(search_plan.searches):
+            planned = set(normalize_search_query(item.query).split())
+            best, best_score = None, 0.0
+            for key in sorted(speculative):
+                if key in used:
+                    continue
+                words = set(key.split())
+                score = len(planned & words) / len(planned | words) if planned | words else 0.0
+                if score > best_score:
+                    best, best_score = key, score
+            if best is not None and best_score >= SPECULATION_MATCH_THRESHOLD:
+                reused[index] = speculative[best]
+                used.add(best)
+
+        self.speculation_stats = SpeculationStats(
+            speculative_searches=len(speculative),
+            reused=len(reused),
+            wasted=len(speculative) - len(reused),
+            additional=len(search_plan.searches) - len(reused),
+        )
+        workflow.logger.info(
+            "Speculative search: reused %d, wasted %d, running %d additional searches",
+            self.speculation_stats.reused,
+            self.speculation_stats.wasted,
+            self.speculation_stats.additional,
+        )
+        searches = workflow.metric_meter().create_counter(
+            "guitar_tab_speculative_searches", "Speculative searches by outcome, and planned searches run after them"
+        )
+        searches.add(self.speculation_stats.reused, {"outcome": "reused"})
+        searches.add(self.speculation_stats.wasted, {"outcome": "wasted"})
+        searches.add(self.speculation_stats.additional, {"outcome": "additional"})
+        return reused
+
+    def cancel_speculation(self) -> None:
+        if self._speculation is not None:
+            self._speculation.cancel()
+            self._speculation = None
+
+    def _compact_search_results(self, search_results: list[str]) -> list[str]:
+        policy = self.options.compaction
+        if not policy.enabled:
+            return search_results
+        with custom_span("Compact search results"):
+            compacted = compact_summaries(
+                search_results,
+                similarity_threshold=policy.similarity_threshold,
+                token_budget=policy.token_budget,
+            )
+        self.compaction_stats = CompactionStats(
+            input_summaries=len(search_results),
+            output_summaries=len(compacted.summaries),
+            duplicates_removed=compacted.duplicates_removed,
+            input_tokens=compacted.input_tokens,
+            output_tokens=compacted.output_tokens,
+            tokens_saved=compacted.tokens_saved,
+        )
+        workflow.logger.info(
+            "Compacted %d search summaries to %d (%d near-duplicates), saving ~%d of %d input tokens",
+            len(search_results),
+            len(compacted.summaries),
+            compacted.duplicates_removed,
+            compacted.tokens_saved,
+            compacted.input_tokens,
+        )
+        tokens = workflow.metric_meter().create_counter(
+            "guitar_tab_compaction_tokens", "Estimated search summary tokens before compaction, and tokens saved"
+        )
+        tokens.add(compacted.input_tokens, {"kind": "input"})
+        tokens.add(compacted.tokens_saved, {"kind": "saved"})
+        return compacted.summaries
+
+    async def _search_with_policy(
+        self,
+        index: int,
+        item: WebSearchItem,
+        semaphore: asyncio.Semaphore,
+        policy: SearchFanOutPolicy,
+    ) -> tuple[int, str | None]:
+        async with semaphore:
+            attempts = [asyncio.create_task(self._search(item))]
+            try:
+                hedge_delay = self._hedge_delay(policy)
+                if hedge_delay is not None:
+                    done, _ = await workflow.wait(attempts, timeout=hedge_delay)
+                    if not done:
+                        workflow.logger.info("Hedging search %r after %.1fs", item.query, hedge_delay)
+                        attempts.append(asyncio.create_task(self._search(item, hedged=True)))
+                # First successful summary wins; a failed attempt waits for the other
+                pending = set(attempts)
+                while pending:
+                    _, pending = await workflow.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in attempts:
+                        if task.done() and task.result() is not None:
+                            return index, task.result()
+                return index, None
+            finally:
+                for task in attempts:
+                    if not task.done():
+                        task.cancel()
+
+    def _hedge_delay(self, policy: SearchFanOutPolicy) -> float | None:
+        """Latency at the policy's percentile of completed searches, or None if not hedging."""
+        if policy.hedge_percentile is None:
+            return None
+        samples = sorted(t.seconds for t in self.search_timings if t.status == "ok")
+        if len(samples) < policy.hedge_min_samples:
+            return None
+        rank = min(len(samples) - 1, max(0, math.ceil(policy.hedge_percentile * len(samples)) - 1))
+        return samples[rank]
+
+    async def _search(self, item: WebSearchItem, hedged: bool = False) -> str | None:
+        started = workflow.time()
+
+        def record(status: str) -> None:
+            self.search_timings.append(
+                SearchTiming(
+                    query=item.query,
+                    seconds=workflow.time() - started,
+                    status=status,
+                    hedged=hedged,
+                )
+            )
+
+        try:
+            cached = await self._lookup_cached_search(item.query)
+            if cached is not None:
+                record("cached")
+                self._record_stage("search", started, label=item.query)
+                return cached
+
+            input_str = search_input(item.query, item.reason)
+            try:
+                result = await Runner.run(self.search_agent, input_str, run_config=self.run_config)
+            except Exception as e:
+                workflow.logger.warning("Search %r failed: %s", item.query, e)
+                record("failed")
+                self._record_stage("search", started, label=item.query)
+                return None
+        except asyncio.CancelledError:
+            record("cancelled")
+            raise
+        summary = str(result.final_output)
+        record("ok")
+        self._record_stage("search", started, result, label=item.query)
+        self.web_summaries[item.query] = summary
+        await self._store_cached_search(item.query, summary)
+        return summary
+
+    async def _lookup_cached_search(self, query: str) -> str | None:
+        try:
+            cached: SearchCacheResult = await workflow.execute_local_activity_method(
+                SearchCacheActivities.lookup_search_result,
+                query,
+                start_to_close_timeout=CACHE_ACTIVITY_TIMEOUT,
+                retry_policy=CACHE_RETRY_POLICY,
+            )
         except Exception:
             return None
+        return cached.summary if cached.hit else None
+
+    async def _store_cached_search(self, query: str, summary: str) -> None:
+        try:
+            await workflow.execute_local_activity_method(
+                SearchCacheActivities.store_search_result,
+                args=[query, summary],
+                start_to_close_timeout=CACHE_ACTIVITY_TIMEOUT,
+                retry_policy=CACHE_RETRY_POLICY,
+            )
+        except Exception:
+            pass
 
-    async def _write_report(self, query: str, search_results: list[str]) -> ReportData:
-        input_str = f"Original query: {query}\nSummarized search results: {search_results}"
-        markdown_result = await Runner.run(self.writer_agent, input_str, run_config=self.run_config)
+    async def _write_report(
+        self, query: str, search_results: list[str], previous_tab: str | None = None
+    ) -> ReportData:
+        input_str = writer_input(query, search_results, previous_tab)
+        budget = self.options.latency_budget
+        fallback_model = None
+        if self._budget_short_of(budget.writer_seconds + budget.pdf_seconds):
+            fallback_model = budget.fallback_model
+            self._degrade("writer", "fallback_model", f"writer on {fallback_model}")
+        started = workflow.time()
+        if self.options.stream_report:
+            # The streaming activity calls the model itself, so only its wall time is known here
+            report = await workflow.execute_activity_method(
+                ReportStreamActivities.stream_report,
+                args=[input_str, fallback_model, self.options.stream_policy],
+                task_queue=model_task_queue(workflow.info().task_queue),
+                start_to_close_timeout=STREAM_WRITER_TIMEOUT,
+                heartbeat_timeout=STREAM_WRITER_HEARTBEAT_TIMEOUT,
+                retry_policy=RetryPolicy(maximum_attempts=3),
+            )
+            self._record_stage("writer", started)
+            return report
+        writer = self.writer_agent if fallback_model is None else self.writer_agent.clone(model=fallback_model)
+        markdown_result = await Runner.run(writer, input_str, run_config=self.run_config)
+        self._record_stage("writer", started, markdown_result)
         return markdown_result.final_output_as(ReportData)
 
     async def _generate_pdf_report(self, report_data: ReportData) -> str | None:
+        if self._budget_short_of(self.options.latency_budget.pdf_seconds):
+            self._degrade("pdf", "skip_pdf", "PDF not generated")
+            return None
+        started = workflow.time()
+        if self.options.pdf_mode == "agent":
+            pdf_path = await self._generate_pdf_with_agent(report_data)
+        else:
+            pdf_path = await self._generate_pdf_direct(report_data)
+        workflow.logger.info(
+            "PDF generation via %s path took %.2fs", self.options.pdf_mode, workflow.time() - started
+        )
+        return pdf_path
+
+    async def _generate_pdf_direct(self, report_data: ReportData) -> str | None:
+        started = workflow.time()
+        try:
+            result: PDFGenerationResult = await workflow.execute_activity(
+                generate_pdf,
+                args=[report_data.markdown_report, self._pdf_title(report_data.short_summary)],
+                task_queue=pdf_task_queue(workflow.info().task_queue),
+                start_to_close_timeout=PDF_ACTIVITY_TIMEOUT,
+            )
+        except Exception:
+            self._record_stage("pdf", started)
+            return None
+        # The label shows whether the warm render pool was used, and how long rendering itself took
+        label = f"{result.render_mode} render {result.render_seconds:.2f}s" if result.render_mode else None
+        self._record_stage("pdf", started, label=label)
+        return result.pdf_file_path if result.success else None
+
+    def _pdf_title(self, short_summary: str) -> str:
+        title = " ".join(short_summary.split()).split(". ")[0].rstrip(".")
+        if len(title) > PDF_TITLE_MAX_LENGTH:
+            title = title[: PDF_TITLE_MAX_LENGTH - 1].rsplit(" ", 1)[0] + "…"
+        return title or "Guitar Tab"
+
+    async def _generate_pdf_with_agent(self, report_data: ReportData) -> str | None:
+        started = workflow.time()
+        # Route the agent's tool call to the PDF queue, like the direct path
+        agent = self.pdf_generator_agent.clone(
+            tools=[pdf_generation_tool(pdf_task_queue(workflow.info().task_queue))]
+        )
         try:
             pdf_result = await Runner.run(
-                self.pdf_generator_agent,
+                agent,
                 f"Convert this markdown report to PDF:\n\n{report_data.markdown_report}",
                 run_config=self.run_config,
             )
+            self._record_stage("pdf", started, pdf_result)
             pdf_output = pdf_result.final_output_as(type(pdf_result.final_output))
             if pdf_output.success:
                 return pdf_output.pdf_file_path
         except Exception:
-            pass
+            self._record_stage("pdf", started)
         return None
+
+    def _remaining_budget(self) -> float | None:
+        budget = self.options.latency_budget.seconds
+        if budget is None or self._budget_started is None:
+            return None
+        return budget - (workflow.time() - self._budget_started)
+
+    def _budget_short_of(self, needed_seconds: float) -> bool:
+        """Whether the latency budget has less than ``needed_seconds`` left."""
+        remaining = self._remaining_budget()
+        return remaining is not None and remaining < needed_seconds
+
+    def _search_budget_deadline(self) -> float | None:
+        """Seconds the search stage may take while leaving time for the writer and PDF."""
+        remaining = self._remaining_budget()
+        if remaining is None:
+            return None
+        budget = self.options.latency_budget
+        reserve = budget.writer_seconds + budget.pdf_seconds
+        if remaining - reserve < budget.min_search_seconds:
+            # The writer will fall back to the faster model, so reserve its time instead
+            reserve = budget.fallback_writer_seconds + budget.pdf_seconds
+        deadline = max(budget.min_search_seconds, remaining - reserve)
+        policy_deadline = self.options.search_policy.stage_deadline_seconds
+        if policy_deadline is None:
+            # No configured deadline to shorten; the budget's is the only limit
+            return deadline
+        if deadline < policy_deadline:
+            self._degrade("search", "search_deadline", f"search stage limited to {deadline:.0f}s")
+            return deadline
+        return None
+
+    def _degrade(self, stage: str, action: str, detail: str) -> None:
+        remaining = self._remaining_budget() or 0.0
+        workflow.logger.info("Latency budget: %s (%.1fs left)", detail, remaining)
+        self.degradations.append(
+            Degradation(stage=stage, action=action, detail=detail, remaining_seconds=remaining)
+        )
+
+    def _record_stage(self, stage: str, started: float, result=None, label: str | None = None) -> None:
+        """Record a stage's wall time and its model usage, per agent, and emit them as metrics."""
+        usage = StageUsage(
+            stage=stage,
+            label=label,
+            seconds=workflow.time() - started,
+            agents=self._agent_usage(result) if result is not None else [],
+        )
+        self.stage_usage.append(usage)
+
+        # The workflow meter drops recordings made during replay, so nothing is counted twice
+        meter = workflow.metric_meter()
+        meter.create_histogram_float(
+            "guitar_tab_stage_duration", "Wall time of a guitar tab pipeline stage", "s"
+        ).record(usage.seconds, {"stage": stage})
+        tokens = meter.create_counter("guitar_tab_model_tokens", "Model tokens by stage and agent")
+        for agent in usage.agents:
+            attributes = {"stage": stage, "agent": agent.agent}
+            tokens.add(agent.input_tokens, {**attributes, "direction": "input"})
+            tokens.add(agent.output_tokens, {**attributes, "direction": "output"})
+            tokens.add(agent.cached_input_tokens, {**attributes, "direction": "cached_input"})
+
+    def _agent_usage(self, result) -> list[AgentUsage]:
+        """Usage of each model call in a run, attributed to the agent that made it."""
+        by_agent: dict[str, AgentUsage] = {}
+        for response in getattr(result, "raw_responses", []):
+            name = self._responding_agent(result, response)
+            usage = by_agent.setdefault(name, AgentUsage(agent=name))
+            usage.requests += response.usage.requests or 1
+            usage.input_tokens += response.usage.input_tokens
+            usage.output_tokens += response.usage.output_tokens
+            usage.cached_input_tokens += _cached_tokens(getattr(response.usage, "input_tokens_details", None))
+        return list(by_agent.values())
+
+    @staticmethod
+    def _responding_agent(result, response) -> str:
+        # Run items wrap the model's output items, so the first match names the agent
+        for item in result.new_items:
+            if any(item.raw_item is output for output in response.output):
+                return item.agent.name
+        return result.last_agent.name
+
+    def usage_report(self, total_seconds: float) -> UsageReport:
+        by_agent: dict[str, AgentUsage] = {}
+        for stage in self.stage_usage:
+            for usage in stage.agents:
+                total = by_agent.setdefault(usage.agent, AgentUsage(agent=usage.agent))
+                total.requests += usage.requests
+                total.input_tokens += usage.input_tokens
+                total.output_tokens += usage.output_tokens
+                total.cached_input_tokens += usage.cached_input_tokens
+        return UsageReport(
+            total_seconds=total_seconds,
+            stages=self.stage_usage,
+            by_agent=sorted(by_agent.values(), key=lambda u: -(u.input_tokens + u.output_tokens)),
+            input_tokens=sum(u.input_tokens for u in by_agent.values()),
+            output_tokens=sum(u.output_tokens for u in by_agent.values()),
+            cached_input_tokens=sum(u.cached_input_tokens for u in by_agent.values()),
+        )
+
+
+def _cached_tokens(details) -> int:
+    """Prompt tokens served from the provider's prefix cache."""
+    if isinstance(details, dict):  # as converted by SerializableUsage
+        return details.get("cached_tokens") or 0
+    return getattr(details, "cached_tokens", 0) or 0
@@ -1,15 +1,34 @@
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import Any
 
 from temporalio import workflow
+from temporalio.exceptions import ApplicationError
 
 from openai_agents.workflows.guitar_tab_manager import InteractiveGuitarTabManager
 from openai_agents.workflows.research_agents.research_models import (
     ClarificationInput,
+    CompactionStats,
+    CorpusStats,
+    Degradation,
+    FollowUpInput,
+    ReportChunk,
+    ReportProgress,
     ResearchInteractionDict,
+    SessionDelta,
+    SessionPollInput,
+    SessionReport,
+    SessionState,
     SingleClarificationInput,
+    SpeculationStats,
+    TabRequestOptions,
+    TabTransform,
+    TriageStats,
+    UsageReport,
     UserQueryInput,
 )
+from openai_agents.workflows.tab_transforms import TUNINGS, fret_range, transform_markdown
 
 
 @dataclass
@@ -18,6 +37,12 @@ class InteractiveGuitarTabResult:
     markdown_report: str
     follow_up_questions: list[str]
     pdf_file_path: str | None = None
+    usage: UsageReport | None = None  # wall time and tokens per stage and agent
+    degradations: list[Degradation] = field(default_factory=list)  # shortcuts taken for the latency budget
+    triage: TriageStats | None = None  # rules or triage agent; None for direct runs and follow-ups
+    speculation: SpeculationStats | None = None  # speculative searches reused after clarification
+    compaction: CompactionStats | None = None  # search summaries merged and trimmed before writing
+    corpus: CorpusStats | None = None  # searches answered from earlier tabs and summaries
 
 
 @workflow.defn
@@ -30,8 +55,25 @@ class InteractiveGuitarTabWorkflow:
         self.current_question_index: int = 0
         self.report_data: Any | None = None
         self.completed: bool = False
+        self.triaging: bool = False  # start_tab_session until the manager has triaged the query
         self.workflow_ended: bool = False
         self.initialized: bool = False
+        self.report_stream_attempt: int = 0
+        self.report_stream: list[str] = []
+        # Bumped on every state change; long-poll clients wait on it
+        self.state_version: int = 0
+        self.field_versions: dict[str, int] = {}
+        # Multi-turn sessions (options.follow_ups)
+        self.session: SessionState | None = None
+        self.accepting_follow_ups: bool = False
+        self.rendering_pdf: bool = False
+        self.continuing_as_new: bool = False
+        self.follow_up_lock = asyncio.Lock()
+
+    def _mark_changed(self, *fields: str) -> None:
+        self.state_version += 1
+        for field in fields:
+            self.field_versions[field] = self.state_version
 
     def _build_result(
         self,
@@ -40,18 +82,55 @@ class InteractiveGuitarTabWorkflow:
         questions: list[str] | None = None,
         pdf_path: str | None = None,
     ) -> InteractiveGuitarTabResult:
+        elapsed = workflow.now() - workflow.info().start_time
+        usage = self.manager.usage_report(elapsed.total_seconds())
+        for stage in usage.stages:
+            workflow.logger.info(
+                "Stage %s%s: %.2fs, %d input / %d output tokens",
+                stage.stage,
+                f" ({stage.label})" if stage.label else "",
+                stage.seconds,
+                sum(agent.input_tokens for agent in stage.agents),
+                sum(agent.output_tokens for agent in stage.agents),
+            )
         return InteractiveGuitarTabResult(
             short_summary=summary,
             markdown_report=report,
             follow_up_questions=questions or [],
             pdf_file_path=pdf_path,
+            usage=usage,
+            degradations=self.manager.degradations,
+            triage=self.manager.triage_stats,
+            speculation=self.manager.speculation_stats,
+            compaction=self.manager.compaction_stats,
+            corpus=self.manager.corpus_stats,
         )
 
     @workflow.run
-    async def run(self, initial_query: str | None = None, use_clarifications: bool = False) -> InteractiveGuitarTabResult:
+    async def run(
+        self,
+        initial_query: str | None = None,
+        use_clarifications: bool = False,
+        options: TabRequestOptions | None = None,
+        session: SessionState | None = None,
+    ) -> InteractiveGuitarTabResult:
+        if session is not None:
+            # A multi-turn session continued from its previous run
+            self.manager.options = session.options
+            self.original_query = session.original_query
+            self.session = session
+            self.initialized = True
+            return await self._serve_follow_ups()
+        if options is not None:
+            self.manager.options = options
         if initial_query and not use_clarifications:
+            self.original_query = initial_query
             report = await self.manager._run_direct(initial_query)
-            pdf = await self.manager._generate_pdf_report(report)
+            self.report_data = report
+            self.completed = True
+            pdf = await self._render_pdf(report)
+            if self.manager.options.follow_ups.enabled:
+                return await self._start_session(report, pdf)
             return self._build_result(report.short_summary, report.markdown_report, report.follow_up_questions, pdf)
 
         while True:
@@ -60,10 +139,13 @@ class InteractiveGuitarTabWorkflow:
             )
 
             if self.workflow_ended:
+                self.manager.cancel_speculation()
                 return self._build_result("Session ended", "Workflow ended by user")
 
             if self.completed and self.report_data:
-                pdf = await self.manager._generate_pdf_report(self.report_data)
+                pdf = await self._render_pdf(self.report_data)
+                if self.manager.options.follow_ups.enabled:
+                    return await self._start_session(self.report_data, pdf)
                 return self._build_result(
                     self.report_data.short_summary,
                     self.report_data.markdown_report,
@@ -78,6 +160,7 @@ class InteractiveGuitarTabWorkflow:
                     )
 
                     if self.workflow_ended:
+                        self.manager.cancel_speculation()
                         return self._build_result("Session ended", "Workflow ended by user")
 
                     if self.original_query:
@@ -87,13 +170,102 @@ class InteractiveGuitarTabWorkflow:
                             self.clarification_responses,
                         )
 
-                    self.completed = True
+                    self._research_done()
                     continue
                 elif self.report_data is not None:
-                    self.completed = True
+                    self._research_done()
                     continue
                 return self._build_result("No result", "Workflow failed to start")
 
+    def _research_done(self) -> None:
+        # The PDF renders on the next pass of the loop; until then polls must not see a finished session
+        self.completed = True
+        self.rendering_pdf = True
+
+    async def _render_pdf(self, report: Any) -> str | None:
+        """Render the PDF, reported as its own status so polls do not take the session as finished."""
+        self.rendering_pdf = True
+        self._mark_changed("status")
+        try:
+            return await self.manager._generate_pdf_report(report)
+        finally:
+            self.rendering_pdf = False
+            self._mark_changed("status")
+
+    async def _start_session(self, report: Any, pdf_path: str | None) -> InteractiveGuitarTabResult:
+        policy = self.manager.options.follow_ups
+        self.session = SessionState(
+            original_query=self.original_query or "",
+            options=self.manager.options,
+            report=SessionReport(
+                short_summary=report.short_summary,
+                markdown_report=report.markdown_report,
+                follow_up_questions=report.follow_up_questions,
+                pdf_file_path=pdf_path,
+            ),
+            searches=self.manager.session_searches()[-policy.max_context_searches :],
+        )
+        return await self._serve_follow_ups()
+
+    async def _serve_follow_ups(self) -> InteractiveGuitarTabResult:
+        """Answer follow-up updates until the session ends or idles out.
+
+        Once history passes the policy's limits, the session continues as new
+        carrying only ``self.session``, so replay cost stays bounded however
+        many turns it runs.
+        """
+        assert self.session is not None
+        policy = self.session.options.follow_ups
+        self.accepting_follow_ups = True
+        self._mark_changed("status")
+        while not self.workflow_ended:
+            version = self.state_version
+            try:
+                await workflow.wait_condition(
+                    lambda: self.workflow_ended
+                    or self.state_version != version
+                    or self._should_continue_as_new(),
+                    timeout=timedelta(seconds=policy.idle_timeout_seconds),
+                )
+            except asyncio.TimeoutError:
+                if self.follow_up_lock.locked():
+                    continue
+                workflow.logger.info("Follow-up session idle, ending")
+                break
+            if not self.workflow_ended and self._should_continue_as_new():
+                self.accepting_follow_ups = False
+                self.continuing_as_new = True
+                self._mark_changed("status")
+                await workflow.wait_condition(workflow.all_handlers_finished)
+                info = workflow.info()
+                workflow.logger.info(
+                    "Continuing session as new after %d events, %d bytes of history",
+                    info.get_current_history_length(),
+                    info.get_current_history_size(),
+                )
+                workflow.continue_as_new(
+                    args=[None, False, None, self.session.model_copy(update={"runs": self.session.runs + 1})]
+                )
+
+        self.accepting_follow_ups = False
+        self._mark_changed("status")
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        report = self.session.report
+        return self._build_result(
+            report.short_summary, report.markdown_report, report.follow_up_questions, report.pdf_file_path
+        )
+
+    def _should_continue_as_new(self) -> bool:
+        if self.session is None or self.follow_up_lock.locked():
+            return False
+        policy = self.session.options.follow_ups
+        info = workflow.info()
+        return (
+            info.is_continue_as_new_suggested()
+            or info.get_current_history_length() >= policy.max_history_events
+            or info.get_current_history_size() >= policy.max_history_bytes
+        )
+
     def _get_current_question(self) -> str | None:
         if self.current_question_index >= len(self.clarification_questions):
             return None
@@ -102,35 +274,173 @@ class InteractiveGuitarTabWorkflow:
     def _has_more_questions(self) -> bool:
         return self.current_question_index < len(self.clarification_questions)
 
-    @workflow.query
-    def get_status(self) -> ResearchInteractionDict:
-        current_question = self._get_current_question()
-
+    def _status(self) -> str:
         if self.workflow_ended:
-            status = "ended"
+            return "ended"
+        elif self.continuing_as_new:
+            return "continuing"
+        elif self.accepting_follow_ups:
+            return "answering_follow_up" if self.follow_up_lock.locked() else "awaiting_follow_up"
+        elif self.rendering_pdf:
+            return "rendering"
         elif self.completed:
-            status = "completed"
+            return "completed"
+        elif self.triaging and self.manager.triage_stats is None:
+            return "triaging"
         elif self.clarification_questions and len(self.clarification_responses) < len(self.clarification_questions):
-            status = "awaiting_clarifications" if len(self.clarification_responses) == 0 else "collecting_answers"
+            return "awaiting_clarifications" if len(self.clarification_responses) == 0 else "collecting_answers"
         elif self.original_query and not self.completed:
-            status = "researching"
+            return "researching"
         else:
-            status = "pending"
+            return "pending"
 
+    @workflow.query
+    def get_status(self) -> ResearchInteractionDict:
         return ResearchInteractionDict(
             original_query=self.original_query,
             clarification_questions=self.clarification_questions,
             clarification_responses=self.clarification_responses,
             current_question_index=self.current_question_index,
-            current_question=current_question,
-            status=status,
+            current_question=self._get_current_question(),
+            status=self._status(),
             research_completed=self.completed,
         )
 
+    @workflow.update
+    async def wait_for_changes(self, input: SessionPollInput) -> SessionDelta:
+        """Long poll: block until the state moves past ``since_version``, then return what changed."""
+        status = self._status()
+        try:
+            # Finished sessions answer immediately so no poll is left waiting when the run returns.
+            # Status changes made inside the manager (e.g. triage finishing) bump no version.
+            await workflow.wait_condition(
+                lambda: self.state_version > input.since_version
+                or self._status() != status
+                or (self.completed and not self.accepting_follow_ups and not self.rendering_pdf)
+                or self.workflow_ended
+                or self.continuing_as_new,
+                timeout=timedelta(seconds=input.timeout_seconds),
+            )
+        except asyncio.TimeoutError:
+            pass
+
+        def changed(field: str) -> bool:
+            return self.field_versions.get(field, 0) > input.since_version
+
+        report_text = "".join(self.report_stream)
+        report_offset = input.report_offset if input.report_attempt == self.report_stream_attempt else 0
+        return SessionDelta(
+            version=self.state_version,
+            status=self._status(),
+            clarification_questions=self.clarification_questions if changed("questions") else None,
+            current_question_index=self.current_question_index if changed("answers") else None,
+            report_attempt=self.report_stream_attempt,
+            report_text=report_text[report_offset:],
+            report_offset=len(report_text),
+            research_completed=self.completed,
+        )
+
+    @workflow.query
+    def get_report_progress(self, offset: int = 0) -> ReportProgress:
+        text = "".join(self.report_stream)
+        return ReportProgress(
+            attempt=self.report_stream_attempt,
+            text=text[offset:],
+            offset=len(text),
+            done=self.report_data is not None,
+        )
+
+    @workflow.query
+    def get_session_report(self) -> SessionReport | None:
+        """The latest tab of a multi-turn session, or None before the first one."""
+        return self.session.report if self.session is not None else None
+
+    @workflow.update
+    async def ask_follow_up(self, input: FollowUpInput) -> SessionReport:
+        async with self.follow_up_lock:
+            assert self.session is not None
+            # Each turn's writer streams from the start again
+            self.report_stream_attempt = 0
+            self.report_stream = []
+            self._mark_changed("status", "report")
+            report, searches = await self.manager.run_follow_up(self.session, input.question)
+            policy = self.session.options.follow_ups
+            turn = SessionReport(
+                turn=self.session.report.turn + 1,
+                question=input.question,
+                short_summary=report.short_summary,
+                markdown_report=report.markdown_report,
+                follow_up_questions=report.follow_up_questions,
+                new_searches=len(searches),
+            )
+            self.session = self.session.model_copy(
+                update={
+                    "report": turn,
+                    "searches": (self.session.searches + searches)[-policy.max_context_searches :],
+                }
+            )
+            self._mark_changed("status")
+            return turn
+
+    @ask_follow_up.validator
+    def validate_follow_up(self, input: FollowUpInput) -> None:
+        if not self.accepting_follow_ups or self.workflow_ended:
+            raise ValueError("This session is not accepting follow-up questions")
+        if not input.question.strip():
+            raise ValueError("Follow-up question is empty")
+
+    @workflow.update
+    async def transform_tab(self, input: TabTransform) -> SessionReport:
+        """Transpose, capo or retune the session's latest tab as a new turn, without any model call."""
+        async with self.follow_up_lock:
+            assert self.session is not None
+            try:
+                markdown, stats = transform_markdown(
+                    self.session.report.markdown_report,
+                    semitones=input.semitones,
+                    capo=input.capo,
+                    current_capo=input.current_capo,
+                    tuning=input.tuning,
+                    fret_range=fret_range(input.min_fret, input.max_fret),
+                )
+            except ValueError as e:
+                raise ApplicationError(str(e), non_retryable=True) from e
+            workflow.logger.info(
+                f"Transformed {stats.notes} notes: {stats.octave_shifts} octave shifts, "
+                f"{stats.string_moves} string moves, {stats.out_of_range} out of range"
+            )
+            changes = ", ".join(f"{name}={value}" for name, value in input.model_dump(exclude_defaults=True).items())
+            turn = self.session.report.model_copy(
+                update={
+                    "turn": self.session.report.turn + 1,
+                    "question": f"Transform: {changes or 'none'}",
+                    "markdown_report": markdown,
+                    "pdf_file_path": None,
+                    "new_searches": 0,
+                }
+            )
+            self.session = self.session.model_copy(update={"report": turn})
+            self._mark_changed("status")
+            return turn
+
+    @transform_tab.validator
+    def validate_transform_tab(self, input: TabTransform) -> None:
+        if not self.accepting_follow_ups or self.workflow_ended:
+            raise ValueError("This session is not accepting follow-up questions")
+        if input.tuning is not None and input.tuning not in TUNINGS:
+            raise ValueError(f"Unknown tuning {input.tuning!r}; expected one of {', '.join(TUNINGS)}")
+
     @workflow.update
     async def start_tab_session(self, input: UserQueryInput) -> ResearchInteractionDict:
         self.original_query = input.query
-        result = await self.manager.run_with_clarifications_start(self.original_query)
+        if input.options is not None:
+            self.manager.options = input.options
+        self.triaging = True
+        self._mark_changed("status")
+        try:
+            result = await self.manager.run_with_clarifications_start(self.original_query)
+        finally:
+            self.triaging = False
 
         if result.needs_clarifications:
             self.clarification_questions = result.questions or []
@@ -138,6 +448,7 @@ class InteractiveGuitarTabWorkflow:
             if result.report_data is not None:
                 self.report_data = result.report_data
         self.initialized = True
+        self._mark_changed("status", "questions")
         return self.get_status()
 
     @workflow.update
@@ -145,14 +456,27 @@ class InteractiveGuitarTabWorkflow:
         question_key = f"question_{self.current_question_index}"
         self.clarification_responses[question_key] = input.answer
         self.current_question_index += 1
+        self._mark_changed("status", "answers")
         return self.get_status()
 
     @workflow.update
     async def provide_clarifications(self, input: ClarificationInput) -> ResearchInteractionDict:
-        self.clarification_responses = input.responses
+        self.clarification_responses.update(input.responses)
         self.current_question_index = len(self.clarification_questions)
+        self._mark_changed("status", "answers")
         return self.get_status()
 
     @workflow.signal
     async def end_workflow_signal(self) -> None:
         self.workflow_ended = True
+        self._mark_changed("status")
+
+    @workflow.signal
+    def append_report_chunk(self, chunk: ReportChunk) -> None:
+        if chunk.attempt > self.report_stream_attempt:
+            # The writer activity was retried and restarted its stream
+            self.report_stream_attempt = chunk.attempt
+            self.report_stream = []
+        if chunk.attempt == self.report_stream_attempt and chunk.sequence == len(self.report_stream):
+            self.report_stream.append(chunk.text)
+            self._mark_changed("report")
@@ -1,11 +1,24 @@
+import asyncio
+import datetime
+import functools
+import html
+import multiprocessing
 import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
 import markdown
 from pydantic import BaseModel
 from temporalio import activity
 
+from openai_agents.blob_store import blob_ref, default_blob_store
+
 # Set library path for WeasyPrint if not already set
 if not os.environ.get("DYLD_FALLBACK_LIBRARY_PATH"):
     os.environ["DYLD_FALLBACK_LIBRARY_PATH"] = "/opt/homebrew/lib"
@@ -19,6 +32,10 @@ except (ImportError, OSError) as e:
     WEASYPRINT_AVAILABLE = False
     print(f"WeasyPrint not available: {e}")
 
+# Process pool used by generate_pdf; see configure_pdf_render_pool
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_size = 0
+
 
 class StylingOptions(BaseModel):
     """Styling options for PDF generation"""
@@ -29,9 +46,11 @@ class StylingOptions(BaseModel):
 
 @dataclass
 class PDFGenerationResult:
-    pdf_file_path: str
+    pdf_file_path: str  # blob reference (blob:pdfs/...), see openai_agents.blob_store
     success: bool
     error_message: Optional[str] = None
+    render_mode: str = ""  # pool (warm render processes) or thread
+    render_seconds: float = 0.0  # WeasyPrint render time, without storing the PDF
 
 
 @activity.defn
@@ -43,13 +62,17 @@ async def generate_pdf(
     """
     Generate PDF from markdown content with specified styling.
 
+    Rendering runs in the PDF render process pool when one is configured
+    (see ``configure_pdf_render_pool``), otherwise in a worker thread, so the
+    activity never blocks the worker's event loop.
+
     Args:
         markdown_content: The markdown content to convert to PDF
         title: Title for the PDF document
         styling_options: Optional styling configurations
 
     Returns:
-        PDFGenerationResult with pdf_bytes and success status
+        PDFGenerationResult with the PDF's blob reference and success status
     """
     if not WEASYPRINT_AVAILABLE or weasyprint is None:
         return PDFGenerationResult(
@@ -59,59 +82,170 @@ async def generate_pdf(
         )
 
     try:
-        # Convert markdown to HTML
-        html_content = markdown.markdown(
-            markdown_content, extensions=["tables", "fenced_code", "toc"]
+        # Create a unique filename; concurrent renders can share a timestamp
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"research_report_{timestamp}_{uuid.uuid4().hex[:8]}.pdf"
+
+        with tempfile.TemporaryDirectory(prefix="pdf_render_") as render_dir:
+            pdf_path = Path(render_dir) / filename
+            render_args = (markdown_content, title, styling_options, str(pdf_path))
+            render_mode = "pool" if _render_pool is not None else "thread"
+            started = time.perf_counter()
+            if _render_pool is not None:
+                loop = asyncio.get_running_loop()
+                try:
+                    await loop.run_in_executor(_render_pool, _render_pdf_file, *render_args)
+                except BrokenProcessPool:
+                    # A render process died (e.g. out of memory); replace the pool
+                    # so later renders are not affected, and report this failure.
+                    _replace_broken_render_pool()
+                    raise
+            else:
+                await asyncio.to_thread(_render_pdf_file, *render_args)
+            render_seconds = time.perf_counter() - started
+            activity.metric_meter().create_histogram_float(
+                "guitar_tab_pdf_render_duration", "WeasyPrint render time by render mode", "s"
+            ).record(render_seconds, {"mode": render_mode})
+
+            # Store the PDF where any client can fetch it, not on this worker's disk
+            key = f"pdfs/{filename}"
+            await asyncio.to_thread(default_blob_store().put, key, pdf_path.read_bytes())
+
+        return PDFGenerationResult(
+            pdf_file_path=blob_ref(key),
+            success=True,
+            render_mode=render_mode,
+            render_seconds=render_seconds,
         )
 
-        # Create complete HTML document with styling
-        full_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{title}</title>
-            <style>
-                {_get_default_css()}
-                {_get_custom_css(styling_options)}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1 class="document-title">{title}</h1>
-                <div class="content">
-                    {html_content}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+    except Exception as e:
+        return PDFGenerationResult(
+            pdf_file_path="", success=False, error_message=str(e)
+        )
 
-        # Generate PDF and save to file
-        import datetime
-        import os
-        from pathlib import Path
 
-        # Create pdf_output directory if it doesn't exist
-        pdf_output_dir = Path("pdf_output")
-        pdf_output_dir.mkdir(exist_ok=True)
+def configure_pdf_render_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Start a bounded pool of warm processes used by ``generate_pdf``.
 
-        # Create a unique filename with timestamp
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"research_report_{timestamp}.pdf"
-        pdf_path = pdf_output_dir / filename
+    WeasyPrint rendering is CPU-bound and holds the GIL, so rendering in
+    separate processes keeps model activities on the worker responsive and
+    lets PDF throughput scale with cores. Every process imports WeasyPrint
+    and renders a tiny document up front so the first real render does not
+    pay for font discovery.
+    """
+    global _render_pool, _render_pool_size
 
-        # Generate PDF directly to file
-        weasyprint.HTML(string=full_html).write_pdf(str(pdf_path))
+    shutdown_pdf_render_pool()
+    max_workers = max_workers or os.cpu_count() or 1
+    pool = _new_render_pool(max_workers)
+    # Submitting one task per slot forces every process to start now
+    for future in [pool.submit(_render_process_ready) for _ in range(max_workers)]:
+        future.result()
+    _render_pool = pool
+    _render_pool_size = max_workers
+    return pool
 
-        return PDFGenerationResult(pdf_file_path=str(pdf_path), success=True)
 
-    except Exception as e:
-        return PDFGenerationResult(
-            pdf_file_path="", success=False, error_message=str(e)
+def shutdown_pdf_render_pool() -> None:
+    """Stop the render process pool, if one is running."""
+    global _render_pool
+
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def _new_render_pool(max_workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_render_process,
+    )
+
+
+def _replace_broken_render_pool() -> None:
+    global _render_pool
+
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = _new_render_pool(_render_pool_size)
+
+
+def _warm_render_process() -> None:
+    if WEASYPRINT_AVAILABLE and weasyprint is not None:
+        weasyprint.HTML(string="<p>warm-up</p>").write_pdf(
+            stylesheets=_get_stylesheets(None, None), font_config=_get_font_config()
         )
 
 
+def _render_process_ready() -> int:
+    return os.getpid()
+
+
+def _render_pdf_file(
+    markdown_content: str,
+    title: str,
+    styling_options: Optional[StylingOptions],
+    pdf_path: str,
+) -> None:
+    """Convert markdown to a styled PDF at ``pdf_path``. Runs off the event loop."""
+    # Convert markdown to HTML
+    html_content = markdown.markdown(
+        markdown_content, extensions=["tables", "fenced_code", "toc"]
+    )
+
+    # Create the HTML document; styling is applied from cached stylesheets
+    title = html.escape(title)
+    full_html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <title>{title}</title>
+    </head>
+    <body>
+        <div class="container">
+            <h1 class="document-title">{title}</h1>
+            <div class="content">
+                {html_content}
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+    # Generate PDF directly to file
+    stylesheets = _get_stylesheets(
+        styling_options.font_size if styling_options else None,
+        styling_options.primary_color if styling_options else None,
+    )
+    assert weasyprint is not None
+    weasyprint.HTML(string=full_html).write_pdf(
+        pdf_path, stylesheets=stylesheets, font_config=_get_font_config()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_font_config():
+    """Font configuration shared by every render in this process."""
+    from weasyprint.text.fonts import FontConfiguration
+
+    return FontConfiguration()
+
+
+@functools.lru_cache(maxsize=64)
+def _get_stylesheets(font_size: Optional[int], primary_color: Optional[str]) -> list:
+    """Parsed stylesheets for a styling combination, cached per process."""
+    assert weasyprint is not None
+    styling_options = StylingOptions(font_size=font_size, primary_color=primary_color)
+    font_config = _get_font_config()
+    stylesheets = [weasyprint.CSS(string=_get_default_css(), font_config=font_config)]
+    custom_css = _get_custom_css(styling_options)
+    if custom_css:
+        stylesheets.append(weasyprint.CSS(string=custom_css, font_config=font_config))
+    return stylesheets
+
+
 def _get_default_css() -> str:
     """Get default CSS styling for PDF generation."""
     return """
@@ -0,0 +1,61 @@
+"""Agent inputs, assembled for provider-side prompt prefix caching.
+
+A model provider can reuse the processed prefix of a prompt it has seen
+recently, so identical inputs should serialize to identical text, and text
+shared between requests should come before text that differs. Every input
+built here therefore:
+
+- lists shared context (search summaries, the previous tab) before the
+  request-specific query;
+- orders summaries by their own content, not by which search finished first
+  or whether they came from the corpus, cache or web;
+- serializes text canonically: line endings, trailing whitespace and blank
+  line runs normalized (spacing inside lines is kept, since chord names are
+  aligned over tab lines), with fixed section headers and separators.
+
+Agent instructions are static and go ahead of these inputs in every request.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+SUMMARY_SEPARATOR = "\n\n---\n\n"
+
+
+def canonical_text(text: str) -> str:
+    """Normalize line endings, trailing whitespace and runs of blank lines."""
+    lines = [line.rstrip() for line in text.strip().splitlines()]
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines))
+
+
+def canonical_line(text: str) -> str:
+    """Collapse all whitespace, for single-line fields."""
+    return " ".join(text.split())
+
+
+def canonical_summaries(summaries: Iterable[str]) -> list[str]:
+    """Canonical, de-duplicated summaries in a stable order."""
+    return sorted({canonical_text(summary) for summary in summaries if summary.strip()})
+
+
+def planner_input(query: str) -> str:
+    return f"Query: {canonical_text(query)}"
+
+
+def search_input(search_term: str, reason: str) -> str:
+    return f"Search term: {canonical_line(search_term)}\nReason for searching: {canonical_line(reason)}"
+
+
+def writer_input(query: str, search_results: Iterable[str], previous_tab: str | None = None) -> str:
+    """Writer input: search summaries, then the previous tab (follow-ups), then the query."""
+    sections = [
+        "Summarized search results:\n\n" + SUMMARY_SEPARATOR.join(canonical_summaries(search_results))
+    ]
+    if previous_tab:
+        sections.append(f"Previous tab:\n\n{canonical_text(previous_tab)}")
+    sections.append(f"Original query: {canonical_text(query)}")
+    return "\n\n".join(sections)
@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import json
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from temporalio import activity
+
+from openai_agents.workflows.disk_cache import DiskLRUCache
+from openai_agents.workflows.guitar_tab_agents.writer_agent import ReportData
+
+NO_PREFERENCE_ANSWERS = {"", "no preference", "none", "n/a"}
+
+
+def _canonical_text(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def report_cache_key(
+    original_query: str,
+    questions: Optional[List[str]] = None,
+    responses: Optional[Dict[str, str]] = None,
+) -> str:
+    """Build a cache key from the same inputs as ``_enrich_query``.
+
+    Questions and answers are compared case- and whitespace-insensitively,
+    their order is ignored, and "No preference" answers are dropped, so
+    unanswered and defaulted questions collapse to the same key.
+    """
+    responses = responses or {}
+    context = []
+    for i, question in enumerate(questions or []):
+        answer = _canonical_text(responses.get(f"question_{i}", ""))
+        if answer in NO_PREFERENCE_ANSWERS:
+            continue
+        context.append([_canonical_text(question), answer])
+    canonical = json.dumps(
+        {"query": _canonical_text(original_query), "context": sorted(context)},
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ReportCacheActivities:
+    """Worker-side cache of finished reports, keyed by ``report_cache_key``.
+
+    SQLite calls run in a thread so they never block the worker's event loop.
+    """
+
+    def __init__(self, cache: DiskLRUCache) -> None:
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    @activity.defn
+    async def lookup_report(
+        self, key: str, max_age_seconds: Optional[int] = None
+    ) -> Optional[ReportData]:
+        """Return a cached report no older than ``max_age_seconds``, if any."""
+        max_age = timedelta(seconds=max_age_seconds) if max_age_seconds is not None else None
+        cached = await asyncio.to_thread(self.cache.get, key, max_age)
+        report = ReportData.model_validate_json(cached) if cached is not None else None
+        if report is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        activity.logger.info(
+            "Report cache %s (hits=%d, misses=%d)",
+            "hit" if report is not None else "miss",
+            self.hits,
+            self.misses,
+        )
+        return report
+
+    @activity.defn
+    async def store_report(self, key: str, report: ReportData) -> None:
+        """Store a finished report under its cache key."""
+        await asyncio.to_thread(self.cache.set, key, report.model_dump_json())
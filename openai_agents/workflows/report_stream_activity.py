@@ -0,0 +1,181 @@
+import json
+import re
+import time
+from typing import Optional, Protocol
+
+from agents import ModelProvider, RunConfig
+from agents.models.openai_provider import OpenAIProvider
+from agents.run import AgentRunner
+from openai.types.responses import ResponseTextDeltaEvent
+from temporalio import activity
+from temporalio.client import Client
+
+from openai_agents.workflows.guitar_tab_agents.writer_agent import (
+    ReportData,
+    new_writer_agent,
+)
+from openai_agents.workflows.research_agents.research_models import (
+    ReportChunk,
+    ReportStreamPolicy,
+)
+
+REPORT_CHUNK_SIGNAL = "append_report_chunk"
+
+_FIELD_START_RE = re.compile(r'"markdown_report"\s*:\s*"')
+# Text kept while waiting for the field to start, enough for a key split across deltas
+_FIELD_SEARCH_TAIL = 256
+
+
+def _complete_prefix(raw: str) -> tuple[int, bool]:
+    """Length of ``raw`` that decodes on its own, and whether the string closed there.
+
+    Stops before an escape sequence that has not fully arrived, including a
+    high surrogate still waiting for its pair.
+    """
+    i = 0
+    while i < len(raw):
+        char = raw[i]
+        if char == '"':
+            return i, True
+        if char == "\\":
+            if i + 1 >= len(raw):
+                break
+            width = 6 if raw[i + 1] == "u" else 2
+            if i + width > len(raw):
+                break
+            if width == 6 and 0xD800 <= int(raw[i + 2 : i + 6], 16) <= 0xDBFF:
+                if i + 12 > len(raw):
+                    break
+                width = 12
+            i += width
+        else:
+            i += 1
+    return i, False
+
+
+class PartialMarkdownDecoder:
+    """Decodes the ``markdown_report`` string of streamed ReportData JSON, delta by delta.
+
+    The writer streams ReportData as JSON, so the markdown arrives as an
+    escaped JSON string that may be cut off mid escape sequence. Each delta
+    is scanned once; only an incomplete escape sequence is carried over.
+    """
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._started = False
+        self._closed = False
+        self.length = 0  # characters of markdown decoded so far
+
+    def feed(self, delta: str) -> str:
+        """Add a delta and return the markdown it completed."""
+        if self._closed:
+            return ""
+        self._pending += delta
+        if not self._started:
+            match = _FIELD_START_RE.search(self._pending)
+            if match is None:
+                self._pending = self._pending[-_FIELD_SEARCH_TAIL:]
+                return ""
+            self._started = True
+            self._pending = self._pending[match.end() :]
+        end, self._closed = _complete_prefix(self._pending)
+        text = json.loads(f'"{self._pending[:end]}"')
+        self._pending = "" if self._closed else self._pending[end:]
+        self.length += len(text)
+        return text
+
+
+def extract_partial_markdown(buffer: str) -> str:
+    """Decode as much of the ``markdown_report`` string as ``buffer`` holds."""
+    return PartialMarkdownDecoder().feed(buffer)
+
+
+class ReportStreamSink(Protocol):
+    """Where partial report text is published while the writer runs."""
+
+    async def publish(self, workflow_id: str, chunk: ReportChunk) -> None: ...
+
+
+class WorkflowSignalSink:
+    """Publishes chunks back to the requesting workflow as signals."""
+
+    def __init__(self, client: Client) -> None:
+        self.client = client
+
+    async def publish(self, workflow_id: str, chunk: ReportChunk) -> None:
+        await self.client.get_workflow_handle(workflow_id).signal(REPORT_CHUNK_SIGNAL, chunk)
+
+
+class ReportStreamActivities:
+    """Runs the writer agent with streaming and publishes markdown as it arrives.
+
+    Chunks are batched under a ReportStreamPolicy so that a long report costs
+    a bounded number of signals rather than one per token.
+    """
+
+    def __init__(self, sink: ReportStreamSink, model_provider: Optional[ModelProvider] = None) -> None:
+        self.sink = sink
+        self.model_provider = model_provider
+
+    @activity.defn
+    async def stream_report(
+        self,
+        input_str: str,
+        model: Optional[str] = None,
+        policy: Optional[ReportStreamPolicy] = None,
+    ) -> ReportData:
+        """Write the report, streaming partial markdown to the sink.
+
+        ``model`` replaces the writer's model, e.g. a faster one under a latency budget.
+        """
+        policy = policy or ReportStreamPolicy()
+        info = activity.info()
+        writer = new_writer_agent()
+        if model is not None:
+            writer = writer.clone(model=model)
+        # Bypass the worker-wide Temporal runner override; this already runs in an activity
+        result = AgentRunner().run_streamed(
+            writer,
+            input_str,
+            run_config=RunConfig(model_provider=self.model_provider or OpenAIProvider()),
+        )
+
+        decoder = PartialMarkdownDecoder()
+        unpublished: list[str] = []
+        unpublished_chars = 0
+        sequence = 0
+        last_flush = time.monotonic()
+
+        async def flush() -> None:
+            nonlocal unpublished, unpublished_chars, sequence, last_flush
+            if not unpublished_chars:
+                return
+            chunk = ReportChunk(attempt=info.attempt, sequence=sequence, text="".join(unpublished))
+            await self.sink.publish(info.workflow_id, chunk)
+            unpublished, unpublished_chars = [], 0
+            sequence += 1
+            last_flush = time.monotonic()
+
+        async for event in result.stream_events():
+            # Heartbeat on every event; reasoning models can stream for a while before any text
+            activity.heartbeat(decoder.length)
+            if event.type != "raw_response_event" or not isinstance(event.data, ResponseTextDeltaEvent):
+                continue
+            text = decoder.feed(event.data.delta)
+            if text:
+                unpublished.append(text)
+                unpublished_chars += len(text)
+            # The last signal is kept for the final flush, which carries the rest of the report
+            if sequence < policy.max_signals - 1 and (
+                unpublished_chars >= policy.min_chunk_chars
+                or time.monotonic() - last_flush >= policy.flush_interval_seconds
+            ):
+                await flush()
+
+        report = result.final_output_as(ReportData)
+        # Whatever the decoder missed (e.g. a final delta never streamed) comes from the result
+        rest = report.markdown_report[decoder.length - unpublished_chars :]
+        unpublished, unpublished_chars = [rest], len(rest)
+        await flush()
+        return report
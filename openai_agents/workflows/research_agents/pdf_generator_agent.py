@@ -37,15 +37,18 @@ class PDFReportData(BaseModel):
     """Error message if PDF generation failed"""
 
 
+def pdf_generation_tool(task_queue: str | None = None):
+    """The generate_pdf activity as a tool, run on ``task_queue`` (default: the workflow's)."""
+    return temporal_agents.workflow.activity_as_tool(
+        generate_pdf, start_to_close_timeout=timedelta(seconds=30), task_queue=task_queue
+    )
+
+
 def new_pdf_generator_agent():
     return Agent(
         name="PDFGeneratorAgent",
         instructions=PDF_GENERATION_PROMPT,
         model="gpt-4o-mini",
-        tools=[
-            temporal_agents.workflow.activity_as_tool(
-                generate_pdf, start_to_close_timeout=timedelta(seconds=30)
-            )
-        ],
+        tools=[pdf_generation_tool()],
         output_type=PDFReportData,
     )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -19,10 +19,254 @@ class SingleClarificationInput(BaseModel):
     answer: str
 
 
+class SearchFanOutPolicy(BaseModel):
+    """How the search stage fans out over the planner's search items"""
+
+    max_in_flight: int = 4
+    quorum: Optional[int] = None  # proceed once this many searches succeed; None waits for all
+    stage_deadline_seconds: Optional[float] = 120.0  # cancel stragglers after this long
+    hedge_percentile: Optional[float] = None  # e.g. 0.9: duplicate searches slower than this percentile
+    hedge_min_samples: int = 3  # completed searches needed before hedging starts
+
+
+class ReportStreamPolicy(BaseModel):
+    """How the streaming writer batches partial markdown into workflow signals
+
+    Every signal is stored in workflow history, and the finished report is
+    stored again as the activity result, so a streamed report costs about
+    twice its size in history plus up to ``max_signals`` signal events.
+    """
+
+    flush_interval_seconds: float = 0.5  # send new text at least this often
+    min_chunk_chars: int = 200  # or as soon as this much new text has arrived
+    max_signals: int = 50  # once reached, the rest of the report arrives with the final signal
+
+
+class SearchTiming(BaseModel):
+    """Timing of a single web search"""
+
+    query: str
+    seconds: float
+    status: str  # ok, cached, failed, cancelled
+    hedged: bool = False
+
+
+class SearchCompactionPolicy(BaseModel):
+    """How search summaries are compacted before the writer sees them"""
+
+    enabled: bool = True
+    similarity_threshold: float = 0.5  # shingle Jaccard similarity that counts as a near-duplicate
+    token_budget: Optional[int] = 3000  # estimated tokens of summaries passed to the writer
+
+
+class CompactionStats(BaseModel):
+    """Effect of compacting search summaries for one report"""
+
+    input_summaries: int = 0
+    output_summaries: int = 0
+    duplicates_removed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tokens_saved: int = 0
+
+
+class SpeculationStats(BaseModel):
+    """How much of the speculative search run during clarification was used"""
+
+    speculative_searches: int = 0  # successful searches for the bare query
+    reused: int = 0  # reused for the enriched query's plan
+    wasted: int = 0  # not matched by any planned search
+    additional: int = 0  # planned searches that still had to run
+
+
+class CorpusStats(BaseModel):
+    """Local tab corpus lookups for one report"""
+
+    documents: int = 0  # documents in the index
+    index_bytes: int = 0
+    lookups: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+    hit_rate: float = 0.0  # worker-wide since start
+
+
+class TriageStats(BaseModel):
+    """How the request was triaged: by the local rules or the triage agent"""
+
+    path: str  # plan, clarify (rules) or llm (triage agent)
+    reason: str
+    format: Optional[str] = None
+    skill: Optional[str] = None
+    section: Optional[str] = None
+    tuning: Optional[str] = None
+
+
+class AgentUsage(BaseModel):
+    """Token usage of one agent's model calls"""
+
+    agent: str
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+
+
+class StageUsage(BaseModel):
+    """Wall time and model usage of one pipeline stage"""
+
+    stage: str  # triage, planner, search, writer, pdf
+    label: Optional[str] = None  # e.g. the search query
+    seconds: float = 0.0
+    agents: List[AgentUsage] = []
+
+
+class UsageReport(BaseModel):
+    """Where a request's time and tokens went"""
+
+    total_seconds: float = 0.0
+    stages: List[StageUsage] = []
+    by_agent: List[AgentUsage] = []
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0  # input tokens served from the provider's prompt prefix cache
+
+
+class LatencyBudget(BaseModel):
+    """End-to-end latency target and the stage estimates used to meet it"""
+
+    seconds: Optional[float] = None  # None disables degradation
+    fallback_model: str = "gpt-4o-mini"  # used by the planner and writer when time is short
+    reduced_searches: int = 2  # search plan length when time is short
+    min_search_seconds: float = 5.0
+    # Expected stage durations on the configured models
+    planner_seconds: float = 8.0
+    search_seconds: float = 25.0
+    writer_seconds: float = 45.0
+    fallback_writer_seconds: float = 15.0
+    pdf_seconds: float = 5.0
+
+
+class Degradation(BaseModel):
+    """A shortcut taken to stay within the latency budget"""
+
+    stage: str
+    action: str  # fallback_model, shorter_plan, search_deadline, skip_pdf
+    detail: str
+    remaining_seconds: float
+
+
+class FollowUpPolicy(BaseModel):
+    """Multi-turn sessions: keep the workflow open for follow-up questions after the first tab"""
+
+    enabled: bool = False
+    idle_timeout_seconds: int = 3600  # end the session after this long without a follow-up
+    max_context_searches: int = 12  # most recent search summaries carried between turns
+    max_context_report_chars: int = 12000  # previous report passed to the writer, truncated
+    # Continue as new beyond either limit, so long sessions keep history and replay bounded
+    max_history_events: int = 1000
+    max_history_bytes: int = 1_000_000
+
+
+class TabRequestOptions(BaseModel):
+    """Per-request switches for the guitar tab pipeline"""
+
+    use_report_cache: bool = True
+    report_cache_max_age_seconds: Optional[int] = None  # None uses the worker's TTL
+    pdf_mode: Literal["direct", "agent"] = "direct"  # agent routes through the PDF generator agent
+    stream_report: bool = False  # publish partial markdown while the writer runs
+    stream_policy: ReportStreamPolicy = ReportStreamPolicy()
+    search_policy: SearchFanOutPolicy = SearchFanOutPolicy()
+    speculative_search: bool = False  # search the bare query while clarifications are answered
+    compaction: SearchCompactionPolicy = SearchCompactionPolicy()
+    use_corpus: bool = True  # answer from previously generated tabs and summaries before searching
+    corpus_min_confidence: float = 0.8  # share of query terms a corpus match must name
+    latency_budget: LatencyBudget = LatencyBudget()
+    follow_ups: FollowUpPolicy = FollowUpPolicy()
+    rule_triage: bool = True  # skip the triage agent when keyword rules can read the request
+
+
 class UserQueryInput(BaseModel):
     """Input for initial user research query"""
 
     query: str
+    options: Optional[TabRequestOptions] = None
+
+
+class FollowUpInput(BaseModel):
+    """A follow-up question about the session's latest tab"""
+
+    question: str
+
+
+class SessionSearch(BaseModel):
+    """A search summary kept as context for later turns"""
+
+    query: str
+    summary: str
+
+
+class SessionReport(BaseModel):
+    """The latest tab of a multi-turn session"""
+
+    turn: int = 0  # 0 for the first tab, then one per follow-up
+    question: Optional[str] = None  # the follow-up this tab answers
+    short_summary: str = ""
+    markdown_report: str = ""
+    follow_up_questions: List[str] = []
+    pdf_file_path: Optional[str] = None
+    new_searches: int = 0  # searches run for this turn rather than reused
+
+
+class SessionState(BaseModel):
+    """What a multi-turn session carries into its next run after continue-as-new"""
+
+    original_query: str
+    options: TabRequestOptions
+    report: SessionReport
+    searches: List[SessionSearch] = []
+    runs: int = 1  # workflow runs so far in this session
+
+
+class ReportChunk(BaseModel):
+    """A piece of partial report markdown streamed from the writer activity"""
+
+    attempt: int  # activity attempt; a retry restarts the stream
+    sequence: int
+    text: str
+
+
+class ReportProgress(BaseModel):
+    """Partial report markdown streamed so far"""
+
+    attempt: int = 0
+    text: str = ""  # text after the requested offset
+    offset: int = 0  # total length streamed so far
+    done: bool = False
+
+
+class SessionPollInput(BaseModel):
+    """Input for long-polling session changes"""
+
+    since_version: int = 0
+    report_attempt: int = 0
+    report_offset: int = 0  # streamed report characters the client already has
+    timeout_seconds: int = 30
+
+
+class SessionDelta(BaseModel):
+    """Session state changes since a client's last known version.
+
+    Fields that did not change are left as None.
+    """
+
+    version: int
+    status: str
+    clarification_questions: Optional[List[str]] = None
+    current_question_index: Optional[int] = None
+    report_attempt: int = 0
+    report_text: str = ""  # streamed report text after the requested offset
+    report_offset: int = 0
+    research_completed: bool = False
 
 
 class ResearchStatusInput(BaseModel):
@@ -42,7 +286,7 @@ class ResearchInteraction:
     enriched_query: Optional[str] = None
     final_result: Optional[str] = None
     report_data: Optional[Any] = None  # Will hold ReportData object
-    status: str = "pending"  # pending, awaiting_clarifications, collecting_answers, researching, completed
+    status: str = "pending"  # pending, triaging, awaiting_clarifications, collecting_answers, researching, rendering, completed
 
     def get_current_question(self) -> Optional[str]:
         """Get the current question that needs an answer"""
@@ -99,3 +343,30 @@ class ResearchInteractionDict(BaseModel):
     def has_more_questions(self) -> bool:
         """Check if there are more questions to answer"""
         return self.current_question_index < len(self.clarification_questions)
+
+
+class TabTransform(BaseModel):
+    """A transform to apply to the tab blocks of a report"""
+
+    semitones: int = 0  # transpose the sounding pitch
+    capo: int = 0  # write frets relative to a capo at this fret
+    current_capo: int = 0  # capo the report's frets are already relative to
+    tuning: Optional[str] = None  # retune to a named tuning, e.g. "drop_d" or "open_g"
+    min_fret: Optional[int] = None  # re-voice notes to stay within min_fret..max_fret
+    max_fret: Optional[int] = None
+
+
+class TabTransformInput(TabTransform):
+    """A finished tab report and the transform to apply to its tab blocks"""
+
+    markdown_report: str
+
+
+class TabTransformResult(BaseModel):
+    """Transformed report and how its notes were moved"""
+
+    markdown_report: str
+    notes: int = 0
+    octave_shifts: int = 0
+    string_moves: int = 0
+    out_of_range: int = 0
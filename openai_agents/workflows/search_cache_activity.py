@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from temporalio import activity
+
+from openai_agents.workflows.disk_cache import DiskLRUCache
+
+_TOKEN_RE = re.compile(r"[^\W_]+(?:['’][^\W_]+)*")
+
+
+def normalize_search_query(query: str) -> str:
+    """Normalize a search query so near-identical phrasings share a cache key.
+
+    Case, punctuation, repeated whitespace and word order are ignored, so
+    "Iron Man  Black Sabbath tab" and "black sabbath iron man TAB" match.
+    """
+    tokens = _TOKEN_RE.findall(query.casefold())
+    return " ".join(sorted(tokens))
+
+
+def search_cache_key(query: str) -> str:
+    normalized = normalize_search_query(query)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SearchCacheResult:
+    hit: bool
+    summary: Optional[str] = None
+    hits: int = 0
+    misses: int = 0
+
+
+class SearchCacheActivities:
+    """Worker-side cache of search agent summaries.
+
+    Lookups go through activities so that the cached value is recorded in
+    workflow history and replays never touch the local disk. SQLite calls
+    run in a thread so they never block the worker's event loop.
+    """
+
+    def __init__(self, cache: DiskLRUCache) -> None:
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    @activity.defn
+    async def lookup_search_result(self, query: str) -> SearchCacheResult:
+        """Return the cached summary for a search query, if any."""
+        summary = await asyncio.to_thread(self.cache.get, search_cache_key(query))
+        if summary is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        activity.metric_meter().create_counter(
+            "guitar_tab_search_cache_lookups", "Search cache lookups by result"
+        ).add(1, {"result": "hit" if summary is not None else "miss"})
+        activity.logger.info(
+            "Search cache %s for %r (hits=%d, misses=%d)",
+            "hit" if summary is not None else "miss",
+            normalize_search_query(query),
+            self.hits,
+            self.misses,
+        )
+        return SearchCacheResult(
+            hit=summary is not None,
+            summary=summary,
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+    @activity.defn
+    async def store_search_result(self, query: str, summary: str) -> None:
+        """Store a search summary under the normalized query."""
+        await asyncio.to_thread(self.cache.set, search_cache_key(query), summary)
@@ -0,0 +1,202 @@
+"""Near-duplicate elimination and token budgeting for search summaries.
+
+Runs inside the workflow between the search and writer stages, so it is pure
+and deterministic: hashing uses zlib.crc32 rather than the per-process salted
+built-in ``hash``.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from dataclasses import dataclass
+
+_WORD_RE = re.compile(r"\w+")
+# A sentence or line together with the whitespace that follows it
+_UNIT_RE = re.compile(r".+?(?:[.!?](?:[ \t]+|\n+|$)|\n+|$)", re.DOTALL)
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+# Tab staff lines ("e|-----3---|") and chord-grid lines ("| G | C |")
+_TAB_LINE_RE = re.compile(r"^\s*([A-Ga-g][#b]?\s*[|:]|\|.*\|\s*$)")
+
+SHINGLE_SIZE = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)."""
+    return math.ceil(len(text) / 4)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> frozenset[int]:
+    """Hashed word n-grams of ``text``, ignoring case and punctuation."""
+    words = _WORD_RE.findall(text.casefold())
+    if len(words) < size:
+        return frozenset([zlib.crc32(" ".join(words).encode("utf-8"))]) if words else frozenset()
+    return frozenset(
+        zlib.crc32(" ".join(words[i : i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    )
+
+
+def jaccard(a: frozenset[int], b: frozenset[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def split_units(text: str) -> list[str]:
+    """Split ``text`` into sentences, lines and whole tab blocks, each keeping its trailing whitespace.
+
+    Fenced blocks and runs of tab staff lines are single units, so merging
+    and trimming never break them apart, and joining the units of a text
+    gives back the text unchanged.
+    """
+    units: list[str] = []
+    prose: list[str] = []
+    block: list[str] = []
+    in_fence = False
+
+    def flush_prose() -> None:
+        units.extend(unit for unit in _UNIT_RE.findall("".join(prose)) if unit.strip())
+        prose.clear()
+
+    def flush_block() -> None:
+        if block:
+            units.append("".join(block))
+            block.clear()
+
+    for line in text.splitlines(keepends=True):
+        if in_fence:
+            block.append(line)
+            if _FENCE_RE.match(line):
+                in_fence = False
+                flush_block()
+        elif _FENCE_RE.match(line):
+            flush_prose()
+            flush_block()
+            block.append(line)
+            in_fence = True
+        elif _TAB_LINE_RE.match(line):
+            flush_prose()
+            block.append(line)
+        else:
+            flush_block()
+            prose.append(line)
+    flush_prose()
+    flush_block()
+    return units
+
+
+@dataclass
+class CompactionResult:
+    summaries: list[str]
+    input_tokens: int
+    output_tokens: int
+    duplicates_removed: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.input_tokens - self.output_tokens
+
+
+def compact_summaries(
+    summaries: list[str],
+    similarity_threshold: float = 0.5,
+    token_budget: int | None = None,
+) -> CompactionResult:
+    """Drop near-duplicate summaries and trim the rest to ``token_budget``.
+
+    When two summaries overlap by at least ``similarity_threshold`` (Jaccard
+    similarity of word 3-gram shingles), the longer one is kept and any
+    sentences only the shorter one contains are appended to it. Trimming takes
+    sentences round-robin across summaries, so every source keeps its lead
+    sentences before any source keeps its details. Line breaks are kept, and
+    tab blocks are merged or trimmed whole.
+    """
+    input_tokens = sum(estimate_tokens(summary) for summary in summaries)
+
+    kept: list[str] = []
+    kept_shingles: list[frozenset[int]] = []
+    duplicates = 0
+    for summary in summaries:
+        summary_shingles = shingles(summary)
+        match = next(
+            (
+                i
+                for i, existing in enumerate(kept_shingles)
+                if jaccard(summary_shingles, existing) >= similarity_threshold
+            ),
+            None,
+        )
+        if match is None:
+            kept.append(summary)
+            kept_shingles.append(summary_shingles)
+            continue
+        duplicates += 1
+        longer, shorter = (summary, kept[match]) if len(summary) > len(kept[match]) else (kept[match], summary)
+        merged = _merge_unique_sentences(longer, shorter)
+        kept[match] = merged
+        kept_shingles[match] = shingles(merged)
+
+    if token_budget is not None and sum(estimate_tokens(s) for s in kept) > token_budget:
+        kept = _trim_round_robin(kept, token_budget)
+
+    return CompactionResult(
+        summaries=kept,
+        input_tokens=input_tokens,
+        output_tokens=sum(estimate_tokens(summary) for summary in kept),
+        duplicates_removed=duplicates,
+    )
+
+
+def _merge_unique_sentences(base: str, other: str, overlap_threshold: float = 0.5) -> str:
+    base_shingles = shingles(base)
+    extra = []
+    for unit in split_units(other):
+        unit_shingles = shingles(unit)
+        if not unit_shingles:
+            continue
+        covered = len(unit_shingles & base_shingles) / len(unit_shingles)
+        if covered < overlap_threshold:
+            extra.append(unit)
+            base_shingles = base_shingles | unit_shingles
+    if not extra:
+        return base
+    return "\n".join([base.rstrip(), _join_units(extra)])
+
+
+def _join_units(units: list[str]) -> str:
+    """Join units picked out of their text; the last unit of a text has no trailing whitespace."""
+    text = ""
+    previous = ""
+    for unit in units:
+        if text and not text[-1].isspace():
+            text += "\n" if "\n" in previous.strip() or "\n" in unit.strip() else " "
+        text += unit
+        previous = unit
+    return text.rstrip()
+
+
+def _trim_round_robin(summaries: list[str], token_budget: int) -> list[str]:
+    sentences = [split_units(summary) for summary in summaries]
+    selected: list[list[str]] = [[] for _ in summaries]
+    # A summary stops contributing once its next sentence does not fit
+    active = [bool(summary_sentences) for summary_sentences in sentences]
+    used = 0
+    depth = 0
+    while any(active):
+        for i, summary_sentences in enumerate(sentences):
+            if not active[i]:
+                continue
+            if depth >= len(summary_sentences):
+                active[i] = False
+                continue
+            cost = estimate_tokens(summary_sentences[depth]) + 1
+            if used + cost > token_budget:
+                active[i] = False
+                continue
+            selected[i].append(summary_sentences[depth])
+            used += cost
+        depth += 1
+    # Each summary keeps a prefix of its own units, so its text is unchanged up to the cut
+    return ["".join(chosen).rstrip() for chosen in selected if chosen]
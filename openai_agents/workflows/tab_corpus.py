@@ -0,0 +1,213 @@
+"""Persistent full-text index of generated tabs and search summaries.
+
+Backed by an SQLite FTS5 table with song, artist, section, query and body
+fields. Like ``DiskLRUCache`` it is only touched by worker-side activities.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_HEADING_RE = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_TITLE_RE = re.compile(
+    r"^[\"“']?(?P<song>.+?)[\"”']?\s+by\s+(?P<artist>.+?)(?:\s+[-–—:]\s+.*)?$",
+    re.IGNORECASE,
+)
+
+# Words that say what kind of document is wanted rather than which song
+STOPWORDS = frozenset(
+    """
+    a an and the of for in on to by with me my i you do can could would want like please
+    how what is are show give
+    guitar guitars tab tabs tablature chord chords lesson lessons tutorial tutorials
+    play playing learn teach easy beginner beginners simplified simple version
+    song songs riff riffs acoustic electric full
+    """.split()
+)
+
+# bm25 weights for (kind, song, artist, section, query, body, doc_key, created_at)
+_BM25_WEIGHTS = "0.0, 10.0, 5.0, 2.0, 3.0, 1.0, 0.0, 0.0"
+
+
+def content_terms(text: str) -> list[str]:
+    """Distinct lowercased words of ``text`` that identify a song, in order."""
+    terms: dict[str, None] = {}
+    for token in _TOKEN_RE.findall(text.casefold()):
+        if token not in STOPWORDS:
+            terms[token] = None
+    return list(terms)
+
+
+def parse_report_title(markdown: str) -> tuple[str, str, list[str]]:
+    """(song, artist, section headings) from a writer report.
+
+    Reports open with a heading like ``### "Iron Man" by Black Sabbath - Simplified``.
+    """
+    headings = _HEADING_RE.findall(markdown)
+    if not headings:
+        return "", "", []
+    match = _TITLE_RE.match(headings[0])
+    if match is None:
+        return headings[0], "", headings[1:]
+    return match.group("song").strip(), match.group("artist").strip(), headings[1:]
+
+
+@dataclass
+class CorpusDocument:
+    kind: str  # "report" or "search"
+    song: str
+    artist: str
+    section: str
+    query: str
+    body: str
+    score: float = 0.0
+
+    @property
+    def title_terms(self) -> set[str]:
+        """Terms of the fields that name the song rather than describe it."""
+        return set(content_terms(f"{self.song} {self.artist} {self.query}"))
+
+
+class TabCorpus:
+    """Full-text index of tabs and summaries stored in a single SQLite file.
+
+    Documents are keyed by kind and content so re-indexing is idempotent.
+    Beyond ``max_documents`` the oldest documents are dropped first.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_documents: int = 20000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_documents = max_documents
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS corpus USING fts5(
+                kind UNINDEXED,
+                song,
+                artist,
+                section,
+                query,
+                body,
+                doc_key UNINDEXED,
+                created_at UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_key TEXT PRIMARY KEY,
+                corpus_rowid INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS documents_created_at ON documents (created_at)"
+        )
+        self._conn.commit()
+
+    def add(
+        self,
+        kind: str,
+        body: str,
+        song: str = "",
+        artist: str = "",
+        section: str = "",
+        query: str = "",
+    ) -> None:
+        """Index a document, replacing an earlier copy of the same content."""
+        doc_key = hashlib.sha256(f"{kind}\0{query}\0{body}".encode("utf-8")).hexdigest()
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT corpus_rowid FROM documents WHERE doc_key = ?", (doc_key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM corpus WHERE rowid = ?", row)
+            cursor = self._conn.execute(
+                "INSERT INTO corpus (kind, song, artist, section, query, body, doc_key, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, song, artist, section, query, body, doc_key, now),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (doc_key, corpus_rowid, created_at) VALUES (?, ?, ?)",
+                (doc_key, cursor.lastrowid, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def add_report(self, query: str, markdown: str) -> None:
+        song, artist, sections = parse_report_title(markdown)
+        self.add("report", markdown, song=song, artist=artist, section=" | ".join(sections), query=query)
+
+    def search(self, text: str, limit: int = 5) -> list[CorpusDocument]:
+        """Best matches for any content term of ``text``, best first."""
+        terms = content_terms(text)
+        if not terms:
+            return []
+        expression = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT kind, song, artist, section, query, body, bm25(corpus, {_BM25_WEIGHTS}) AS score "
+                "FROM corpus WHERE corpus MATCH ? ORDER BY score LIMIT ?",
+                (expression, limit),
+            ).fetchall()
+        # bm25() is lower for better matches; flip it so higher is better
+        return [CorpusDocument(*row[:6], score=-row[6]) for row in rows]
+
+    def best_match(self, text: str, min_confidence: float, kind: Optional[str] = None) -> tuple[CorpusDocument, float] | None:
+        """The top match whose title fields cover at least ``min_confidence`` of the query terms."""
+        terms = set(content_terms(text))
+        if not terms:
+            return None
+        for document in self.search(text):
+            if kind is not None and document.kind != kind:
+                continue
+            confidence = len(terms & document.title_terms) / len(terms)
+            if confidence >= min_confidence:
+                return document, confidence
+        return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+            return count
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            (pages,) = self._conn.execute("PRAGMA page_count").fetchone()
+            (page_size,) = self._conn.execute("PRAGMA page_size").fetchone()
+            return pages * page_size
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        stale = self._conn.execute(
+            "SELECT doc_key, corpus_rowid FROM documents ORDER BY created_at DESC LIMIT -1 OFFSET ?",
+            (self.max_documents,),
+        ).fetchall()
+        for doc_key, corpus_rowid in stale:
+            self._conn.execute("DELETE FROM corpus WHERE rowid = ?", (corpus_rowid,))
+            self._conn.execute("DELETE FROM documents WHERE doc_key = ?", (doc_key,))
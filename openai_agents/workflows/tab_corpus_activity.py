@@ -0,0 +1,98 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from temporalio import activity
+
+from openai_agents.workflows.guitar_tab_agents.writer_agent import ReportData
+from openai_agents.workflows.research_agents.research_models import CorpusStats
+from openai_agents.workflows.tab_corpus import TabCorpus
+
+
+@dataclass
+class CorpusMatch:
+    kind: str
+    text: str
+    confidence: float
+    song: str = ""
+    artist: str = ""
+
+
+@dataclass
+class CorpusLookupResult:
+    matches: List[Optional[CorpusMatch]] = field(default_factory=list)  # one per query
+    stats: CorpusStats = field(default_factory=CorpusStats)
+
+
+class TabCorpusActivities:
+    """Worker-side full-text index of finished reports and search summaries.
+
+    Consulted before web search; populated once a report is written. FTS5
+    queries and writes run in a thread so they never block the worker's event loop.
+    """
+
+    def __init__(self, corpus: TabCorpus) -> None:
+        self.corpus = corpus
+        self.lookups = 0
+        self.hits = 0
+
+    @activity.defn
+    async def lookup_corpus(
+        self, queries: List[str], min_confidence: float, kind: Optional[str] = None
+    ) -> CorpusLookupResult:
+        """Return the best confident match for each query, or None where there is none."""
+        result = await asyncio.to_thread(self._lookup, queries, min_confidence, kind)
+        stats = result.stats
+        self.lookups += stats.lookups
+        self.hits += stats.hits
+        stats.hit_rate = self.hits / self.lookups if self.lookups else 0.0
+        activity.logger.info(
+            "Corpus lookup: %d/%d hits in %.1fms (index: %d documents, %.1f KiB; worker hit rate %.0f%%)",
+            stats.hits,
+            stats.lookups,
+            stats.seconds * 1000,
+            stats.documents,
+            stats.index_bytes / 1024,
+            stats.hit_rate * 100,
+        )
+        return result
+
+    @activity.defn
+    async def index_tab_report(
+        self, query: str, report: ReportData, search_summaries: Dict[str, str]
+    ) -> None:
+        """Add a finished report and the web search summaries behind it."""
+        await asyncio.to_thread(self._index, query, report.markdown_report, search_summaries)
+
+    def _lookup(self, queries: List[str], min_confidence: float, kind: Optional[str]) -> CorpusLookupResult:
+        started = time.perf_counter()
+        matches: List[Optional[CorpusMatch]] = []
+        for query in queries:
+            best = self.corpus.best_match(query, min_confidence, kind=kind)
+            if best is None:
+                matches.append(None)
+                continue
+            document, confidence = best
+            matches.append(
+                CorpusMatch(
+                    kind=document.kind,
+                    text=document.body,
+                    confidence=confidence,
+                    song=document.song,
+                    artist=document.artist,
+                )
+            )
+        stats = CorpusStats(
+            documents=len(self.corpus),
+            index_bytes=self.corpus.size_bytes(),
+            lookups=len(queries),
+            hits=sum(match is not None for match in matches),
+            seconds=time.perf_counter() - started,
+        )
+        return CorpusLookupResult(matches=matches, stats=stats)
+
+    def _index(self, query: str, markdown: str, search_summaries: Dict[str, str]) -> None:
+        self.corpus.add_report(query, markdown)
+        for search_query, summary in search_summaries.items():
+            self.corpus.add("search", summary, query=search_query)
@@ -0,0 +1,43 @@
+from temporalio import workflow
+from temporalio.exceptions import ApplicationError
+
+from openai_agents.workflows.research_agents.research_models import (
+    TabTransformInput,
+    TabTransformResult,
+)
+from openai_agents.workflows.tab_transforms import fret_range, transform_markdown
+
+
+@workflow.defn
+class TabTransformWorkflow:
+    """Transpose, capo or retune a finished tab report without calling any model.
+
+    The transform is pure and deterministic, so it runs inside the workflow task
+    and the whole workflow completes in a single task.
+    """
+
+    @workflow.run
+    async def run(self, input: TabTransformInput) -> TabTransformResult:
+        try:
+            markdown, stats = transform_markdown(
+                input.markdown_report,
+                semitones=input.semitones,
+                capo=input.capo,
+                current_capo=input.current_capo,
+                tuning=input.tuning,
+                fret_range=fret_range(input.min_fret, input.max_fret),
+            )
+        except ValueError as e:
+            raise ApplicationError(str(e), non_retryable=True) from e
+
+        workflow.logger.info(
+            f"Transformed {stats.notes} notes: {stats.octave_shifts} octave shifts, "
+            f"{stats.string_moves} string moves, {stats.out_of_range} out of range"
+        )
+        return TabTransformResult(
+            markdown_report=markdown,
+            notes=stats.notes,
+            octave_shifts=stats.octave_shifts,
+            string_moves=stats.string_moves,
+            out_of_range=stats.out_of_range,
+        )
@@ -0,0 +1,328 @@
+"""Deterministic transposition, capo and retuning of parsed tablature.
+
+Every transform reduces to a per-string fret offset, applied to a whole
+string's fret array at once, followed by optional octave or string moves to
+keep notes inside a playable fret range. Two-digit results get an extra
+column in every string so the block stays aligned.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+
+from openai_agents.workflows.tablature import (
+    BAR,
+    CONTINUATION,
+    FILLER,
+    MAX_FRET,
+    NO_FRET,
+    TabBlock,
+    TabDocument,
+    TabString,
+    parse_tab_document,
+)
+
+NOTE_NAMES = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+_NOTE_PITCH_CLASSES = {name: i for i, name in enumerate(NOTE_NAMES)}
+_NOTE_PITCH_CLASSES.update({"Db": 1, "D#": 3, "Gb": 6, "G#": 8, "A#": 10})
+
+# Open string pitches as MIDI note numbers, lowest string first
+TUNINGS: dict[str, tuple[int, ...]] = {
+    "standard": (40, 45, 50, 55, 59, 64),
+    "drop_d": (38, 45, 50, 55, 59, 64),
+    "half_step_down": (39, 44, 49, 54, 58, 63),
+    "full_step_down": (38, 43, 48, 53, 57, 62),
+    "drop_c": (36, 43, 48, 53, 57, 62),
+    "open_g": (38, 43, 50, 55, 59, 62),
+    "open_d": (38, 45, 50, 54, 57, 62),
+    "open_e": (40, 47, 52, 56, 59, 64),
+    "dadgad": (38, 45, 50, 55, 57, 62),
+}
+
+
+@dataclass
+class TransformStats:
+    notes: int = 0
+    octave_shifts: int = 0  # notes moved by an octave on the same string
+    string_moves: int = 0  # notes moved to another string to stay in range
+    out_of_range: int = 0  # notes left outside the requested fret range
+
+
+def note_name(pitch: int) -> str:
+    return NOTE_NAMES[pitch % 12]
+
+
+def fret_range(min_fret: int | None, max_fret: int | None) -> tuple[int, int] | None:
+    """Inclusive fret range from optional bounds, or None when neither is set."""
+    if min_fret is None and max_fret is None:
+        return None
+    return (min_fret or 0, MAX_FRET if max_fret is None else max_fret)
+
+
+def infer_tuning(block: TabBlock) -> tuple[int, ...]:
+    """Open string pitches of a block, matched by its string labels.
+
+    Raises ValueError when the labels match none of ``TUNINGS``; guessing a
+    tuning would silently move notes to the wrong pitches.
+    """
+    labels = tuple(_NOTE_PITCH_CLASSES.get(label.capitalize()) for label in block.tuning)
+    for pitches in TUNINGS.values():
+        if len(pitches) == len(labels) and all(
+            label == pitch % 12 for label, pitch in zip(labels, pitches)
+        ):
+            return pitches
+    raise ValueError(f"Unrecognized tuning {'-'.join(block.tuning)}")
+
+
+def transform_block(
+    block: TabBlock,
+    semitones: int = 0,
+    capo: int = 0,
+    current_capo: int = 0,
+    target_tuning: tuple[int, ...] | None = None,
+    fret_range: tuple[int, int] | None = None,
+    stats: TransformStats | None = None,
+) -> TabBlock:
+    """Return a new block with every note moved to its transformed fret.
+
+    ``semitones`` transposes the sounding pitch, ``capo``/``current_capo``
+    express frets relative to a capo, and ``target_tuning`` retunes the
+    strings while keeping pitches. ``fret_range`` (inclusive) re-voices notes
+    by octave, or onto another free string, to keep them playable.
+    """
+    stats = stats if stats is not None else TransformStats()
+    source_tuning = infer_tuning(block)
+    target = target_tuning or source_tuning
+    if len(target) != len(source_tuning):
+        raise ValueError("Target tuning has a different number of strings")
+    low, high = fret_range or (0, MAX_FRET)
+
+    # Block strings are written highest first; tunings are lowest first
+    opens = list(reversed(target))
+    offsets = [
+        semitones + source - goal - capo + current_capo
+        for source, goal in zip(reversed(source_tuning), opens)
+    ]
+
+    # Vectorized step: shift each string's whole fret array by its offset
+    notes: list[dict[int, int]] = [
+        {column: fret + offset for column, fret in enumerate(string.frets) if fret >= 0}
+        for string, offset in zip(block.strings, offsets)
+    ]
+    stats.notes += sum(len(string_notes) for string_notes in notes)
+
+    moved: list[dict[int, int]] = [{} for _ in block.strings]
+    for index, string_notes in enumerate(notes):
+        for column, fret in sorted(string_notes.items()):
+            if low <= fret <= high:
+                moved[index][column] = fret
+                continue
+            pitch = opens[index] + fret
+            # Prefer the same pitch on another string, then the same string an octave away
+            other = _find_free_string(block, moved, notes, index, column, pitch, opens, low, high, octaves=False)
+            if other is not None:
+                moved[other[0]][column] = other[1]
+                stats.string_moves += 1
+                continue
+            octave_fret = _fit_octave(fret, low, high)
+            if octave_fret is not None:
+                moved[index][column] = octave_fret
+                stats.octave_shifts += 1
+                continue
+            other = _find_free_string(block, moved, notes, index, column, pitch, opens, low, high, octaves=True)
+            if other is not None:
+                moved[other[0]][column] = other[1]
+                stats.string_moves += 1
+                stats.octave_shifts += 1
+                continue
+            # Keep it on its string at the nearest playable octave, even if out of range
+            while fret < 0:
+                fret += 12
+            while fret > MAX_FRET:
+                fret -= 12
+            moved[index][column] = fret
+            stats.out_of_range += 1
+
+    strings = _layout(block, moved)
+    if target_tuning is not None:
+        _relabel(strings, opens)
+    measures = array("H", (i for i, code in enumerate(strings[0].techniques) if code == BAR))
+    return TabBlock(strings=strings, measures=measures)
+
+
+def transform_document(
+    document: TabDocument,
+    semitones: int = 0,
+    capo: int = 0,
+    current_capo: int = 0,
+    target_tuning: tuple[int, ...] | None = None,
+    fret_range: tuple[int, int] | None = None,
+) -> tuple[TabDocument, TransformStats]:
+    stats = TransformStats()
+    segments = [
+        segment
+        if isinstance(segment, str)
+        else transform_block(segment, semitones, capo, current_capo, target_tuning, fret_range, stats)
+        for segment in document.segments
+    ]
+    return TabDocument(segments=segments), stats
+
+
+def transform_markdown(
+    markdown: str,
+    semitones: int = 0,
+    capo: int = 0,
+    current_capo: int = 0,
+    tuning: str | None = None,
+    fret_range: tuple[int, int] | None = None,
+) -> tuple[str, TransformStats]:
+    """Transform every tab block in a markdown report; other text is unchanged."""
+    if tuning is not None and tuning not in TUNINGS:
+        raise ValueError(f"Unknown tuning {tuning!r}; expected one of {', '.join(TUNINGS)}")
+    document, stats = transform_document(
+        parse_tab_document(markdown),
+        semitones,
+        capo,
+        current_capo,
+        TUNINGS[tuning] if tuning else None,
+        fret_range,
+    )
+    return document.render(), stats
+
+
+def _fit_octave(fret: int, low: int, high: int) -> int | None:
+    while fret < low:
+        fret += 12
+    while fret > high:
+        fret -= 12
+    return fret if low <= fret <= high else None
+
+
+def _find_free_string(
+    block: TabBlock,
+    moved: list[dict[int, int]],
+    notes: list[dict[int, int]],
+    source: int,
+    column: int,
+    pitch: int,
+    opens: list[int],
+    low: int,
+    high: int,
+    octaves: bool,
+) -> tuple[int, int] | None:
+    """Nearest other string that is silent at ``column`` and can play ``pitch`` in range.
+
+    With ``octaves`` the pitch may also move by whole octaves to fit.
+    """
+    for distance in range(1, len(opens)):
+        for index in (source - distance, source + distance):
+            if not 0 <= index < len(opens):
+                continue
+            string = block.strings[index]
+            if column in notes[index] or column in moved[index]:
+                continue
+            if column >= len(string) or string.frets[column] != NO_FRET or string.techniques[column] != FILLER:
+                continue
+            fret = pitch - opens[index]
+            if octaves:
+                fret = _fit_octave(fret, low, high)
+            if fret is not None and low <= fret <= high:
+                return index, fret
+    return None
+
+
+def _layout(block: TabBlock, notes: list[dict[int, int]]) -> list[TabString]:
+    """Rebuild the strings' arrays, widening columns where a fret gained a digit.
+
+    Widening is decided per original column across all strings: a fret that
+    grows widens its last column, and every string pads the cell covering
+    that column, including the second digit of an existing two-digit fret.
+    A two-digit fret that shrinks keeps the alignment of its stack: it is
+    padded on the left when another string's note sits under its last digit.
+    """
+    widen: set[int] = set()
+    for string, string_notes in zip(block.strings, notes):
+        for column, fret in string_notes.items():
+            width = _old_width(string, column)
+            if len(str(fret)) > width:
+                widen.add(column + width - 1)
+    right_aligned = _right_aligned_columns(block)
+
+    strings = []
+    for string, string_notes in zip(block.strings, notes):
+        frets = array("b")
+        techniques = array("B")
+        extras: dict[int, str] = {}
+        column = 0
+        while column < len(string):
+            width = _old_width(string, column)
+            slots = width + sum(1 for covered in range(column, column + width) if covered in widen)
+            if column in string_notes:
+                fret = string_notes[column]
+                if width == 2 and fret < 10 and column in right_aligned:
+                    frets.append(NO_FRET)
+                    techniques.append(FILLER)
+                    slots -= 1
+                frets.append(fret)
+                techniques.append(FILLER)
+                if fret >= 10:
+                    frets.append(CONTINUATION)
+                    techniques.append(FILLER)
+                slots -= len(str(fret))
+            elif string.frets[column] >= 0:
+                pass  # note moved to another string; its columns become filler below
+            else:
+                frets.append(NO_FRET)
+                techniques.append(string.techniques[column])
+                if column in string.extras:
+                    extras[len(techniques) - 1] = string.extras[column]
+                slots -= 1
+            frets.extend([NO_FRET] * slots)
+            techniques.extend([FILLER] * slots)
+            column += width
+        strings.append(
+            TabString(
+                prefix=string.prefix,
+                label=string.label,
+                frets=frets,
+                techniques=techniques,
+                extras=extras,
+                suffix=string.suffix,
+                line_ending=string.line_ending,
+            )
+        )
+    return strings
+
+
+def _right_aligned_columns(block: TabBlock) -> set[int]:
+    """Start columns of two-digit frets whose stack lines up on the last digit."""
+    starts = {
+        column
+        for string in block.strings
+        for column in range(len(string))
+        if _old_width(string, column) == 2
+    }
+    single_digit = {
+        column
+        for string in block.strings
+        for column in range(len(string))
+        if string.frets[column] >= 0 and _old_width(string, column) == 1
+    }
+    return {column for column in starts if column + 1 in single_digit and column not in single_digit}
+
+
+def _old_width(string: TabString, column: int) -> int:
+    if string.frets[column] >= 0 and column + 1 < len(string) and string.frets[column + 1] == CONTINUATION:
+        return 2
+    return 1
+
+
+def _relabel(strings: list[TabString], opens: list[int]) -> None:
+    labels = [note_name(pitch) for pitch in opens]
+    width = max(len(label) for label in labels)
+    for string, label in zip(strings, labels):
+        if string.label[0].islower():
+            label = label[0].lower() + label[1:]
+        string.prefix = string.prefix.replace(string.label, label.ljust(width), 1)
+        string.label = label
@@ -0,0 +1,230 @@
+"""Compact, array-backed model of ASCII guitar tablature.
+
+The writer returns tabs as ASCII lines inside fenced code blocks::
+
+    e|-----------------|
+    B|-----------------|
+    D|-----7--7/9-9----|  7x
+    A|-9---5--5/7-7----|
+
+``parse_tab_document`` turns a markdown report into text segments and
+``TabBlock`` objects, where each string is held as two parallel arrays, one
+column per character: fret numbers and technique codes. ``render`` gives back
+exactly the input text, so the structured form can be edited and written out
+without another model call.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, Union
+
+NO_FRET = -1  # column holds a technique or filler rather than a note
+CONTINUATION = -2  # second digit column of a two-digit fret
+
+MAX_FRET = 24
+
+# Technique codes, one byte per column. Fret columns use FILLER.
+FILLER = 0
+TECHNIQUE_CHARS = {
+    "-": FILLER,
+    " ": 1,
+    "|": 2,  # bar line
+    "/": 3,  # slide up
+    "\\": 4,  # slide down
+    "h": 5,  # hammer-on
+    "p": 6,  # pull-off
+    "b": 7,  # bend
+    "r": 8,  # release
+    "~": 9,  # vibrato
+    "x": 10,  # muted note
+    "t": 11,  # tap
+    "<": 12,  # harmonic
+    ">": 13,
+    "(": 14,  # ghost note
+    ")": 15,
+    "*": 16,  # repeat
+    ".": 17,
+    ":": 18,
+    "=": 19,
+}
+BAR = TECHNIQUE_CHARS["|"]
+OTHER = 255  # character kept verbatim in TabString.extras
+TECHNIQUE_SYMBOLS = {code: char for char, code in TECHNIQUE_CHARS.items()}
+
+_DIGITS = frozenset("0123456789")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_TAB_LINE_RE = re.compile(r"^(\s*([A-Ga-g][#b]?)\s*[|:])(.*?)(\r?\n)?$")
+
+
+@dataclass
+class TabString:
+    """One string of a tab block: its label and per-column frets and techniques."""
+
+    prefix: str  # everything up to and including the opening bar, e.g. "D|"
+    label: str  # string name as written, e.g. "D" or "e"
+    frets: array = field(default_factory=lambda: array("b"))
+    techniques: array = field(default_factory=lambda: array("B"))
+    extras: dict[int, str] = field(default_factory=dict)  # columns coded OTHER
+    suffix: str = ""  # text after the closing bar, e.g. "  7x"
+    line_ending: str = ""
+
+    def __len__(self) -> int:
+        return len(self.frets)
+
+    def notes(self) -> Iterator[tuple[int, int]]:
+        """Yield (column, fret) for every fretted note on the string."""
+        for column, fret in enumerate(self.frets):
+            if fret >= 0:
+                yield column, fret
+
+    def render_body(self) -> str:
+        parts = []
+        for column, fret in enumerate(self.frets):
+            if fret >= 0:
+                parts.append(str(fret))
+            elif fret == NO_FRET:
+                code = self.techniques[column]
+                parts.append(self.extras[column] if code == OTHER else TECHNIQUE_SYMBOLS[code])
+        return "".join(parts)
+
+    def render(self) -> str:
+        return f"{self.prefix}{self.render_body()}{self.suffix}{self.line_ending}"
+
+
+@dataclass
+class TabBlock:
+    """Consecutive tab lines, written highest string first."""
+
+    strings: list[TabString]
+    measures: array = field(default_factory=lambda: array("H"))  # bar line columns
+
+    @property
+    def tuning(self) -> tuple[str, ...]:
+        """String names from lowest to highest, e.g. ("E", "A", "D", "G", "B", "E")."""
+        return tuple(string.label.upper() for string in reversed(self.strings))
+
+    def measure_spans(self) -> list[tuple[int, int]]:
+        """(start, end) body column ranges of each measure, bar lines excluded."""
+        spans = []
+        start = 0
+        for bar in self.measures:
+            if bar > start:
+                spans.append((start, bar))
+            start = bar + 1
+        width = max(len(string) for string in self.strings)
+        if width > start:
+            spans.append((start, width))
+        return spans
+
+    def render(self) -> str:
+        return "".join(string.render() for string in self.strings)
+
+
+Segment = Union[str, TabBlock]
+
+
+@dataclass
+class TabDocument:
+    """A markdown report split into plain text and parsed tab blocks."""
+
+    segments: list[Segment]
+
+    @property
+    def blocks(self) -> list[TabBlock]:
+        return [segment for segment in self.segments if isinstance(segment, TabBlock)]
+
+    def render(self) -> str:
+        return "".join(
+            segment if isinstance(segment, str) else segment.render() for segment in self.segments
+        )
+
+
+def parse_tab_string(line: str) -> TabString | None:
+    """Parse one ASCII tab line, or return None if it is not a tab line."""
+    match = _TAB_LINE_RE.match(line)
+    if match is None or "-" not in match.group(3):
+        return None
+    prefix, label, rest, line_ending = match.group(1), match.group(2), match.group(3), match.group(4) or ""
+    closing = rest.rfind("|")
+    body, suffix = (rest[: closing + 1], rest[closing + 1 :]) if closing >= 0 else (rest, "")
+
+    frets = array("b")
+    techniques = array("B")
+    extras: dict[int, str] = {}
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char in _DIGITS:
+            # Two digits form one fret unless that would be a leading zero or beyond the neck
+            if (
+                i + 1 < len(body)
+                and body[i + 1] in _DIGITS
+                and char != "0"
+                and int(body[i : i + 2]) <= MAX_FRET
+            ):
+                frets.extend((int(body[i : i + 2]), CONTINUATION))
+                techniques.extend((FILLER, FILLER))
+                i += 2
+            else:
+                frets.append(int(char))
+                techniques.append(FILLER)
+                i += 1
+            continue
+        frets.append(NO_FRET)
+        code = TECHNIQUE_CHARS.get(char, OTHER)
+        if code == OTHER:
+            extras[len(techniques)] = char
+        techniques.append(code)
+        i += 1
+
+    return TabString(
+        prefix=prefix,
+        label=label,
+        frets=frets,
+        techniques=techniques,
+        extras=extras,
+        suffix=suffix,
+        line_ending=line_ending,
+    )
+
+
+def parse_tab_document(markdown: str) -> TabDocument:
+    """Split markdown into text and tab blocks; only fenced code is searched for tabs."""
+    segments: list[Segment] = []
+    text: list[str] = []
+    block: list[TabString] = []
+    in_fence = False
+
+    def flush_block() -> None:
+        if block:
+            segments.append(_make_block(list(block)))
+            block.clear()
+
+    for line in markdown.splitlines(keepends=True):
+        if _FENCE_RE.match(line):
+            flush_block()
+            in_fence = not in_fence
+            text.append(line)
+            continue
+        tab_string = parse_tab_string(line) if in_fence else None
+        if tab_string is None:
+            flush_block()
+            text.append(line)
+            continue
+        if text:
+            segments.append("".join(text))
+            text.clear()
+        block.append(tab_string)
+
+    flush_block()
+    if text:
+        segments.append("".join(text))
+    return TabDocument(segments=segments)
+
+
+def _make_block(strings: list[TabString]) -> TabBlock:
+    measures = array("H", (i for i, code in enumerate(strings[0].techniques) if code == BAR))
+    return TabBlock(strings=strings, measures=measures)
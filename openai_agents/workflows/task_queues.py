@@ -0,0 +1,18 @@
+"""Task queue names.
+
+Workflows run on the workflow task queue. Model calls and PDF rendering run
+on their own queues, named after the workflow's queue, so I/O-bound model
+calls and CPU-bound rendering can be given separate workers and limits.
+"""
+
+WORKFLOW_TASK_QUEUE = "openai-agents-task-queue"
+
+
+def model_task_queue(workflow_task_queue: str) -> str:
+    """Queue for model activities, including the streaming writer."""
+    return f"{workflow_task_queue}-model"
+
+
+def pdf_task_queue(workflow_task_queue: str) -> str:
+    """Queue for the generate_pdf activity."""
+    return f"{workflow_task_queue}-pdf"
@@ -0,0 +1,180 @@
+"""Rule-based triage in front of the triage and clarifying agents.
+
+Most requests name a song and leave out the same few details the clarifying
+agent always asks about: chords or tablature, skill level, song section and
+tuning. Keyword patterns pull those fields out of the query, so the workflow
+can go straight to planning when the details are there, or ask templated
+questions for the missing ones, without a model call. Requests the rules
+cannot read confidently (no song named, conflicting or negated details,
+general guitar questions) go to the triage agent as before.
+
+Pure and deterministic, so it runs inline in workflow code.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Literal, Optional
+
+TriagePath = Literal["plan", "clarify", "llm"]
+
+
+def _patterns(table: dict[str, str]) -> list[tuple[str, re.Pattern[str]]]:
+    return [(value, re.compile(pattern, re.IGNORECASE)) for value, pattern in table.items()]
+
+
+FORMAT_PATTERNS = _patterns(
+    {
+        "tab": r"\b(tabs?|tablature|tabbed)\b",
+        "chords": r"\b(chords?|chord charts?|strumming)\b",
+    }
+)
+SKILL_PATTERNS = _patterns(
+    {
+        # "easy" and "simple" only next to a format word: titles like Simple Man use them too
+        "beginner": r"\b(beginners?|novice|new to guitar|just start(ed|ing)|first time)\b"
+        r"|\b(easy|simple|simplified) (chords?|tabs?|tablature)\b",
+        "intermediate": r"\b(intermediate|some experience)\b",
+        "advanced": r"\b(advanced|expert|experienced|pro level)\b",
+    }
+)
+SECTION_PATTERNS = _patterns(
+    {
+        "whole song": r"\b(whole|entire|full|complete) (song|thing|tab)\b|\ball of it\b",
+        "intro": r"\bintro\b",
+        "verse": r"\bverses?\b",
+        "pre-chorus": r"\bpre-?chorus\b",
+        "chorus": r"(?<!pre-)(?<!pre)\bchorus\b",
+        "bridge": r"\bbridge\b",
+        "solo": r"\bsolos?\b",
+        "main riff": r"\b(main )?riffs?\b",
+        "outro": r"\boutro\b",
+    }
+)
+TUNING_PATTERNS = _patterns(
+    {
+        "standard": r"\b(standard tuning|e standard)\b",
+        "drop_d": r"\bdrop[ -]?d\b",
+        "drop_c": r"\bdrop[ -]?c\b",
+        "half_step_down": r"\b(half[ -]step down|e ?flat tuning|eb tuning)\b",
+        "full_step_down": r"\b((full|whole)[ -]step down|d standard)\b",
+        "open_g": r"\bopen g tuning\b",
+        "open_d": r"\bopen d tuning\b",
+        "open_e": r"\bopen e tuning\b",
+        "dadgad": r"\bdadgad\b",
+    }
+)
+
+# A negated detail ("not a beginner", "no tabs") needs a model to read
+_NEGATION_RE = re.compile(r"\b(not|no|don'?t|without|instead of|rather than)\b", re.IGNORECASE)
+# General guitar questions rather than a request for a song
+_GENERAL_RE = re.compile(
+    r"^\s*(why|what|which|when|where|who)\b|\b(difference|theory|scales?|exercises?|techniques?|"
+    r"practice routine|tune my|restring|strings? gauge|buy|recommend)\b",
+    re.IGNORECASE,
+)
+_WORD_RE = re.compile(r"[a-z0-9']+")
+# Quoted text is a title, never a detail
+_QUOTED_RE = re.compile(r'"[^"]*"|\u201c[^\u201d]*\u201d')
+
+# Words that say nothing about which song is meant
+GENERIC_WORDS = frozenset(
+    """
+    a an and the of for in on to by with me my i i'm im you do can could would want like please
+    how is are show give get help
+    guitar guitars lesson lessons tutorial tutorials version versions part parts section sections
+    play playing learn teach song songs acoustic electric tuning level player just
+    """.split()
+)
+
+FORMAT_QUESTION = "Would you like chords, tablature, or both?"
+SKILL_QUESTION = "What is your skill level: beginner, intermediate, or advanced?"
+SECTION_QUESTION = "Which part of the song should the tab focus on: intro, verse, chorus, solo, or the whole song?"
+TUNING_QUESTION = "Do you play in standard tuning, or an alternate tuning such as Drop D?"
+
+# The clarifying agent asks two or three questions; so do the templates
+MAX_QUESTIONS = 3
+
+
+@dataclass
+class TriageDecision:
+    path: TriagePath
+    reason: str
+    format: Optional[str] = None  # tab, chords, both
+    skill: Optional[str] = None  # beginner, intermediate, advanced
+    section: Optional[str] = None  # e.g. "chorus" or "intro, solo"
+    tuning: Optional[str] = None  # a tab_transforms.TUNINGS name
+    subject: str = ""  # query words left once details and generic words are removed
+    questions: list[str] = field(default_factory=list)
+
+
+def _matches(patterns: list[tuple[str, re.Pattern[str]]], query: str) -> list[str]:
+    return [value for value, pattern in patterns if pattern.search(query)]
+
+
+def _strip_matches(query: str) -> str:
+    for patterns in (FORMAT_PATTERNS, SKILL_PATTERNS, SECTION_PATTERNS, TUNING_PATTERNS):
+        for _, pattern in patterns:
+            query = pattern.sub(" ", query)
+    return query
+
+
+def classify_request(query: str) -> TriageDecision:
+    """Read format, skill, section and tuning from ``query`` and pick a triage path.
+
+    ``plan`` when format, skill and section are all given (tuning defaults to
+    standard), ``clarify`` with templated questions for the missing ones, or
+    ``llm`` when the rules cannot tell.
+    """
+    titles = " ".join(_QUOTED_RE.findall(query))
+    details = _QUOTED_RE.sub(" ", query)
+    formats = _matches(FORMAT_PATTERNS, details)
+    skills = _matches(SKILL_PATTERNS, details)
+    sections = _matches(SECTION_PATTERNS, details)
+    tunings = _matches(TUNING_PATTERNS, details)
+    subject = " ".join(
+        word
+        for word in _WORD_RE.findall(f"{titles} {_strip_matches(details)}".lower())
+        if word not in GENERIC_WORDS
+    )
+    decision = TriageDecision(
+        path="llm",
+        reason="",
+        format="both" if len(formats) > 1 else (formats[0] if formats else None),
+        skill=skills[0] if len(skills) == 1 else None,
+        section=", ".join(sections) if sections else None,
+        tuning=tunings[0] if len(tunings) == 1 else None,
+        subject=subject,
+    )
+
+    if not subject:
+        decision.reason = "no song named"
+    elif _GENERAL_RE.search(details):
+        decision.reason = "general guitar question"
+    elif _NEGATION_RE.search(details):
+        decision.reason = "negated detail"
+    elif len(skills) > 1 or len(tunings) > 1:
+        decision.reason = "conflicting details"
+    if decision.reason:
+        return decision
+
+    missing = [
+        question
+        for value, question in [
+            (decision.format, FORMAT_QUESTION),
+            (decision.skill, SKILL_QUESTION),
+            (decision.section, SECTION_QUESTION),
+        ]
+        if value is None
+    ]
+    if not missing:
+        decision.path = "plan"
+        decision.reason = "all details given"
+        return decision
+    if decision.tuning is None:
+        missing.append(TUNING_QUESTION)
+    decision.path = "clarify"
+    decision.reason = f"{len(missing)} details missing"
+    decision.questions = missing[:MAX_QUESTIONS]
+    return decision
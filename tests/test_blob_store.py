@@ -0,0 +1,31 @@
+import os
+import time
+from datetime import timedelta
+
+from openai_agents.blob_store import LocalBlobStore
+
+DAY = 24 * 3600
+
+
+def age(store: LocalBlobStore, key: str, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(store.root / key, (past, past))
+
+
+def test_sweep_deletes_only_expired_blobs(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    old = store.put_content_addressed("payloads", b"old report")
+    new = store.put_content_addressed("payloads", b"new report")
+    age(store, old, 31 * DAY)
+    assert store.sweep(timedelta(days=30)) == 1
+    assert not store.exists(old)
+    assert store.exists(new)
+
+
+def test_storing_an_existing_blob_again_refreshes_its_age(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    key = store.put_content_addressed("payloads", b"report")
+    age(store, key, 31 * DAY)
+    assert store.put_content_addressed("payloads", b"report") == key
+    assert store.sweep(timedelta(days=30)) == 0
+    assert store.get(key) == b"report"
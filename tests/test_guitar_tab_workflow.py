@@ -0,0 +1,123 @@
+import asyncio
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+import pytest
+from temporalio import activity
+from temporalio.contrib.openai_agents import (
+    ModelActivityParameters,
+    set_open_ai_agent_temporal_overrides,
+)
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from openai_agents.codec import data_converter
+from openai_agents.fake_model_provider import FakeModelProvider, LatencyDistribution
+from openai_agents.serializable_model_activity import SerializableModelActivity
+from openai_agents.workflows.guitar_tab_workflow import InteractiveGuitarTabWorkflow
+from openai_agents.workflows.pdf_generation_activity import PDFGenerationResult, StylingOptions
+from openai_agents.workflows.research_agents.research_models import (
+    ClarificationInput,
+    FollowUpInput,
+    FollowUpPolicy,
+    SessionPollInput,
+    TabRequestOptions,
+    TabTransform,
+    UserQueryInput,
+)
+from openai_agents.workflows.task_queues import model_task_queue, pdf_task_queue
+
+TASK_QUEUE = "guitar-tab-test"
+PDF_SECONDS = 1.0
+
+
+@activity.defn(name="generate_pdf")
+async def slow_generate_pdf(
+    markdown_content: str,
+    title: str = "Research Report",
+    styling_options: Optional[StylingOptions] = None,
+) -> PDFGenerationResult:
+    # Slow enough that polls arrive while the PDF renders
+    await asyncio.sleep(PDF_SECONDS)
+    return PDFGenerationResult(pdf_file_path="pdf_output/test.pdf", success=True)
+
+
+@pytest.mark.asyncio
+async def test_clarified_session_answers_follow_ups():
+    latencies = {stage: LatencyDistribution(0.01, 0.0) for stage in FakeModelProvider().latencies}
+    provider = FakeModelProvider(latencies, clarify_rate=1.0, searches_per_plan=2)
+    options = TabRequestOptions(
+        use_report_cache=False,
+        use_corpus=False,
+        rule_triage=False,
+        follow_ups=FollowUpPolicy(enabled=True),
+    )
+
+    with set_open_ai_agent_temporal_overrides(
+        model_params=ModelActivityParameters(
+            task_queue=model_task_queue(TASK_QUEUE), start_to_close_timeout=timedelta(seconds=30)
+        ),
+    ):
+        env = await WorkflowEnvironment.start_local(data_converter=data_converter)
+        try:
+            async with Worker(
+                env.client, task_queue=TASK_QUEUE, workflows=[InteractiveGuitarTabWorkflow]
+            ), Worker(
+                env.client,
+                task_queue=model_task_queue(TASK_QUEUE),
+                activities=[SerializableModelActivity(provider).invoke_model_activity],
+            ), Worker(
+                env.client, task_queue=pdf_task_queue(TASK_QUEUE), activities=[slow_generate_pdf]
+            ):
+                handle = await env.client.start_workflow(
+                    InteractiveGuitarTabWorkflow.run,
+                    args=[None, False],
+                    id=f"guitar-tab-test-{uuid.uuid4().hex[:12]}",
+                    task_queue=TASK_QUEUE,
+                )
+                status = await handle.execute_update(
+                    InteractiveGuitarTabWorkflow.start_tab_session,
+                    UserQueryInput(query="Load test song 1", options=options),
+                )
+                assert status.status == "awaiting_clarifications"
+                await handle.execute_update(
+                    InteractiveGuitarTabWorkflow.provide_clarifications,
+                    ClarificationInput(
+                        responses={f"question_{i}": "No preference" for i in range(len(status.clarification_questions))}
+                    ),
+                )
+
+                # Follow the session as the client does; it must never look finished before follow-ups open
+                poll = SessionPollInput(timeout_seconds=10)
+                seen = []
+                while not seen or seen[-1] != "awaiting_follow_up":
+                    delta = await handle.execute_update(InteractiveGuitarTabWorkflow.wait_for_changes, poll)
+                    poll.since_version = delta.version
+                    seen.append(delta.status)
+                    assert delta.status != "completed", seen
+                    assert len(seen) < 20, seen
+                assert "rendering" in seen
+                first = await handle.query(InteractiveGuitarTabWorkflow.get_session_report)
+                assert first.pdf_file_path == "pdf_output/test.pdf"
+
+                turn = await handle.execute_update(
+                    InteractiveGuitarTabWorkflow.ask_follow_up, FollowUpInput(question="Show me the solo too")
+                )
+                assert turn.turn == 1
+                assert "Load test song" in turn.markdown_report
+
+                # Transforms rewrite the latest tab in place of a research run
+                transformed = await handle.execute_update(
+                    InteractiveGuitarTabWorkflow.transform_tab, TabTransform(semitones=2)
+                )
+                assert transformed.turn == 2
+                assert transformed.new_searches == 0
+                assert transformed.markdown_report != turn.markdown_report
+
+                await handle.signal(InteractiveGuitarTabWorkflow.end_workflow_signal)
+                result = await handle.result()
+                assert result.markdown_report == transformed.markdown_report
+                assert result.pdf_file_path is None
+        finally:
+            await env.shutdown()
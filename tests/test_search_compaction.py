@@ -0,0 +1,54 @@
+from openai_agents.workflows.search_compaction import compact_summaries, split_units
+
+TAB_SUMMARY = """Wonderwall by Oasis is played with a capo on the second fret. The intro riff repeats four times.
+```
+e|---3---3---3---3---|
+B|---3---3---3---3---|
+G|---0---0---0---0---|
+D|---2---2---0---0---|
+A|-------------------|
+E|---0---0---3---3---|
+```
+The verse alternates Em7, G, Dsus4 and A7sus4 with a steady sixteenth-note strum.
+"""
+
+
+def test_split_units_keeps_tab_blocks_whole_and_round_trips():
+    units = split_units(TAB_SUMMARY)
+    assert "".join(units) == TAB_SUMMARY
+    assert any(unit.startswith("```") and unit.rstrip().endswith("```") for unit in units)
+
+
+def test_tab_block_survives_compaction_unchanged():
+    near_duplicate = (
+        "Wonderwall by Oasis is played with a capo on the second fret. "
+        "The intro riff repeats four times. Noel Gallagher recorded it on an acoustic guitar."
+    )
+    result = compact_summaries([TAB_SUMMARY, near_duplicate], similarity_threshold=0.2, token_budget=3000)
+    assert result.duplicates_removed == 1
+    merged = result.summaries[0]
+    assert merged.startswith(TAB_SUMMARY.rstrip())
+    assert "Noel Gallagher recorded it on an acoustic guitar." in merged
+
+
+def test_merged_tab_lines_keep_their_line_breaks():
+    shorter = (
+        "Wonderwall by Oasis is played with a capo on the second fret. The intro riff repeats four times.\n"
+        "e|--0--2--3--|\n"
+        "B|--1--3--3--|\n"
+    )
+    longer = (
+        "Wonderwall by Oasis is played with a capo on the second fret. The intro riff repeats four times. "
+        "The verse alternates Em7, G, Dsus4 and A7sus4 with a steady sixteenth-note strum."
+    )
+    merged = compact_summaries([longer, shorter], similarity_threshold=0.2).summaries[0]
+    assert "\ne|--0--2--3--|\nB|--1--3--3--|" in merged
+
+
+def test_trimming_keeps_a_prefix_of_each_summary():
+    other = "Enter Sandman by Metallica is played in E standard. " * 20
+    result = compact_summaries([TAB_SUMMARY, other], token_budget=120)
+    assert result.output_tokens <= 120 + len(result.summaries) * 2
+    assert all(
+        original.startswith(trimmed) for trimmed, original in zip(result.summaries, [TAB_SUMMARY, other])
+    )
@@ -0,0 +1,28 @@
+from openai_agents.workflows.tab_corpus import TabCorpus
+
+ENTER_SANDMAN = '### "Enter Sandman" by Metallica - Simplified\n\n#### Intro\n\n```\ne|-----|\n```\n'
+
+
+def enriched(query: str) -> str:
+    # Same template as the manager's clarified queries
+    return (
+        f"Original query: {query}\n\nAdditional context:\n"
+        "- What is your skill level?: Beginner\n"
+        "- Which part of the song do you want to learn?: The whole song\n"
+        "- Do you prefer chords or tablature?: No preference\n"
+    )
+
+
+def test_report_matches_its_own_song(tmp_path):
+    corpus = TabCorpus(tmp_path / "corpus.db")
+    corpus.add_report("Teach me Enter Sandman on guitar", ENTER_SANDMAN)
+    match = corpus.best_match("Enter Sandman tab", 0.8, kind="report")
+    assert match is not None
+    assert match[0].song == "Enter Sandman"
+
+
+def test_enriched_query_for_another_song_does_not_match(tmp_path):
+    corpus = TabCorpus(tmp_path / "corpus.db")
+    corpus.add_report("Teach me Enter Sandman on guitar", ENTER_SANDMAN)
+    assert corpus.best_match("Teach me Wonderwall on guitar", 0.8, kind="report") is None
+    assert corpus.best_match(enriched("Teach me Wonderwall on guitar"), 0.8, kind="report") is None
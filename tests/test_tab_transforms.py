@@ -0,0 +1,50 @@
+import pytest
+
+from openai_agents.workflows.tab_transforms import transform_markdown
+
+
+def tab_block(*lines: str) -> str:
+    return "```\n" + "\n".join(lines) + "\n```\n"
+
+
+def block_lines(markdown: str) -> list[str]:
+    return [line for line in markdown.splitlines() if "|" in line]
+
+
+def test_transpose_shifts_every_fret():
+    markdown = tab_block("e|-0-2-|", "B|-----|", "G|-----|", "D|-----|", "A|-----|", "E|-----|")
+    transformed, stats = transform_markdown(markdown, semitones=2)
+    assert block_lines(transformed)[0] == "e|-2-4-|"
+    assert stats.notes == 2
+
+
+def test_fret_gaining_a_digit_widens_every_string():
+    markdown = tab_block("e|-------|", "B|-------|", "G|-------|", "D|-10----|", "A|--9----|", "E|-------|")
+    transformed, _ = transform_markdown(markdown, semitones=1)
+    lines = block_lines(transformed)
+    assert lines[3] == "D|-11-----|"
+    assert lines[4] == "A|--10----|"
+    assert len({len(line) for line in lines}) == 1
+
+
+def test_two_digit_frets_in_the_same_column_stay_aligned():
+    markdown = tab_block("e|-9---|", "B|-10--|", "G|-----|", "D|-----|", "A|-----|", "E|-----|")
+    transformed, _ = transform_markdown(markdown, semitones=1)
+    lines = block_lines(transformed)
+    assert lines[0] == "e|-10---|"
+    assert lines[1] == "B|-11---|"
+    assert len({len(line) for line in lines}) == 1
+
+
+def test_shrinking_fret_keeps_right_aligned_stack():
+    markdown = tab_block("e|-12-|", "B|--5-|", "G|----|", "D|----|", "A|----|", "E|----|")
+    transformed, _ = transform_markdown(markdown, semitones=-3)
+    lines = block_lines(transformed)
+    assert lines[0] == "e|--9-|"
+    assert lines[1] == "B|--2-|"
+
+
+def test_unknown_six_string_tuning_is_rejected():
+    markdown = tab_block("e|-0-|", "B|---|", "G|---|", "D|---|", "A|---|", "F|---|")
+    with pytest.raises(ValueError):
+        transform_markdown(markdown, semitones=2)
@@ -0,0 +1,58 @@
+import pytest
+
+from openai_agents.workflows.triage_rules import (
+    FORMAT_QUESTION,
+    MAX_QUESTIONS,
+    SECTION_QUESTION,
+    SKILL_QUESTION,
+    classify_request,
+)
+
+
+def test_all_details_go_straight_to_planning():
+    decision = classify_request("Wonderwall chords for a beginner, just the chorus")
+    assert decision.path == "plan"
+    assert (decision.format, decision.skill, decision.section) == ("chords", "beginner", "chorus")
+
+
+def test_missing_details_get_templated_questions():
+    decision = classify_request("Enter Sandman")
+    assert decision.path == "clarify"
+    assert decision.questions == [FORMAT_QUESTION, SKILL_QUESTION, SECTION_QUESTION][:MAX_QUESTIONS]
+
+
+@pytest.mark.parametrize(
+    "query, reason",
+    [
+        ("Teach me guitar", "no song named"),
+        ("How do I tune my guitar?", "general guitar question"),
+        ("Hallelujah chords, not the beginner version", "negated detail"),
+        ("Blackbird tab for beginners or advanced players", "conflicting details"),
+    ],
+)
+def test_unreadable_requests_fall_back_to_the_agent(query, reason):
+    decision = classify_request(query)
+    assert decision.path == "llm"
+    assert decision.reason == reason
+
+
+def test_easy_next_to_a_format_word_is_a_skill_level():
+    decision = classify_request("Easy chords for Wonderwall, whole song")
+    assert decision.path == "plan"
+    assert decision.skill == "beginner"
+
+
+@pytest.mark.parametrize(
+    "query, skill, subject",
+    [
+        ("Simple Man chords intermediate", "intermediate", "simple man"),
+        ("Simple Man tab chorus", None, "simple man"),
+        ("Easy by the Commodores tab, whole song", None, "easy commodores"),
+        ('"Simple Man" chords for beginners, whole song', "beginner", "simple man"),
+    ],
+)
+def test_title_words_are_not_skill_levels(query, skill, subject):
+    decision = classify_request(query)
+    assert decision.path in ("plan", "clarify")
+    assert decision.skill == skill
+    assert decision.subject == subject